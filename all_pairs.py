@@ -0,0 +1,283 @@
+# all_pairs.py
+# All-pairs shortest paths, precomputed once per map so distance and path
+# queries become table lookups.
+#
+# The table is an n x n distance matrix plus an n x n int32 predecessor
+# matrix (pred[s, v] = the state before v on a shortest s -> v path, -1 if
+# none). Small or dense graphs use a NumPy Floyd-Warshall (n vectorised
+# n x n passes); sparse ones run Dijkstra from every source, optionally in
+# worker processes that write their rows straight into a memory-mapped
+# output file. Saved tables are memory-mapped on load, so a process only
+# pages in the rows it actually reads. Memory is 12 bytes per pair: fine
+# for thousands of states, not for millions.
+#
+#   python all_pairs.py --graph map.csr -o map.apsp -j 4
+#   python all_pairs.py --table map.apsp --graph map.csr A B
+
+import argparse
+import heapq
+import os
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from graph import Graph, romania
+from uninformed_search import cost_expression
+
+INF = float("inf")
+NO_PRED = -1
+
+# File: header (magic, version, n, graph fingerprint), then the float64
+# distance matrix and the int32 predecessor matrix, both row-major
+MAGIC = b"APSP"
+VERSION = 1
+_HEADER = struct.Struct("<4sIQ64s")
+
+# Floyd-Warshall does n^3 vectorised work against roughly n * m * log n
+# interpreted work for n Dijkstra runs (with predecessor tracking the
+# measured crossover is near n^2 = 64 m)
+FLOYD_RATIO = 64
+
+
+# Floyd-Warshall
+def floyd_warshall(graph):
+    n = len(graph)
+    dist = np.full((n, n), INF)
+    pred = np.full((n, n), NO_PRED, dtype=np.int32)
+    for u in range(n):
+        for e in range(graph.offsets[u], graph.offsets[u + 1]):
+            v = graph.targets[e]
+            if graph.weights[e] < dist[u, v]:
+                dist[u, v] = graph.weights[e]
+                pred[u, v] = u
+    np.fill_diagonal(dist, 0)
+    np.fill_diagonal(pred, np.arange(n, dtype=np.int32))
+
+    for k in range(n):
+        through = dist[:, k, None] + dist[k, None, :]
+        better = through < dist
+        dist[better] = through[better]
+        # s -> k -> v: v's predecessor is its predecessor on the k -> v path
+        pred[better] = np.broadcast_to(pred[k], (n, n))[better]
+    pred[np.arange(n), np.arange(n)] = NO_PRED
+    return dist, pred
+
+
+# Dijkstra from every source
+def dijkstra_tree(graph, source):
+    # -> (distances, predecessors) lists for one source
+    n = len(graph)
+    dist = [INF] * n
+    pred = [NO_PRED] * n
+    dist[source] = 0
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    return dist, pred
+
+
+def _fill_rows(graph, dist, pred, sources):
+    for s in sources:
+        d, p = dijkstra_tree(graph, s)
+        dist[s] = d
+        pred[s] = p
+
+
+# Worker processes map the graph and the output table once
+_worker = None
+
+
+def _init_worker(graph_path, table_path):
+    global _worker
+    graph = Graph.load(graph_path)
+    n = len(graph)
+    dist, pred = _map_matrices(table_path, n, "r+")
+    _worker = (graph, dist, pred)
+
+
+def _worker_rows(sources):
+    graph, dist, pred = _worker
+    _fill_rows(graph, dist, pred, sources)
+    dist.flush()
+    pred.flush()
+    return len(sources)
+
+
+def _map_matrices(path, n, mode):
+    dist = np.memmap(path, np.float64, mode, _HEADER.size, (n, n))
+    pred = np.memmap(path, np.int32, mode, _HEADER.size + 8 * n * n, (n, n))
+    return dist, pred
+
+
+def _create_file(path, graph):
+    n = len(graph)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, n, graph.fingerprint().encode()))
+        f.truncate(_HEADER.size + 12 * n * n)
+
+
+class AllPairs:
+    def __init__(self, graph, dist, pred):
+        self.graph = graph
+        self.version = graph.version
+        self.dist = dist
+        self.pred = pred
+
+    def _current(self):
+        if self.version != self.graph.version:
+            raise ValueError("all-pairs table is older than its graph's last edit")
+
+    @classmethod
+    def compute(cls, graph=None, method="auto", workers=1, path=None, chunk=64):
+        # method: "auto", "floyd" or "dijkstra". With path the table is
+        # written there (and memory-mapped); workers > 1 runs the Dijkstra
+        # sources in that many processes.
+        graph = graph if graph is not None else romania
+        n = len(graph)
+        if method == "auto":
+            method = "floyd" if n * n <= FLOYD_RATIO * graph.num_edges else "dijkstra"
+        if method not in ("floyd", "dijkstra"):
+            raise ValueError(f"unknown all-pairs method: {method}")
+
+        if method == "floyd" or workers <= 1:
+            if method == "floyd":
+                dist, pred = floyd_warshall(graph)
+            else:
+                dist = np.empty((n, n))
+                pred = np.empty((n, n), dtype=np.int32)
+                _fill_rows(graph, dist, pred, range(n))
+            table = cls(graph, dist, pred)
+            if path is not None:
+                table.save(path)
+                return cls.load(path, graph)
+            return table
+
+        # Parallel Dijkstra: workers fill disjoint rows of the mapped file
+        out = path
+        if out is None:
+            fd, out = tempfile.mkstemp(suffix=".apsp")
+            os.close(fd)
+        fd, graph_path = tempfile.mkstemp(suffix=".csr")
+        os.close(fd)
+        try:
+            graph.save(graph_path)
+            _create_file(out, graph)
+            batches = [range(s, min(s + chunk, n)) for s in range(0, n, chunk)]
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(graph_path, out)) as pool:
+                for _ in pool.map(_worker_rows, batches):
+                    pass
+            table = cls.load(out, graph)
+            if path is None:
+                # Temporary file: keep the matrices in memory instead
+                table = cls(graph, np.array(table.dist), np.array(table.pred))
+        finally:
+            os.remove(graph_path)
+            if path is None:
+                os.remove(out)
+        return table
+
+    # Persistence
+    def save(self, path):
+        _create_file(path, self.graph)
+        dist, pred = _map_matrices(path, len(self.graph), "r+")
+        dist[:] = self.dist
+        pred[:] = self.pred
+        dist.flush()
+        pred.flush()
+
+    @classmethod
+    def load(cls, path, graph=None):
+        # The table must belong to graph: the stored fingerprint is checked
+        graph = graph if graph is not None else romania
+        with open(path, "rb") as f:
+            magic, version, n, fingerprint = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not an all-pairs table (version {VERSION})")
+        if n != len(graph) or fingerprint.decode() != graph.fingerprint():
+            raise ValueError(f"{path}: table was computed for a different graph")
+        dist, pred = _map_matrices(path, n, "r")
+        return cls(graph, dist, pred)
+
+    # Lookups (state names at the boundary, like the searches)
+    def distance(self, start, goal):
+        self._current()
+        index = self.graph.index
+        return float(self.dist[index[start], index[goal]])
+
+    def path(self, start, goal):
+        self._current()
+        index = self.graph.index
+        s, v = index[start], index[goal]
+        if self.dist[s, v] == INF:
+            return None
+        row = self.pred[s]
+        states = [v]
+        while v != s:
+            v = int(row[v])
+            states.append(v)
+        names = self.graph.names
+        return [names[u] for u in reversed(states)]
+
+    def path_cost_expression(self, start, goal):
+        # Same text as uninformed_search.path_cost_expression, with the edge
+        # costs read off the distance row instead of the adjacency lists
+        path = self.path(start, goal)
+        if not path or len(path) < 2:
+            return None
+        index = self.graph.index
+        row = self.dist[index[start]]
+        along = [row[index[name]] for name in path]
+        steps = [_number(b - a) for a, b in zip(along, along[1:])]
+        return cost_expression(steps)
+
+    def result(self, start, goal):
+        # Search-style result dict, for code that consumes search output
+        path = self.path(start, goal)
+        cost = self.distance(start, goal)
+        return {"path": path, "path_cost": _number(cost) if path else None,
+                "nodes_expanded": 0, "nodes_generated": 0}
+
+
+def _number(x):
+    # Integer weights stay integers in the output
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute an all-pairs shortest path table or query one.")
+    parser.add_argument("--graph", help="binary CSR graph file (default: Romania)")
+    parser.add_argument("-o", "--output", help="table file to write")
+    parser.add_argument("--table", help="table file to query")
+    parser.add_argument("--method", choices=("auto", "floyd", "dijkstra"), default="auto")
+    parser.add_argument("-j", "--workers", type=int, default=1)
+    parser.add_argument("query", nargs="*", help="start goal")
+    args = parser.parse_args()
+
+    graph = Graph.load(args.graph) if args.graph else romania
+    if args.table:
+        table = AllPairs.load(args.table, graph)
+    else:
+        table = AllPairs.compute(graph, args.method, args.workers, args.output)
+    if len(args.query) == 2:
+        start, goal = args.query
+        print(table.path(start, goal))
+        print(table.path_cost_expression(start, goal))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# batch.py
+# Headless batch queries: no Qt, matplotlib or networkx imports.
+#
+# Reads one query per line, either CSV (start,goal,algorithm[,limit]) or a
+# JSON object with the same keys, and streams one JSON result per line:
+#   python batch.py queries.csv -o results.jsonl
+#   printf 'Arad,Bucharest,A*\n' | python batch.py -
+# "limit" is the depth limit for DLS, the maximum limit for IDS, the node
+# budget for SMA* and the beam width for Beam; the other algorithms ignore
+# it. Bad or timed-out queries produce an "error"
+# line and the batch goes on. With -j N the queries are spread over N
+# processes (parallel.py). --cache FILE keeps answers across runs, keyed on
+# the graph's content hash (query_cache.py).
+
+import argparse
+import csv
+import json
+import sys
+
+from contraction import CH_with_metrics
+from graph import romania
+from graph_io import is_graph_file, open_graph
+from informed_search import (
+    Greedy_Search, AStar_Search, IDAStar_Search, RBFS_Search,
+    BidirectionalAStar_Search, SMAStar_Search, Beam_Search, SMA_NODES, BEAM_WIDTH,
+)
+from instrumentation import LEVELS, COUNTERS
+from query_cache import QueryCache
+from search_trace import ProgressTrace, SearchAborted
+from uninformed_search import (
+    BFS_with_metrics, DFS_with_metrics, UCS_with_metrics,
+    DLS_with_metrics, IDS_with_metrics, Backtracking_with_metrics,
+    Bidirectional_with_metrics, BidirectionalUCS_with_metrics, extract_path,
+)
+
+
+def _dls(start, goal, graph, limit, heuristic, instrument, trace=None):
+    if limit is None:
+        raise ValueError("DLS needs a limit")
+    return DLS_with_metrics(start, goal, limit, graph=graph,
+                            instrument=instrument, trace=trace)
+
+
+def _ids(start, goal, graph, limit, heuristic, instrument, trace=None):
+    return IDS_with_metrics(start, goal, 50 if limit is None else limit,
+                            graph=graph, instrument=instrument, trace=trace)
+
+
+def _level_bfs(start, goal, graph, limit, heuristic, instrument, trace=None):
+    return BFS_with_metrics(start, goal, graph=graph, engine="numpy",
+                            instrument=instrument, trace=trace)
+
+
+def _smastar(start, goal, graph, limit, heuristic, instrument, trace=None):
+    return SMAStar_Search(start, goal, graph=graph, heuristic=heuristic,
+                          max_nodes=SMA_NODES if limit is None else limit,
+                          instrument=instrument, trace=trace)
+
+
+def _beam(start, goal, graph, limit, heuristic, instrument, trace=None):
+    return Beam_Search(start, goal, graph=graph, heuristic=heuristic,
+                       width=BEAM_WIDTH if limit is None else limit,
+                       instrument=instrument, trace=trace)
+
+
+def _uninformed(fn):
+    return lambda start, goal, graph, limit, heuristic, instrument, trace=None: \
+        fn(start, goal, graph=graph, instrument=instrument, trace=trace)
+
+
+def _informed(fn):
+    return lambda start, goal, graph, limit, heuristic, instrument, trace=None: \
+        fn(start, goal, graph=graph, heuristic=heuristic,
+           instrument=instrument, trace=trace)
+
+
+# Algorithm names as shown in the GUI; lookups are case-insensitive
+ALGORITHMS = {
+    "BFS": _uninformed(BFS_with_metrics),
+    "BFS (NumPy)": _level_bfs,
+    "DFS": _uninformed(DFS_with_metrics),
+    "UCS": _uninformed(UCS_with_metrics),
+    "DLS": _dls,
+    "IDS": _ids,
+    "Backtracking": _uninformed(Backtracking_with_metrics),
+    "Bidirectional": _uninformed(Bidirectional_with_metrics),
+    "Bidirectional UCS": _uninformed(BidirectionalUCS_with_metrics),
+    "CH": _uninformed(CH_with_metrics),    # hierarchy built once per graph
+    "Greedy": _informed(Greedy_Search),
+    "A*": _informed(AStar_Search),
+    "IDA*": _informed(IDAStar_Search),
+    "RBFS": _informed(RBFS_Search),
+    "Bidirectional A*": _informed(BidirectionalAStar_Search),
+    "SMA*": _smastar,
+    "Beam": _beam,
+}
+_BY_KEY = {name.lower(): name for name in ALGORITHMS}
+
+
+def algorithm_name(name):
+    try:
+        return _BY_KEY[name.strip().lower()]
+    except KeyError:
+        raise ValueError(f"unknown algorithm: {name}") from None
+
+
+def _limit(value):
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def parse_queries(lines):
+    # -> (line number, query dict) pairs; blank lines and # comments skipped.
+    # A line that cannot be read pairs with a ValueError instead, which
+    # answer() turns into that line's "error" result.
+    for lineno, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        if text.startswith("{"):
+            try:
+                q = json.loads(text)
+            except ValueError as e:
+                q = ValueError(f"bad JSON query: {e}")
+        else:
+            fields = [f.strip() for f in next(csv.reader([text]))]
+            if fields[0].lower() == "start":
+                continue    # header row
+            q = dict(zip(("start", "goal", "algorithm", "limit"), fields))
+        yield lineno, q
+
+
+def run_query(q, graph=None, heuristic=None, instrument=COUNTERS, trace=None):
+    start, goal = q["start"], q["goal"]
+    algorithm = algorithm_name(q.get("algorithm") or "A*")
+    limit = _limit(q.get("limit"))
+    if graph is None:
+        graph = romania
+    for state in (start, goal):
+        if state not in graph.index:
+            raise ValueError(f"unknown state: {state}")
+
+    res = ALGORITHMS[algorithm](start, goal, graph, limit, heuristic, instrument, trace)
+
+    node = res.get("goal_node")
+    if "path" in res:
+        path, cost = res["path"], res.get("path_cost")
+    elif node is not None:
+        path, cost = extract_path(node, graph), node.path_cost
+    else:
+        path, cost = None, None
+
+    out = {
+        "start": start, "goal": goal, "algorithm": algorithm, "limit": limit,
+        "found": path is not None, "path": path, "cost": cost,
+        "nodes_expanded": res.get("nodes_expanded"),
+        "nodes_generated": res.get("nodes_generated"),
+        "time": res.get("time"), "peak_memory": res.get("peak_memory"),
+    }
+    if "iterations" in res:
+        out["iterations"] = res["iterations"]
+    return out
+
+
+def query_key(q, graph=None, heuristic=None):
+    # QueryCache key of a query (or of a result, which repeats its fields)
+    return QueryCache.key(graph if graph is not None else romania,
+                          algorithm_name(q.get("algorithm") or "A*"),
+                          q["start"], q["goal"], _limit(q.get("limit")), heuristic)
+
+
+def answer(lineno, q, graph=None, heuristic=None, instrument=COUNTERS, timeout=None,
+           cache=None):
+    # run_query for one parsed line; failures and timeouts become "error"
+    # results so one bad query never stops a batch. Errors are not cached.
+    if isinstance(q, ValueError):
+        return {"line": lineno, "error": str(q)}
+    trace = ProgressTrace(max_seconds=timeout) if timeout is not None else None
+    try:
+        if cache is None:
+            return dict(line=lineno, **run_query(q, graph, heuristic, instrument, trace))
+        key = query_key(q, graph, heuristic)
+        result = cache.get(key)
+        if result is not None:
+            return dict(line=lineno, **result, cached=True)
+        result = run_query(q, graph, heuristic, instrument, trace)
+        cache.put(key, result)
+        return dict(line=lineno, **result)
+    except SearchAborted as e:
+        return {"line": lineno, "query": q, "error": str(e), "timeout": True}
+    except (ValueError, KeyError, TypeError) as e:
+        return {"line": lineno, "query": q, "error": str(e)}
+
+
+def remember(results, cache, graph=None, heuristic=None):
+    # Adds results computed elsewhere (worker processes) to cache
+    for result in results:
+        if "error" not in result and not result.get("cached"):
+            stored = dict(result)
+            del stored["line"]
+            cache.put(query_key(stored, graph, heuristic), stored)
+        yield result
+
+
+def write_results(results, out):
+    # Streams one JSON line per result; returns (ok, failed, cached) counts
+    ok = failed = cached = 0
+    for result in results:
+        if "error" in result:
+            failed += 1
+        else:
+            ok += 1
+            cached += bool(result.get("cached"))
+        out.write(json.dumps(result) + "\n")
+    return ok, failed, cached
+
+
+def run_batch(lines, out, graph=None, heuristic=None, instrument=COUNTERS, timeout=None,
+              cache=None):
+    return write_results(
+        (answer(lineno, q, graph, heuristic, instrument, timeout, cache)
+         for lineno, q in parse_queries(lines)), out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run start/goal queries without the GUI and write JSONL results.")
+    parser.add_argument("queries", help="query file, or - for stdin")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--heuristic", choices=("landmark", "euclidean", "zero"),
+                        help="heuristic for the informed searches (default: auto)")
+    parser.add_argument("--instrument", choices=LEVELS, default=COUNTERS)
+    parser.add_argument("--graph", help="map: .gr, .csv or binary graph file; default Romania")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per query")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes (0: one per core)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="with workers, write results as they finish")
+    parser.add_argument("--cache", help="result cache file, loaded first and saved after")
+    parser.add_argument("--cache-size", type=int, default=100000,
+                        help="most results kept in the cache (LRU)")
+    args = parser.parse_args(argv)
+
+    graph = open_graph(args.graph) if args.graph else None
+    cache = QueryCache(args.cache_size, args.cache) if args.cache else None
+    src = sys.stdin if args.queries == "-" else open(args.queries, newline="")
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.workers != 1:
+            from parallel import run_parallel
+            # Workers map a binary graph file themselves (text maps are
+            # converted once), and answer from a read-only snapshot of the
+            # cache file; what they compute is added here
+            shared = args.graph if graph is not None and is_graph_file(args.graph) else graph
+            results = run_parallel(parse_queries(src), shared, args.workers or None,
+                                   not args.unordered, args.timeout, args.heuristic,
+                                   args.instrument, cache_path=args.cache,
+                                   cache_size=args.cache_size)
+            if cache is not None:
+                results = remember(results, cache, graph, args.heuristic)
+            ok, failed, cached = write_results(results, out)
+        else:
+            ok, failed, cached = run_batch(src, out, graph, args.heuristic,
+                                           args.instrument, args.timeout, cache)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    if cache is not None:
+        cache.save()
+    print(f"{ok} queries answered ({cached} from cache), {failed} failed",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# benchmarks/frontier.py
+# BFS / DFS on synthetic grids: companion-set frontier vs. the old linear
+# membership scan. Run from the repository root:
+#   python -m benchmarks.frontier --sizes 10000 100000 1000000
+# The scan baseline runs for BFS up to --scan-max states (all three sizes
+# by default; its frontier is one diagonal of the grid, so the scan costs
+# about n^1.5 and 10^6 states take a few minutes). DFS keeps most of the
+# grid on its stack, so its scan is quadratic: 40000 states already take
+# a minute, 10^5 about seven and 10^6 about half a day. It stops at
+# --dfs-scan-max (40000) unless raised.
+
+import argparse
+import math
+import time
+
+import uninformed_search
+from frontier import FIFOFrontier, LIFOFrontier
+from search_trace import ListTrace
+from synthetic_graphs import grid_graph
+
+
+class _ScanMembership:
+    def __contains__(self, state):
+        states = self._store.state
+        return any(states[i] == state for i in self._nodes)
+
+
+class ScanFIFOFrontier(_ScanMembership, FIFOFrontier):
+    pass
+
+
+class ScanLIFOFrontier(_ScanMembership, LIFOFrontier):
+    pass
+
+
+def _time_search(fn, graph, start, goal):
+    t0 = time.perf_counter()
+    res = fn(start, goal, graph=graph, trace=ListTrace())
+    return time.perf_counter() - t0, res
+
+
+def _run(graph, start, goal, scan, algos=("BFS", "DFS")):
+    saved = uninformed_search.FIFOFrontier, uninformed_search.LIFOFrontier
+    if scan:
+        uninformed_search.FIFOFrontier = ScanFIFOFrontier
+        uninformed_search.LIFOFrontier = ScanLIFOFrontier
+    try:
+        searches = {"BFS": uninformed_search.BFS_with_metrics,
+                    "DFS": uninformed_search.DFS_with_metrics}
+        return {algo: _time_search(searches[algo], graph, start, goal) for algo in algos}
+    finally:
+        uninformed_search.FIFOFrontier, uninformed_search.LIFOFrontier = saved
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="BFS / DFS with set-backed frontiers against a linear membership scan.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--scan-max", type=int, default=1_000_000,
+                        help="largest grid to run the BFS linear scan on")
+    parser.add_argument("--dfs-scan-max", type=int, default=40_000,
+                        help="largest grid to run the DFS linear scan on (quadratic)")
+    args = parser.parse_args()
+
+    print(f"{'nodes':>9} {'algo':>4} {'set (s)':>9} {'scan (s)':>9} {'speedup':>8}")
+    for size in args.sizes:
+        side = max(2, int(math.isqrt(size)))
+        graph = grid_graph(side, side)
+        start, goal = graph.names[0], graph.names[-1]
+
+        limits = {"BFS": args.scan_max, "DFS": args.dfs_scan_max}
+        fast = _run(graph, start, goal, scan=False)
+        slow = _run(graph, start, goal, scan=True,
+                    algos=[algo for algo in fast if len(graph) <= limits[algo]])
+
+        for algo, (t_fast, res) in fast.items():
+            if algo not in slow:
+                print(f"{len(graph):>9} {algo:>4} {t_fast:>9.3f} {'-':>9} {'-':>8}")
+                continue
+            t_slow, res_slow = slow[algo]
+            assert res["expanded_list"] == res_slow["expanded_list"]
+            assert res["generated_list"] == res_slow["generated_list"]
+            print(f"{len(graph):>9} {algo:>4} {t_fast:>9.3f} {t_slow:>9.3f} "
+                  f"{t_slow / t_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/incremental.py
+# LPA* repair against searching again after each edit. Each round raises
+# the weight of one edge on the current shortest path (a closure or a
+# jam, the edits that can actually change the answer) and repairs the
+# planner, then runs A* and UCS from scratch on the edited map. Reports the
+# states expanded and the wall time, summed over the rounds, on a random
+# geometric map with landmark bounds. Run from the repository root:
+#   python -m benchmarks.incremental --nodes 20000 --edits 50
+
+import argparse
+import random
+import time
+
+from incremental import LPAStar
+from informed_search import AStar_Search
+from lower_bounds import LandmarkHeuristic
+from synthetic_graphs import geometric_graph
+from uninformed_search import UCS_with_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="LPA* repair against searching again after each edge edit.")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edits", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = geometric_graph(args.nodes, seed=args.seed)
+    rng = random.Random(args.seed)
+    index = graph.index
+    start, goal = graph.names[0], graph.names[-1]
+    # One set of landmark tables for everyone: the edits only raise weights,
+    # so bounds from the original map stay admissible
+    h = LandmarkHeuristic(graph).for_goal(index[goal])
+    planner = LPAStar(start, goal, graph, h)
+    first = planner.compute()
+    print(f"{args.nodes} states, first search: {first['nodes_expanded']} expanded")
+
+    totals = {name: [0, 0.0] for name in ("LPA* repair", "A* rerun", "UCS rerun")}
+    reexpanded = 0
+    path = first["path"]
+    for _ in range(args.edits):
+        i = rng.randrange(len(path) - 1)
+        u, v = index[path[i]], index[path[i + 1]]
+        graph.set_weight(u, v, graph.weight(u, v) * rng.randint(2, 10))
+
+        t0 = time.perf_counter()
+        res = planner.compute()
+        totals["LPA* repair"][0] += res["nodes_expanded"]
+        totals["LPA* repair"][1] += time.perf_counter() - t0
+        reexpanded += res["nodes_reexpanded"]
+        path = res["path"]
+
+        for name, search in (("A* rerun", lambda: AStar_Search(start, goal, graph, h)),
+                             ("UCS rerun", lambda: UCS_with_metrics(start, goal, graph))):
+            t0 = time.perf_counter()
+            fresh = search()
+            totals[name][0] += fresh["nodes_expanded"]
+            totals[name][1] += time.perf_counter() - t0
+            assert fresh["goal_node"].path_cost == res["path_cost"]
+
+    print(f"{args.edits} edits on the current path, totals:")
+    print(f"{'method':>12} {'expanded':>10} {'time (s)':>9}")
+    for name, (expanded, elapsed) in totals.items():
+        print(f"{name:>12} {expanded:>10} {elapsed:>9.3f}")
+    print(f"(LPA* re-expanded {reexpanded} states expanded by an earlier search)")
+
+
+if __name__ == "__main__":
+    main()
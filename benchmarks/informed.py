@@ -0,0 +1,67 @@
+# benchmarks/informed.py
+# Node expansions and wall time of the informed searches against UCS,
+# on the Romania map (goal Bucharest, straight-line table) and on a
+# synthetic grid with a Manhattan heuristic. Run from the repository root:
+#   python -m benchmarks.informed --side 60
+
+import argparse
+import time
+
+from informed_search import AStar_Search, Greedy_Search, IDAStar_Search, RBFS_Search
+from romania_problem import neighbors
+from synthetic_graphs import grid_graph
+from uninformed_search import UCS_with_metrics
+
+ALGORITHMS = {
+    "UCS": lambda s, g, graph, h: UCS_with_metrics(s, g, graph=graph),
+    "Greedy": lambda s, g, graph, h: Greedy_Search(s, g, graph=graph, heuristic=h),
+    "A*": lambda s, g, graph, h: AStar_Search(s, g, graph=graph, heuristic=h),
+    "IDA*": lambda s, g, graph, h: IDAStar_Search(s, g, graph=graph, heuristic=h),
+    "RBFS": lambda s, g, graph, h: RBFS_Search(s, g, graph=graph, heuristic=h),
+}
+
+
+def _report(title, queries, skip=()):
+    print(title)
+    print(f"{'algo':>7} {'expanded':>10} {'generated':>10} {'cost':>9} {'time (s)':>9}")
+    for name, fn in ALGORITHMS.items():
+        if name in skip:
+            continue
+        expanded = generated = cost = 0
+        t0 = time.perf_counter()
+        for start, goal, graph, h in queries:
+            res = fn(start, goal, graph, h)
+            expanded += res["nodes_expanded"]
+            generated += res["nodes_generated"]
+            cost += res["goal_node"].path_cost
+        elapsed = time.perf_counter() - t0
+        print(f"{name:>7} {expanded:>10} {generated:>10} {cost:>9} {elapsed:>9.3f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Expansions and wall time of the informed searches against UCS.")
+    parser.add_argument("--side", type=int, default=60)
+    args = parser.parse_args()
+
+    _report("Romania, every city -> Bucharest",
+            [(city, "Bucharest", None, None) for city in neighbors])
+
+    grid = grid_graph(args.side, args.side)
+    coords = grid.coords
+    goal = len(grid) - 1
+    gx, gy = coords[goal]
+
+    def manhattan(s):
+        x, y = coords[s]
+        return abs(x - gx) + abs(y - gy)
+
+    # IDA* / RBFS re-expand heavily on uniform grids; only run them small
+    skip = ("IDA*", "RBFS") if args.side > 12 else ()
+    _report(f"{args.side}x{args.side} grid, corner -> corner",
+            [(grid.names[0], grid.names[goal], grid, manhattan)], skip)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/instrumentation.py
+# Overhead of each instrumentation level. "reported" is the "time" value
+# the search returns; "wall" is what the caller actually waits, including
+# the second, traced run at the MEMORY level. The "traced inline" row is
+# the previous behaviour: timing taken while tracemalloc was running.
+# Run from the repository root:
+#   python -m benchmarks.instrumentation --side 150
+
+import argparse
+import time
+import tracemalloc
+
+from informed_search import AStar_Search
+from instrumentation import COUNTERS, MEMORY, OFF
+from synthetic_graphs import grid_graph
+from uninformed_search import BFS_with_metrics, UCS_with_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Overhead of each instrumentation level.")
+    parser.add_argument("--side", type=int, default=150)
+    args = parser.parse_args()
+
+    graph = grid_graph(args.side, args.side)
+    start, goal = graph.names[0], graph.names[-1]
+    searches = {
+        "BFS": BFS_with_metrics,
+        "UCS": UCS_with_metrics,
+        "A*": lambda s, g, **kw: AStar_Search(s, g, heuristic="zero", **kw),
+    }
+
+    print(f"{len(graph)}-node grid, corner -> corner")
+    print(f"{'algo':>5} {'level':>14} {'wall (s)':>9} {'reported (s)':>13} {'peak (KiB)':>11}")
+    for name, fn in searches.items():
+        for level in (OFF, COUNTERS, MEMORY):
+            t0 = time.perf_counter()
+            res = fn(start, goal, graph=graph, instrument=level)
+            wall = time.perf_counter() - t0
+            reported = "-" if res["time"] is None else f"{res['time']:.3f}"
+            peak = "-" if res["peak_memory"] is None else f"{res['peak_memory'] / 1024:.0f}"
+            print(f"{name:>5} {level:>14} {wall:>9.3f} {reported:>13} {peak:>11}")
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        fn(start, goal, graph=graph, instrument=OFF)
+        wall = time.perf_counter() - t0
+        tracemalloc.stop()
+        print(f"{name:>5} {'traced inline':>14} {wall:>9.3f} {wall:>13.3f} {'':>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/level_bfs.py
+# The NumPy level-at-a-time BFS engine against the node-at-a-time loop, on
+# synthetic maps, for a far-away goal (most of the map is searched), plus
+# multi-source hop distances (bfs_distances) to every state. Runs are
+# interleaved and the best of --repeat is kept. Run from the repository
+# root:
+#   python -m benchmarks.level_bfs --nodes 200000
+
+import argparse
+import time
+
+from level_bfs import bfs_distances
+from synthetic_graphs import FAMILIES
+from uninformed_search import BFS_with_metrics
+
+
+def _best(fns, repeat):
+    best = [float("inf")] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="NumPy level-synchronous BFS against the node-at-a-time loop.")
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--families", nargs="+", default=["grid", "geometric", "scale_free"])
+    parser.add_argument("--sources", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'family':>11} {'expanded':>9} {'python':>8} {'numpy':>8} {'speedup':>8}"
+          f"   {'sources':>7} {'distances':>9}   (s)")
+    for family in args.families:
+        graph = FAMILIES[family](args.nodes)
+        graph.edges    # build the merged array outside the timing
+        start, goal = graph.names[0], graph.names[-1]
+        res = BFS_with_metrics(start, goal, graph=graph)
+        fast = BFS_with_metrics(start, goal, graph=graph, engine="numpy")
+        assert fast["nodes_expanded"] == res["nodes_expanded"]
+
+        python, numpy = _best([
+            lambda: BFS_with_metrics(start, goal, graph=graph),
+            lambda: BFS_with_metrics(start, goal, graph=graph, engine="numpy"),
+        ], args.repeat)
+        step = max(len(graph) // args.sources, 1)
+        sources = list(range(0, len(graph), step))[:args.sources]
+        distances, = _best([lambda: bfs_distances(graph, sources)], args.repeat)
+        print(f"{family:>11} {res['nodes_expanded']:>9} {python:>8.3f} {numpy:>8.3f} "
+              f"{python / numpy:>7.1f}x   {len(sources):>7} {distances:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
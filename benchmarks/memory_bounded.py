@@ -0,0 +1,69 @@
+# benchmarks/memory_bounded.py
+# Memory-bounded informed search against A*: SMA* under several node
+# budgets and beam search under several widths, for one far-apart query on
+# a random geometric map, with each heuristic. Reports the path cost (and
+# its excess over the optimum), states expanded, wall time, and traced peak
+# memory (a second, MEMORY-level run). SMA* runs that exhaust --max-expanded
+# are reported as aborted. Run from the repository root:
+#   python -m benchmarks.memory_bounded --nodes 50000 --budgets 10000,2000
+
+import argparse
+
+from informed_search import AStar_Search, Beam_Search, SMAStar_Search
+from instrumentation import COUNTERS, MEMORY
+from search_trace import ProgressTrace, SearchAborted
+from synthetic_graphs import geometric_graph
+
+
+def _ints(text):
+    return [int(x) for x in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="SMA* and beam search under memory limits against A*.")
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--budgets", type=_ints, default=[10000, 2000])
+    parser.add_argument("--widths", type=_ints, default=[100, 10])
+    parser.add_argument("--heuristics", nargs="+", default=["landmark", "euclidean"])
+    parser.add_argument("--max-expanded", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = geometric_graph(args.nodes, seed=args.seed)
+    graph.edges     # build the merged array outside the timing
+    start, goal = graph.names[0], graph.names[-1]
+
+    print(f"{'heuristic':>10} {'search':>12} {'cost':>10} {'excess':>7} {'expanded':>9} "
+          f"{'time (s)':>9} {'peak MB':>8}")
+    for kind in args.heuristics:
+        runs = [("A*", lambda i, t: AStar_Search(start, goal, graph, kind, i, t))]
+        for budget in args.budgets:
+            runs.append((f"SMA* {budget}", lambda i, t, b=budget: SMAStar_Search(
+                start, goal, graph, kind, b, i, t)))
+        for width in args.widths:
+            runs.append((f"beam {width}", lambda i, t, w=width: Beam_Search(
+                start, goal, graph, kind, w, i, t)))
+
+        best = None
+        for name, search in runs:
+            try:
+                res = search(COUNTERS, ProgressTrace(max_nodes=args.max_expanded))
+                peak = search(MEMORY, None)["peak_memory"] / 1e6
+            except SearchAborted:
+                print(f"{kind:>10} {name:>12} {'aborted':>10}")
+                continue
+            node = res["goal_node"]
+            if node is None:
+                print(f"{kind:>10} {name:>12} {'no path':>10} {'':>7} {res['nodes_expanded']:>9} "
+                      f"{res['time']:>9.3f} {peak:>8.2f}")
+                continue
+            cost = node.path_cost
+            if best is None:
+                best = cost     # A* first: the optimum
+            print(f"{kind:>10} {name:>12} {cost:>10g} {100 * (cost / best - 1):>6.1f}% "
+                  f"{res['nodes_expanded']:>9} {res['time']:>9.3f} {peak:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
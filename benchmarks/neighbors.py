@@ -0,0 +1,76 @@
+# benchmarks/neighbors.py
+# Cost per edge of walking a state's neighbours: indexing targets[e] and
+# weights[e] per edge (the previous loop), zipping one slice of each CSR
+# array, and pairing up one slice of the merged Graph.edges array (what the
+# searches do now). States are visited in random order, as in a search.
+# Slicing has a fixed cost per state and a lower cost per edge, so it pays
+# off with the degree; one merged slice keeps the fixed cost close to the
+# index loop on sparse maps. Run from the repository root:
+#   python -m benchmarks.neighbors --nodes 5000 --degrees 4 16 64 256
+
+import argparse
+import random
+import time
+
+from synthetic_graphs import random_graph
+
+
+def by_index(graph, order):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    total = 0
+    for u in order:
+        for e in range(offsets[u], offsets[u + 1]):
+            total += targets[e] + weights[e]
+    return total
+
+
+def by_slice(graph, order):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    total = 0
+    for u in order:
+        lo, hi = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[lo:hi], weights[lo:hi]):
+            total += v + w
+    return total
+
+
+def by_merged(graph, order):
+    offsets, edges = graph.offsets, graph.edges
+    total = 0
+    for u in order:
+        pairs = iter(edges[2 * offsets[u]:2 * offsets[u + 1]])
+        for v, w in zip(pairs, pairs):
+            total += v + w
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cost per edge of the ways to walk a state's neighbours.")
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--degrees", type=int, nargs="+", default=[4, 16, 64, 256])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'degree':>7} {'index':>8} {'slices':>8} {'merged':>8} {'speedup':>8}   (ns/edge)")
+    for degree in args.degrees:
+        graph = random_graph(args.nodes, degree, seed=0)
+        graph.edges    # build the merged array outside the timing
+        order = list(range(len(graph)))
+        random.Random(0).shuffle(order)
+
+        # Interleaved repeats, best of each: the machine's noise hits both
+        best = {by_index: float("inf"), by_slice: float("inf"), by_merged: float("inf")}
+        for _ in range(args.repeat):
+            for fn in best:
+                t0 = time.perf_counter()
+                fn(graph, order)
+                best[fn] = min(best[fn], time.perf_counter() - t0)
+
+        per_edge = 1e9 / graph.num_edges
+        print(f"{degree:>7} {best[by_index] * per_edge:>8.1f} {best[by_slice] * per_edge:>8.1f} "
+              f"{best[by_merged] * per_edge:>8.1f} {best[by_index] / best[by_merged]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
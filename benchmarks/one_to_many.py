@@ -0,0 +1,73 @@
+# benchmarks/one_to_many.py
+# One search to a whole goal set against one search per goal: the cost of
+# routing from a depot to many stops. Separate UCS runs redo the shared part
+# of the search for every goal; UCS_many_with_metrics and AStar_Many_Search
+# settle all the goals (or the --k nearest) in a single pass. Reports states
+# expanded and the best wall time of --repeat on a random geometric map.
+# Run from the repository root:
+#   python -m benchmarks.one_to_many --nodes 20000 --goals 200
+
+import argparse
+import random
+import time
+
+from informed_search import AStar_Many_Search
+from synthetic_graphs import geometric_graph
+from uninformed_search import UCS_many_with_metrics, UCS_with_metrics
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = fn()
+        best = min(best, time.perf_counter() - t0)
+    return res, best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="One search to a whole goal set against one search per goal.")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = geometric_graph(args.nodes, seed=args.seed)
+    graph.edges     # build the merged array outside the timing
+    rng = random.Random(args.seed)
+    start = graph.names[0]
+    goals = rng.sample(graph.names, args.goals)
+
+    def separate():
+        expanded, costs = 0, {}
+        for goal in goals:
+            res = UCS_with_metrics(start, goal, graph=graph)
+            expanded += res["nodes_expanded"]
+            if res["goal_node"]:
+                costs[goal] = res["goal_node"].path_cost
+        return {"nodes_expanded": expanded, "path_costs": costs}
+
+    runs = [
+        (f"{args.goals} x UCS", separate),
+        ("UCS, all goals", lambda: UCS_many_with_metrics(start, goals, graph=graph)),
+        ("A*, all goals", lambda: AStar_Many_Search(start, goals, graph=graph)),
+        (f"UCS, {args.k} nearest", lambda: UCS_many_with_metrics(start, goals, graph=graph, k=args.k)),
+        (f"A*, {args.k} nearest", lambda: AStar_Many_Search(start, goals, graph=graph, k=args.k)),
+    ]
+    print(f"{args.nodes} states, {args.goals} goals")
+    print(f"{'method':>16} {'expanded':>10} {'time (s)':>9}")
+    reference = None
+    for name, fn in runs:
+        res, elapsed = _timed(fn, 1 if name.endswith("x UCS") else args.repeat)
+        costs = res["path_costs"]
+        if reference is None:
+            reference = costs
+        assert all(costs[g] == reference[g] for g in costs)
+        print(f"{name:>16} {res['nodes_expanded']:>10} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
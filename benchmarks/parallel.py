@@ -0,0 +1,65 @@
+# benchmarks/parallel.py
+# Throughput of parallel.run_parallel from 1 to N worker processes against
+# answering the same queries in-process. Speedup is relative to one worker;
+# it is bounded by the number of cores (os.cpu_count()). Run from the
+# repository root:
+#   python -m benchmarks.parallel --nodes 20000 --queries 400
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from batch import answer
+from parallel import run_parallel
+from synthetic_graphs import geometric_graph
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Batch throughput from 1 to N worker processes.")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--algorithm", default="A*")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=16)
+    args = parser.parse_args()
+
+    graph = geometric_graph(args.nodes)
+    rng = random.Random(0)
+    queries = [(i, {"start": graph.names[rng.randrange(len(graph))],
+                    "goal": graph.names[rng.randrange(len(graph))],
+                    "algorithm": args.algorithm})
+               for i in range(args.queries)]
+
+    fd, path = tempfile.mkstemp(suffix=".csr")
+    os.close(fd)
+    try:
+        graph.save(path)
+        print(f"{len(graph)}-node geometric graph, {args.queries} {args.algorithm} "
+              f"queries, {os.cpu_count()} cores")
+        print(f"{'workers':>10} {'time (s)':>9} {'queries/s':>10} {'speedup':>8}")
+
+        t0 = time.perf_counter()
+        for lineno, q in queries:
+            answer(lineno, q, graph)
+        elapsed = time.perf_counter() - t0
+        print(f"{'in-process':>10} {elapsed:>9.2f} {args.queries / elapsed:>10.1f} {'-':>8}")
+
+        base = None
+        for workers in range(1, args.max_workers + 1):
+            t0 = time.perf_counter()
+            # Pool start-up and graph mapping are part of the measured time
+            for _ in run_parallel(queries, path, workers, chunksize=args.chunksize):
+                pass
+            elapsed = time.perf_counter() - t0
+            base = base or elapsed
+            print(f"{workers:>10} {elapsed:>9.2f} {args.queries / elapsed:>10.1f} "
+                  f"{base / elapsed:>7.2f}x")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
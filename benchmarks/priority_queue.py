@@ -0,0 +1,83 @@
+# benchmarks/priority_queue.py
+# UCS frontier on dense random graphs: lazy-deletion heapq (the previous
+# approach) vs. the addressable BinaryHeap / PairingHeap. Reports pushes,
+# pops, peak heap size and wall time. Run from the repository root:
+#   python -m benchmarks.priority_queue --nodes 2000 --degree 50
+
+import argparse
+import heapq
+import itertools
+import time
+
+from priority_queue import BinaryHeap, PairingHeap
+from synthetic_graphs import random_graph
+from uninformed_search import UCS_with_metrics
+
+
+class LazyHeap:
+    # Same interface as the indexed queues, but every relaxation pushes a
+    # new entry and stale ones are skipped on pop.
+    def __init__(self):
+        self._heap = []
+        self._best = {}
+        self._count = itertools.count()
+        self.pushes = 0
+        self.pops = 0
+        self.max_size = 0
+
+    def push_or_decrease(self, item, priority):
+        old = self._best.get(item)
+        if old is not None and old <= priority:
+            return False
+        self._best[item] = priority
+        heapq.heappush(self._heap, (priority, next(self._count), item))
+        self.pushes += 1
+        self.max_size = max(self.max_size, len(self._heap))
+        return True
+
+    push = push_or_decrease
+
+    def pop(self):
+        while True:
+            priority, _, item = heapq.heappop(self._heap)
+            self.pops += 1
+            if self._best.get(item) == priority:
+                del self._best[item]
+                return item, priority
+
+    def __bool__(self):
+        return bool(self._best)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="UCS with lazy-deletion heapq against the addressable heaps.")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--degree", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    graph = random_graph(args.nodes, args.degree, seed=1)
+    pairs = [(graph.names[i], graph.names[-1 - i]) for i in range(args.queries)]
+
+    print(f"{args.nodes} nodes, {graph.num_edges // 2} edges, {args.queries} queries")
+    print(f"{'queue':>12} {'pushes':>9} {'pops':>9} {'max size':>9} {'time (s)':>9}")
+    for cls in (LazyHeap, BinaryHeap, PairingHeap):
+        queues = []
+
+        def factory():
+            q = cls()
+            queues.append(q)
+            return q
+
+        t0 = time.perf_counter()
+        for start, goal in pairs:
+            UCS_with_metrics(start, goal, graph=graph, queue=factory)
+        elapsed = time.perf_counter() - t0
+        print(f"{cls.__name__:>12} {sum(q.pushes for q in queues):>9} "
+              f"{sum(q.pops for q in queues):>9} {max(q.max_size for q in queues):>9} "
+              f"{elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# benchmarks/suite.py
+# Every search function over the synthetic graph families, with repeated
+# trials. Reports wall time (median and min over trials), nodes expanded /
+# generated, peak memory (one extra MEMORY-level run) and throughput in
+# expansions per second, as JSON or CSV. Queries come from a fixed seed, so
+# two runs on different commits measure the same work; --compare flags rows
+# whose median time grew by more than --threshold. Run from the repository
+# root:
+#   python -m benchmarks.suite --sizes 1000,10000 --output before.json
+#   python -m benchmarks.suite --sizes 1000,10000 --compare before.json
+
+import argparse
+import csv
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from informed_search import (
+    AStar_Search, BidirectionalAStar_Search, Greedy_Search, IDAStar_Search, RBFS_Search,
+    SMAStar_Search, Beam_Search,
+)
+from instrumentation import COUNTERS, MEMORY
+from search_trace import ProgressTrace, SearchAborted
+from synthetic_graphs import FAMILIES
+from uninformed_search import (
+    BFS_with_metrics, DFS_with_metrics, UCS_with_metrics, DLS_with_metrics,
+    IDS_with_metrics, Backtracking_with_metrics, Bidirectional_with_metrics,
+    BidirectionalUCS_with_metrics,
+)
+
+# name -> (search(start, goal, graph, instrument, trace), budgeted). The
+# depth-limited, backtracking, IDA*/RBFS and SMA* searches can take
+# exponential time on cyclic graphs, so they run under a node budget
+# (ProgressTrace); queries that exhaust it are counted in "aborted".
+ALGORITHMS = {
+    "BFS": (lambda s, g, graph, i, t: BFS_with_metrics(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "BFS (NumPy)": (lambda s, g, graph, i, t: BFS_with_metrics(
+        s, g, graph=graph, engine="numpy", instrument=i, trace=t), False),
+    "DFS": (lambda s, g, graph, i, t: DFS_with_metrics(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "UCS": (lambda s, g, graph, i, t: UCS_with_metrics(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "DLS": (lambda s, g, graph, i, t: DLS_with_metrics(
+        s, g, 12, graph=graph, instrument=i, trace=t), True),
+    "IDS": (lambda s, g, graph, i, t: IDS_with_metrics(
+        s, g, 12, graph=graph, instrument=i, trace=t), True),
+    "Backtracking": (lambda s, g, graph, i, t: Backtracking_with_metrics(
+        s, g, graph=graph, instrument=i, trace=t), True),
+    "Bidirectional": (lambda s, g, graph, i, t: Bidirectional_with_metrics(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "Bidirectional UCS": (lambda s, g, graph, i, t: BidirectionalUCS_with_metrics(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "Greedy": (lambda s, g, graph, i, t: Greedy_Search(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "A*": (lambda s, g, graph, i, t: AStar_Search(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "IDA*": (lambda s, g, graph, i, t: IDAStar_Search(
+        s, g, graph=graph, instrument=i, trace=t), True),
+    "RBFS": (lambda s, g, graph, i, t: RBFS_Search(
+        s, g, graph=graph, instrument=i, trace=t), True),
+    "Bidirectional A*": (lambda s, g, graph, i, t: BidirectionalAStar_Search(
+        s, g, graph=graph, instrument=i, trace=t), False),
+    "SMA*": (lambda s, g, graph, i, t: SMAStar_Search(
+        s, g, graph=graph, instrument=i, trace=t), True),
+    "Beam": (lambda s, g, graph, i, t: Beam_Search(
+        s, g, graph=graph, instrument=i, trace=t), False),
+}
+
+FIELDS = [
+    "family", "size", "edges", "algorithm", "queries", "aborted", "trials",
+    "time_median", "time_min", "nodes_expanded", "nodes_generated",
+    "peak_memory", "expansions_per_sec",
+]
+
+
+def queries_for(graph, count, seed=0):
+    rng = random.Random(seed)
+    n = len(graph)
+    return [(graph.names[rng.randrange(n)], graph.names[rng.randrange(n)])
+            for _ in range(count)]
+
+
+def _run_queries(fn, graph, queries, instrument, budget):
+    # -> (results, aborted, expansions made by the aborted queries)
+    results = []
+    aborted = spent = 0
+    for s, g in queries:
+        trace = ProgressTrace(max_nodes=budget) if budget is not None else None
+        try:
+            results.append(fn(s, g, graph, instrument, trace))
+        except SearchAborted:
+            aborted += 1
+            spent += trace.expanded
+    return results, aborted, spent
+
+
+def run_case(fn, graph, queries, trials, memory=True, budget=None):
+    # Counters are deterministic, so they come from the first trial.
+    # Aborted queries add the expansions made before the budget ran out.
+    times = []
+    expanded = generated = aborted = None
+    for _ in range(trials):
+        t0 = time.perf_counter()
+        results, n_aborted, spent = _run_queries(fn, graph, queries, COUNTERS, budget)
+        times.append(time.perf_counter() - t0)
+        if expanded is None:
+            expanded = sum(r["nodes_expanded"] for r in results) + spent
+            generated = sum(r["nodes_generated"] for r in results)
+            aborted = n_aborted
+    peak = None
+    if memory:
+        results = _run_queries(fn, graph, queries, MEMORY, budget)[0]
+        peak = max((r["peak_memory"] for r in results), default=None)
+    median = statistics.median(times)
+    return {
+        "aborted": aborted,
+        "time_median": median, "time_min": min(times),
+        "nodes_expanded": expanded, "nodes_generated": generated,
+        "peak_memory": peak,
+        "expansions_per_sec": expanded / median if median > 0 else None,
+    }
+
+
+def run_suite(families, sizes, algorithms, queries=5, trials=3, seed=0,
+              memory=True, budget=200000, log=None):
+    rows = []
+    for family in families:
+        for size in sizes:
+            graph = FAMILIES[family](size, seed=seed)
+            qs = queries_for(graph, queries, seed)
+            for name in algorithms:
+                fn, budgeted = ALGORITHMS[name]
+                row = {
+                    "family": family, "size": len(graph), "edges": graph.num_edges,
+                    "algorithm": name, "queries": queries, "trials": trials,
+                }
+                row.update(run_case(fn, graph, qs, trials, memory,
+                                    budget if budgeted else None))
+                rows.append(row)
+                if log:
+                    log(row)
+    return rows
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"commit": commit, "python": platform.python_version(),
+            "platform": platform.platform()}
+
+
+def write_results(rows, path, fmt):
+    out = open(path, "w", newline="") if path else sys.stdout
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(out, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump({"environment": environment(), "results": rows}, out, indent=2)
+            out.write("\n")
+    finally:
+        if path:
+            out.close()
+
+
+def load_results(path):
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            return [dict(r, size=int(r["size"]), time_median=float(r["time_median"]))
+                    for r in csv.DictReader(f)]
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(rows, baseline, threshold):
+    # Rows slower than the baseline by more than threshold (a fraction)
+    key = lambda r: (r["family"], r["size"], r["algorithm"])
+    before = {key(r): r for r in baseline}
+    regressions = []
+    for row in rows:
+        old = before.get(key(row))
+        if old is None or not old["time_median"]:
+            continue
+        ratio = row["time_median"] / old["time_median"]
+        if ratio > 1 + threshold:
+            regressions.append((row, ratio))
+    return regressions
+
+
+def _csv_list(text):
+    return [item for item in text.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time every search over the synthetic graph families; --compare "
+                    "flags regressions against an earlier --output.")
+    parser.add_argument("--families", type=_csv_list, default=list(FAMILIES))
+    parser.add_argument("--sizes", type=lambda t: [int(x) for x in _csv_list(t)],
+                        default=[1000, 10000])
+    parser.add_argument("--algorithms", type=_csv_list, default=list(ALGORITHMS))
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=int, default=200000,
+                        help="node budget per query for the exponential searches")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc run for peak memory")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    parser.add_argument("--compare", help="earlier JSON/CSV results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    for name in args.families:
+        if name not in FAMILIES:
+            parser.error(f"unknown family: {name}")
+    for name in args.algorithms:
+        if name not in ALGORITHMS:
+            parser.error(f"unknown algorithm: {name}")
+
+    def log(row):
+        print(f"{row['family']:>10} {row['size']:>7} {row['algorithm']:>13} "
+              f"{row['time_median']:>9.4f}s {row['nodes_expanded']:>9} exp"
+              + (f" ({row['aborted']} aborted)" if row["aborted"] else ""),
+              file=sys.stderr)
+
+    rows = run_suite(args.families, args.sizes, args.algorithms, args.queries,
+                     args.trials, args.seed, not args.no_memory, args.budget, log)
+    write_results(rows, args.output, args.format)
+
+    if args.compare:
+        regressions = compare(rows, load_results(args.compare), args.threshold)
+        for row, ratio in regressions:
+            print(f"REGRESSION {row['family']} {row['size']} {row['algorithm']}: "
+                  f"{ratio:.2f}x slower", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
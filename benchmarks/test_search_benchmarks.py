@@ -0,0 +1,41 @@
+# benchmarks/test_search_benchmarks.py
+# The suite's cases as pytest-benchmark tests, for its storage and
+# comparison tooling. Skipped unless pytest-benchmark is installed:
+#   python -m pytest benchmarks --benchmark-autosave
+#   python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:10%
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.suite import ALGORITHMS, _run_queries, queries_for
+from instrumentation import OFF
+from synthetic_graphs import FAMILIES
+
+SIZE = 2000
+QUERIES = 5
+BUDGET = 50000
+
+_graphs = {}
+
+
+def _graph(family):
+    if family not in _graphs:
+        _graphs[family] = FAMILIES[family](SIZE)
+    return _graphs[family]
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+@pytest.mark.parametrize("family", list(FAMILIES))
+def test_search(benchmark, family, algorithm):
+    graph = _graph(family)
+    queries = queries_for(graph, QUERIES)
+    fn, budgeted = ALGORITHMS[algorithm]
+    budget = BUDGET if budgeted else None
+
+    results, aborted, spent = benchmark(_run_queries, fn, graph, queries, OFF, budget)
+
+    benchmark.extra_info["nodes_expanded"] = \
+        sum(r["nodes_expanded"] for r in results) + spent
+    benchmark.extra_info["nodes_generated"] = sum(r["nodes_generated"] for r in results)
+    benchmark.extra_info["aborted"] = aborted
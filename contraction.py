@@ -0,0 +1,360 @@
+# contraction.py
+# Contraction hierarchies: preprocessing for fast exact point-to-point
+# shortest paths on large road-like maps.
+#
+# Preprocessing contracts states one at a time in order of importance
+# (edge difference + contracted neighbours, updated lazily). Contracting v
+# adds a shortcut u - w of weight w(u, v) + w(v, w) whenever a small
+# witness search finds no path at least as short without v. Every edge
+# then points "upward" from the state contracted first, and a query is a
+# bidirectional Dijkstra that only follows upward edges from both ends; it
+# settles a few hundred states where UCS settles most of the map, and
+# shortcuts are unpacked back into original edges through their middle
+# state. The graphs here are undirected, so one upward graph serves both
+# search directions.
+#
+# The result has the same cost as UCS_with_metrics; the path is the same
+# whenever the shortest path is unique (ties may resolve differently).
+
+import heapq
+import mmap
+import struct
+import sys
+import weakref
+from array import array
+
+from graph import romania
+from instrumentation import COUNTERS, measure
+from search_trace import hooks
+from uninformed_search import Node, _resolve
+
+INF = float("inf")
+NO_MIDDLE = -1
+
+# File: header (magic, version, n, upward edge count, weight typecode,
+# graph fingerprint), then rank (n int64), upward CSR offsets (n+1 int64),
+# targets, weights and shortcut middles (m each, 8 bytes), little-endian
+MAGIC = b"CHGR"
+VERSION = 1
+_HEADER = struct.Struct("<4sIQQc7x64s")
+
+
+# Preprocessing
+def _witness(adj, source, exclude, limit, max_settled):
+    # Bounded Dijkstra from source that never passes through exclude
+    dist = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > limit or settled >= max_settled:
+            break
+        settled += 1
+        for v, w in adj[u].items():
+            if v == exclude:
+                continue
+            nd = d + w
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _shortcuts(adj, v, max_settled):
+    # Shortcuts needed to contract v: (u, w, weight) with u < w
+    nbrs = list(adj[v].items())
+    if len(nbrs) < 2:
+        return []
+    max_out = max(w for _, w in nbrs)
+    needed = []
+    for i, (u, wu) in enumerate(nbrs):
+        dist = _witness(adj, u, v, wu + max_out, max_settled)
+        for x, wx in nbrs[i + 1:]:
+            via = wu + wx
+            if dist.get(x, INF) > via:
+                needed.append((u, x, via))
+    return needed
+
+
+def _priority(adj, v, deleted, max_settled):
+    return len(_shortcuts(adj, v, max_settled)) - len(adj[v]) + deleted[v]
+
+
+class ContractionHierarchy:
+    def __init__(self, graph, rank, offsets, targets, weights, middles):
+        self.graph = graph
+        self.version = graph.version
+        self.rank = rank
+        # Upward graph: edges u -> v with rank[v] > rank[u]
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middles = middles
+
+    @classmethod
+    def build(cls, graph=None, max_settled=50):
+        # max_settled bounds each witness search: lower is faster to build,
+        # at the cost of some unnecessary shortcuts
+        graph = graph if graph is not None else romania
+        n = len(graph)
+        adj = [dict() for _ in range(n)]
+        middle = {}
+        for u in range(n):
+            for e in range(graph.offsets[u], graph.offsets[u + 1]):
+                v, w = graph.targets[e], graph.weights[e]
+                if v != u and w < adj[u].get(v, INF):
+                    adj[u][v] = w
+                    adj[v][u] = w
+
+        deleted = [0] * n
+        heap = [(_priority(adj, v, deleted, max_settled), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = array("q", [0]) * n
+        up = [None] * n
+        order = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            # Lazy update: contract v only if it is still the least important
+            prio = _priority(adj, v, deleted, max_settled)
+            if heap and prio > heap[0][0]:
+                heapq.heappush(heap, (prio, v))
+                continue
+
+            for u, x, w in _shortcuts(adj, v, max_settled):
+                if w < adj[u].get(x, INF):
+                    adj[u][x] = w
+                    adj[x][u] = w
+                    middle[u, x] = middle[x, u] = v
+
+            rank[v] = order
+            order += 1
+            up[v] = [(u, w, middle.get((v, u), NO_MIDDLE)) for u, w in adj[v].items()]
+            for u in adj[v]:
+                del adj[u][v]
+                deleted[u] += 1
+            adj[v] = {}
+
+        typecode = _typecode(graph.weights)
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array(typecode)
+        middles = array("q")
+        for v in range(n):
+            for u, w, m in sorted(up[v]):
+                targets.append(u)
+                weights.append(w)
+                middles.append(m)
+            offsets.append(len(targets))
+        return cls(graph, rank, offsets, targets, weights, middles)
+
+    @property
+    def num_shortcuts(self):
+        return sum(1 for m in self.middles if m != NO_MIDDLE)
+
+    # Serialisation (same layout conventions as Graph.save)
+    def save(self, path):
+        sections = [array("q", self.rank), array("q", self.offsets),
+                    array("q", self.targets), array(_typecode(self.weights), self.weights),
+                    array("q", self.middles)]
+        if sys.byteorder != "little":
+            for a in sections:
+                a.byteswap()
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(self.rank), len(self.targets),
+                                 sections[3].typecode.encode(),
+                                 self.graph.fingerprint().encode()))
+            for a in sections:
+                a.tofile(f)
+
+    @classmethod
+    def load(cls, path, graph=None, use_mmap=True):
+        # The hierarchy must belong to graph: the stored fingerprint is checked
+        graph = graph if graph is not None else romania
+        with open(path, "rb") as f:
+            if use_mmap and sys.byteorder == "little":
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buf = f.read()
+        magic, version, n, m, typecode, fingerprint = _HEADER.unpack_from(buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a contraction hierarchy (version {VERSION})")
+        if n != len(graph) or fingerprint.decode() != graph.fingerprint():
+            raise ValueError(f"{path}: hierarchy was built for a different graph")
+
+        pos = _HEADER.size
+
+        def section(code, count):
+            nonlocal pos
+            start, pos = pos, pos + 8 * count
+            if isinstance(buf, mmap.mmap):
+                return memoryview(buf)[start:pos].cast(code)
+            a = array(code, buf[start:pos])
+            if sys.byteorder != "little":
+                a.byteswap()
+            return a
+
+        rank = section("q", n)
+        offsets = section("q", n + 1)
+        targets = section("q", m)
+        weights = section(typecode.decode(), m)
+        middles = section("q", m)
+        return cls(graph, rank, offsets, targets, weights, middles)
+
+    # Path unpacking
+    def _middle(self, a, b):
+        # Middle state of the upward edge between a and b (either order)
+        lo, hi = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        for e in range(self.offsets[lo], self.offsets[lo + 1]):
+            if self.targets[e] == hi:
+                return self.middles[e]
+        raise KeyError((a, b))
+
+    def unpack(self, states):
+        # Expand shortcuts in a state sequence into original edges
+        path = [states[0]]
+        stack = []
+        for b in states[1:]:
+            stack.append((path[-1], b))
+            while stack:
+                a, c = stack.pop()
+                m = self._middle(a, c)
+                if m == NO_MIDDLE:
+                    path.append(c)
+                else:
+                    stack.append((m, c))
+                    stack.append((a, m))
+        return path
+
+
+def _typecode(a):
+    fmt = getattr(a, "typecode", None) or a.format
+    return "d" if fmt == "d" else "q"
+
+
+# One hierarchy per graph, built on first use and again after the graph is
+# edited
+_hierarchies = weakref.WeakKeyDictionary()
+
+
+def hierarchy_for(graph):
+    ch = _hierarchies.get(graph)
+    if ch is None or ch.version != graph.version:
+        ch = _hierarchies[graph] = ContractionHierarchy.build(graph)
+    return ch
+
+
+# Query: bidirectional upward Dijkstra
+def _ch_query(ch, start, goal, trace=None):
+    graph = ch.graph
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, targets, weights = ch.offsets, ch.targets, ch.weights
+
+    dist = ({start: 0}, {goal: 0})
+    pred = ({start: None}, {goal: None})
+    heaps = ([(0, start)], [(0, goal)])
+    best = INF
+    meet = None
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    while heaps[0] or heaps[1]:
+        # Advance the side with the smaller key; a side whose key reaches
+        # the best meeting cost so far cannot improve it and is done
+        side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+        heap = heaps[side]
+        d, u = heapq.heappop(heap)
+        if d > dist[side][u]:
+            continue
+        if d >= best:
+            heap.clear()
+            continue
+        if on_expand:
+            on_expand(u, len(heap))
+        nodes_expanded += 1
+
+        other = dist[1 - side].get(u)
+        if other is not None and d + other < best:
+            best = d + other
+            meet = u
+
+        mine = dist[side]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            nd = d + weights[e]
+            if nd < mine.get(v, INF):
+                mine[v] = nd
+                pred[side][v] = u
+                heapq.heappush(heap, (nd, v))
+
+    if meet is None:
+        return {
+            "goal_node": None,
+            "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+        }
+
+    up = []
+    s = meet
+    while s is not None:
+        up.append(s)
+        s = pred[0][s]
+    up.reverse()
+    s = pred[1][meet]
+    while s is not None:
+        up.append(s)
+        s = pred[1][s]
+
+    names = graph.names
+    return {
+        "goal_node": Node(goal, path_cost=best),
+        "path": [names[s] for s in ch.unpack(up)],
+        "path_cost": best,
+        "nodes_expanded": nodes_expanded,
+        "nodes_generated": nodes_generated
+    }
+
+
+def CH_with_metrics(start, goal, graph=None, ch=None, instrument=COUNTERS, trace=None):
+    # ch: a ContractionHierarchy of graph (built and kept on first use if None)
+    graph, start, goal = _resolve(graph if ch is None else ch.graph, start, goal)
+    if ch is None:
+        ch = hierarchy_for(graph)
+    elif ch.version != graph.version:
+        raise ValueError("contraction hierarchy is older than its graph's last edit")
+    return measure(lambda t: _ch_query(ch, start, goal, t), instrument, trace)
+
+
+def main():
+    import argparse
+    from graph import Graph
+
+    parser = argparse.ArgumentParser(
+        description="Build a contraction hierarchy for a graph or query one.")
+    parser.add_argument("--graph", help="binary CSR graph file (default: Romania)")
+    parser.add_argument("-o", "--output", help="hierarchy file to write")
+    parser.add_argument("--hierarchy", help="hierarchy file to query")
+    parser.add_argument("--max-settled", type=int, default=50)
+    parser.add_argument("query", nargs="*", help="start goal")
+    args = parser.parse_args()
+
+    graph = Graph.load(args.graph) if args.graph else romania
+    if args.hierarchy:
+        ch = ContractionHierarchy.load(args.hierarchy, graph)
+    else:
+        ch = ContractionHierarchy.build(graph, args.max_settled)
+        print(f"{len(graph)} states, {ch.num_shortcuts} shortcuts")
+        if args.output:
+            ch.save(args.output)
+    if len(args.query) == 2:
+        res = CH_with_metrics(*args.query, ch=ch)
+        print(res["path"], res["path_cost"], f"({res['nodes_expanded']} settled)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# frontier.py
+# FIFO / LIFO frontiers of node ids (uninformed_search.NodeStore) with a
+# companion state set, so membership tests during expansion are O(1)
+# instead of a scan over the whole frontier. The searches never push a
+# state that is already in the frontier, so a plain set is enough to mirror
+# its contents.
+
+from collections import deque
+
+
+class FIFOFrontier:
+    def __init__(self, store, nodes=()):
+        self._store = store
+        self._nodes = deque()
+        self._states = set()
+        for node in nodes:
+            self.append(node)
+
+    def append(self, node):
+        self._nodes.append(node)
+        self._states.add(self._store.state[node])
+
+    def pop(self):
+        node = self._nodes.popleft()
+        self._states.discard(self._store.state[node])
+        return node
+
+    def __contains__(self, state):
+        return state in self._states
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __bool__(self):
+        return bool(self._nodes)
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+
+class LIFOFrontier(FIFOFrontier):
+    def __init__(self, store, nodes=()):
+        super().__init__(store)
+        self._nodes = []
+        for node in nodes:
+            self.append(node)
+
+    def pop(self):
+        node = self._nodes.pop()
+        self._states.discard(self._store.state[node])
+        return node
@@ -0,0 +1,402 @@
+# graph.py
+# Compact integer-indexed graph used by the search functions.
+# City names are interned to ids once; adjacency is stored as CSR arrays
+# (offsets / targets / weights) so the inner search loops never hash strings.
+
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from romania_problem import neighbors, distances, city_positions
+
+# Binary CSR file: header, then 8-byte little-endian sections
+#   offsets (n+1 int64), targets (m int64), weights (m int64 or float64),
+#   coords (2n float64, NaN where missing; only if FLAG_COORDS),
+#   name offsets (n+1 int64) into a UTF-8 name blob (zero-padded to 8 bytes),
+#   columns (only if FLAG_COLUMNS): count k (int64), column name offsets
+#   (k+1 int64) into a padded UTF-8 blob, then k float64 columns of n values
+MAGIC = b"CSRG"
+VERSION = 1
+FLAG_COORDS = 1
+FLAG_COLUMNS = 2
+_HEADER = struct.Struct("<4sIQQcB6x")
+
+
+class Graph:
+    # columns: optional per-state float data stored with the graph, e.g.
+    # precomputed heuristic tables (LandmarkHeuristic.columns(), read back
+    # by LandmarkHeuristic.from_columns; keys start with LANDMARK_COLUMN);
+    # name -> sequence of len(names) floats
+    # changes: (u, v) of every edge edit since the graph was made; version
+    # is their count, so anything derived from the graph can record the
+    # version it saw and replay (or just detect) later edits
+    def __init__(self, names, offsets, targets, weights, coords=None, columns=None):
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.coords = coords
+        self.columns = columns if columns is not None else {}
+        self.changes = []
+        self._index = None
+        self._fingerprint = None
+        self._edges = None
+
+    @classmethod
+    def from_dicts(cls, neighbors, distances, positions=None):
+        # Intern every city (including ones only listed as a neighbor)
+        names = list(neighbors)
+        seen = set(names)
+        for adj in neighbors.values():
+            for v in adj:
+                if v not in seen:
+                    seen.add(v)
+                    names.append(v)
+        index = {name: i for i, name in enumerate(names)}
+
+        # Edge weights are merged once here, whichever direction is listed
+        is_int = all(isinstance(w, int) for w in distances.values())
+        offsets = array("l", [0])
+        targets = array("l")
+        weights = array("q" if is_int else "d")
+        for u in names:
+            for v in neighbors.get(u, []):
+                w = distances.get((u, v), distances.get((v, u)))
+                if w is None:
+                    continue
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+
+        coords = None
+        if positions is not None:
+            coords = [positions.get(name) for name in names]
+        return cls(names, offsets, targets, weights, coords)
+
+    @classmethod
+    def from_edge_list(cls, names, edges, coords=None, typecode="q"):
+        # edges: sequence of (u, v, w) id triples, each undirected edge once
+        n = len(names)
+        degree = array("l", bytes(array("l").itemsize * (n + 1)))
+        for u, v, _ in edges:
+            degree[u + 1] += 1
+            degree[v + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        offsets = array("l", degree)
+        fill = array("l", degree)
+        targets = array("l", bytes(array("l").itemsize * offsets[n]))
+        weights = array(typecode, bytes(array(typecode).itemsize * offsets[n]))
+        for u, v, w in edges:
+            targets[fill[u]] = v
+            weights[fill[u]] = w
+            fill[u] += 1
+            targets[fill[v]] = u
+            weights[fill[v]] = w
+            fill[v] += 1
+        return cls(names, offsets, targets, weights, coords)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def version(self):
+        return len(self.changes)
+
+    @property
+    def index(self):
+        # name -> id, built on the first lookup (not when a file is opened)
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def id_of(self, name):
+        return self.index[name]
+
+    def name_of(self, i):
+        return self.names[i]
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    @property
+    def edges(self):
+        # Merged adjacency: targets and weights interleaved (v0, w0, v1, w1, ...)
+        # in CSR order, so the pairs of state u are the single slice
+        # [2 * offsets[u], 2 * offsets[u + 1]). Built on first use and kept
+        # (16 bytes per edge); the edit methods below keep it in step.
+        if self._edges is None:
+            weights = self._weight_array()
+            if weights.typecode == "q":
+                edges = array("q", bytes(16 * len(weights)))
+                edges[0::2] = array("q", self.targets)
+            else:
+                # Float weights cannot share an array with integer targets
+                edges = [0] * (2 * len(weights))
+                edges[0::2] = self.targets
+            edges[1::2] = weights
+            self._edges = edges
+        return self._edges
+
+    def neighbors(self, u):
+        # Lazy (neighbour, weight) pairs of u
+        pairs = iter(self.edges[2 * self.offsets[u]:2 * self.offsets[u + 1]])
+        return zip(pairs, pairs)
+
+    def fingerprint(self):
+        # Content hash of names, edges, weights and coordinates. Computed once
+        # per version.
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            h.update("\0".join(self.names).encode())
+            weights = self._weight_array()
+            for a in (array("q", self.offsets), array("q", self.targets),
+                      weights.typecode.encode(), weights):
+                h.update(a)
+            if self.coords is not None:
+                h.update(self._coord_array())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    # Serialisation
+    def _weight_array(self):
+        # weights may be an array or a memoryview of a loaded file
+        fmt = getattr(self.weights, "typecode", None) or self.weights.format
+        return array("d" if fmt == "d" else "q", self.weights)
+
+    def _coord_array(self):
+        if isinstance(self.coords, Coords):
+            return array("d", self.coords.flat)
+        nan = float("nan")
+        coords = array("d")
+        for c in self.coords:
+            coords.extend(c if c is not None else (nan, nan))
+        return coords
+
+    def save(self, path):
+        n, m = len(self), self.num_edges
+        flags = FLAG_COORDS if self.coords is not None else 0
+        if self.columns:
+            flags |= FLAG_COLUMNS
+        name_offsets, name_blob = _pack_strings(self.names)
+
+        sections = [array("q", self.offsets), array("q", self.targets),
+                    self._weight_array()]
+        if flags & FLAG_COORDS:
+            sections.append(self._coord_array())
+        sections.append(name_offsets)
+        columns = []
+        if flags & FLAG_COLUMNS:
+            column_offsets, column_blob = _pack_strings(list(self.columns))
+            columns = [array("q", [len(self.columns)]), column_offsets]
+            columns += [array("d", c) for c in self.columns.values()]
+        if sys.byteorder != "little":
+            for a in sections + columns:
+                a.byteswap()
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, n, m,
+                                 sections[2].typecode.encode(), flags))
+            for a in sections:
+                a.tofile(f)
+            f.write(name_blob)
+            if columns:
+                columns[0].tofile(f)
+                columns[1].tofile(f)
+                f.write(column_blob)
+                for a in columns[2:]:
+                    a.tofile(f)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        # With use_mmap the CSR arrays, coordinates, names and columns are
+        # read-only views of the mapped file: opening costs no parsing and
+        # processes loading the same file share its pages instead of copies
+        with open(path, "rb") as f:
+            if use_mmap and sys.byteorder == "little":
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buf = f.read()
+        magic, version, n, m, typecode, flags = _HEADER.unpack_from(buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a CSR graph file (version {VERSION})")
+        typecode = typecode.decode()
+
+        pos = _HEADER.size
+
+        def section(code, count):
+            nonlocal pos
+            start, pos = pos, pos + 8 * count
+            if isinstance(buf, mmap.mmap):
+                return memoryview(buf)[start:pos].cast(code)
+            a = array(code, buf[start:pos])
+            if sys.byteorder != "little":
+                a.byteswap()
+            return a
+
+        def strings(count):
+            nonlocal pos
+            offsets = section("q", count + 1)
+            start, pos = pos, pos + _padded(offsets[count])
+            return Names(memoryview(buf)[start:pos], offsets)
+
+        offsets = section("q", n + 1)
+        targets = section("q", m)
+        weights = section(typecode, m)
+        coords = Coords(section("d", 2 * n)) if flags & FLAG_COORDS else None
+        names = strings(n)
+        columns = {}
+        if flags & FLAG_COLUMNS:
+            k = section("q", 1)[0]
+            for name in list(strings(k)):
+                columns[name] = section("d", n)
+        return cls(names, offsets, targets, weights, coords, columns)
+
+    def _arc(self, u, v):
+        # Position of arc u -> v in targets / weights, or None
+        targets = self.targets
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if targets[e] == v:
+                return e
+        return None
+
+    def weight(self, u, v):
+        e = self._arc(u, v)
+        return None if e is None else self.weights[e]
+
+    # Edits (closures, traffic). Edges are undirected, so both arcs change
+    # together. Each edit bumps the version: QueryCache keys (fingerprint)
+    # and the per-graph landmark / hierarchy caches follow it, and stored
+    # columns are dropped since they were computed from the old weights.
+    # Adding or removing an edge shifts the CSR arrays, O(n + m).
+    def set_weight(self, u, v, w):
+        w = self._writable(w)
+        for a, b in ((u, v), (v, u)):
+            e = self._arc(a, b)
+            if e is None:
+                raise KeyError((u, v))
+            self.weights[e] = w
+            if self._edges is not None:
+                self._edges[2 * e + 1] = w
+        self._changed(u, v)
+
+    def add_edge(self, u, v, w):
+        # An existing edge just takes the new weight
+        if self._arc(u, v) is not None:
+            return self.set_weight(u, v, w)
+        w = self._writable(w)
+        for a, b in ((u, v), (v, u)):
+            e = self.offsets[a + 1]
+            self.targets.insert(e, b)
+            self.weights.insert(e, w)
+            if self._edges is not None:
+                pair = [b, w]
+                self._edges[2 * e:2 * e] = array("q", pair) if isinstance(self._edges, array) else pair
+            self._shift(a, 1)
+            if a == b:
+                break
+        self._changed(u, v)
+
+    def remove_edge(self, u, v):
+        if self._arc(u, v) is None:
+            raise KeyError((u, v))
+        self._writable()
+        for a, b in ((u, v), (v, u)):
+            e = self._arc(a, b)
+            if e is None:
+                break    # self-loop: one arc
+            del self.targets[e]
+            del self.weights[e]
+            if self._edges is not None:
+                del self._edges[2 * e:2 * e + 2]
+            self._shift(a, -1)
+        self._changed(u, v)
+
+    def _writable(self, w=0):
+        # Loaded graphs are read-only views of their file: the CSR arrays
+        # are copied on the first edit. Integer weights become floats if a
+        # fractional weight arrives. -> w in the weights' type
+        for name in ("offsets", "targets", "weights"):
+            a = getattr(self, name)
+            if not isinstance(a, array):
+                setattr(self, name, array(a.format, a.tobytes()))
+        if self.weights.typecode != "d":
+            if float(w).is_integer():
+                return int(w)
+            self.weights = array("d", self.weights)
+            self._edges = None
+        return float(w)
+
+    def _shift(self, u, delta):
+        offsets = self.offsets
+        for i in range(u + 1, len(offsets)):
+            offsets[i] += delta
+
+    def _changed(self, u, v):
+        self.changes.append((u, v))
+        self._fingerprint = None
+        self.columns = {}
+
+
+def _padded(size):
+    return (size + 7) // 8 * 8
+
+
+def _pack_strings(strings):
+    # -> (int64 offsets, UTF-8 blob zero-padded to a multiple of 8 bytes)
+    encoded = [s.encode() for s in strings]
+    offsets = array("q", [0])
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    blob = b"".join(encoded)
+    return offsets, blob + bytes(_padded(len(blob)) - len(blob))
+
+
+# Read-only sequences over a loaded file: items are decoded on access, so a
+# multi-million-state graph opens without building Python objects per state
+class Names:
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        blob, offsets = self.blob, self.offsets
+        for i in range(len(self)):
+            yield str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+
+
+class Coords:
+    # flat: x0, y0, x1, y1, ... float64 (NaN where a state has no position)
+    def __init__(self, flat):
+        self.flat = flat
+
+    def __len__(self):
+        return len(self.flat) // 2
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        x = self.flat[2 * i]
+        return None if x != x else (x, self.flat[2 * i + 1])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+romania = Graph.from_dicts(neighbors, distances, city_positions)
@@ -0,0 +1,179 @@
+# graph_io.py
+# Loaders for external maps: road networks and other edge lists.
+#
+#   DIMACS shortest-path format (.gr): "p sp n m", then one "a u v w" line
+#   per directed arc with 1-based ids; road networks list both directions
+#   of every road. Coordinates come from the matching .co file ("v id x y").
+#   CSV: "source,target,weight" rows naming each undirected edge once (a
+#   header row is skipped); coordinates from an optional "name,x,y" CSV.
+#
+# Lines are parsed in large chunks (NumPy turns a chunk of numbers into an
+# array in one call) and the CSR arrays come from one stable sort, so a
+# multi-million arc file converts in seconds. Convert once and keep the
+# binary: Graph.load memory-maps it in milliseconds, and landmark tables
+# saved with it (--landmarks) spare every later run the Dijkstra sweeps.
+# Landmark bounds assume every arc has its reverse, as in road networks.
+# NumPy is imported by the text loaders only, so batch.py can import
+# open_graph without paying its start-up for binary or built-in maps.
+#
+#   python graph_io.py USA-road-d.NY.gr -o ny.csr --landmarks 8
+#   python batch.py queries.csv --graph ny.csr
+#   python main.py ny.csr
+
+import argparse
+import csv
+import os
+from array import array
+
+from graph import MAGIC, Coords, Graph
+from lower_bounds import LandmarkHeuristic
+
+# Bytes of text parsed per chunk
+CHUNK = 1 << 22
+
+
+def _csr(n, sources, targets, weights):
+    # CSR arrays from parallel arc arrays (ids 0..n-1), arcs of each state
+    # kept in file order
+    import numpy as np
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    weights = weights[order]
+    if weights.dtype.kind == "f" and np.all(weights == np.round(weights)):
+        weights = weights.astype(np.int64)
+    typecode = "d" if weights.dtype.kind == "f" else "q"
+    return (array("q", offsets.tobytes()),
+            array("q", targets[order].astype(np.int64).tobytes()),
+            array(typecode, weights.astype(np.float64 if typecode == "d" else np.int64).tobytes()))
+
+
+def _numbers(f, tag, columns, dtype):
+    # Numbers on every remaining line that starts with tag, one row per line
+    import numpy as np
+    chunks = []
+    for lines in iter(lambda: f.readlines(CHUNK), []):
+        text = " ".join(line[len(tag):] for line in lines if line.startswith(tag))
+        if text:
+            chunks.append(np.fromstring(text, dtype=dtype, sep=" "))
+    if not chunks:
+        return np.empty((0, columns), dtype=dtype)
+    return np.concatenate(chunks).reshape(-1, columns)
+
+
+# DIMACS
+def read_dimacs(path, coords_path=None):
+    # States are named by their DIMACS ids ("1" .. "n")
+    import numpy as np
+    with open(path) as f:
+        n = None
+        for line in f:
+            if line.startswith("p"):
+                n = int(line.split()[2])
+                break
+        if n is None:
+            raise ValueError(f"{path}: no 'p sp' problem line")
+        arcs = _numbers(f, "a ", 3, np.int64)
+    if len(arcs) and (arcs[:, :2].min() < 1 or arcs[:, :2].max() > n):
+        raise ValueError(f"{path}: arc endpoint outside 1..{n}")
+
+    offsets, targets, weights = _csr(n, arcs[:, 0] - 1, arcs[:, 1] - 1, arcs[:, 2])
+    coords = None
+    if coords_path is not None:
+        with open(coords_path) as f:
+            rows = _numbers(f, "v ", 3, np.float64)
+        flat = np.full((n, 2), np.nan)
+        flat[rows[:, 0].astype(np.int64) - 1] = rows[:, 1:]
+        coords = Coords(array("d", flat.tobytes()))
+    names = [str(i) for i in range(1, n + 1)]
+    return Graph(names, offsets, targets, weights, coords)
+
+
+# CSV
+def read_csv(path, coords_path=None, directed=False):
+    import numpy as np
+    index = {}
+    names = []
+
+    def state(name):
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(name)
+        return i
+
+    sources = array("q")
+    targets = array("q")
+    weights = array("d")
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 3 or row[0].startswith("#"):
+                continue
+            try:
+                w = float(row[2])
+            except ValueError:
+                continue    # header
+            sources.append(state(row[0].strip()))
+            targets.append(state(row[1].strip()))
+            weights.append(w)
+
+    src = np.frombuffer(sources, dtype=np.int64)
+    dst = np.frombuffer(targets, dtype=np.int64)
+    w = np.frombuffer(weights, dtype=np.float64)
+    if not directed:
+        src, dst, w = np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((w, w))
+    offsets, targets, weights = _csr(len(names), src, dst, w)
+
+    coords = None
+    if coords_path is not None:
+        flat = array("d", [float("nan")]) * (2 * len(names))
+        with open(coords_path, newline="") as f:
+            for row in csv.reader(f):
+                i = index.get(row[0].strip()) if len(row) >= 3 else None
+                if i is None:
+                    continue    # header, comment or unknown state
+                flat[2 * i] = float(row[1])
+                flat[2 * i + 1] = float(row[2])
+        coords = Coords(flat)
+    return Graph(names, offsets, targets, weights, coords)
+
+
+def is_graph_file(path):
+    # Binary CSR file written by Graph.save?
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def open_graph(path, coords_path=None):
+    # Any supported map: .gr (DIMACS, with the .co next to it if present),
+    # .csv, or a binary Graph.save file
+    stem, ext = os.path.splitext(path)
+    if ext == ".gr":
+        if coords_path is None and os.path.exists(stem + ".co"):
+            coords_path = stem + ".co"
+        return read_dimacs(path, coords_path)
+    if ext == ".csv":
+        return read_csv(path, coords_path)
+    return Graph.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a DIMACS .gr or CSV edge list into a binary graph file.")
+    parser.add_argument("input", help=".gr, .csv or binary graph file")
+    parser.add_argument("-o", "--output", required=True, help="binary graph file to write")
+    parser.add_argument("--coords", help="coordinates file (.co or name,x,y CSV)")
+    parser.add_argument("--landmarks", type=int, default=0,
+                        help="precompute and store this many landmark tables (ALT)")
+    args = parser.parse_args()
+
+    graph = open_graph(args.input, args.coords)
+    if args.landmarks:
+        graph.columns.update(LandmarkHeuristic(graph, args.landmarks).columns())
+    graph.save(args.output)
+    print(f"{len(graph)} states, {graph.num_edges} arcs, "
+          f"{len(graph.columns)} stored columns -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,86 +1,566 @@
 # All GUI components (GraphCanvas + UninformedWindow + InformedWindow)
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QTimer, Slot
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
-    QPushButton, QLabel, QLineEdit, QTextEdit, QMessageBox, QSizePolicy
+    QPushButton, QLabel, QLineEdit, QTextEdit, QMessageBox, QSizePolicy,
+    QSlider, QSpinBox, QCheckBox
 )
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from matplotlib.figure import Figure
-import networkx as nx
+import numpy as np
 
 # IMPORT UNINFORMED & INFORMED ALGORITHMS
 from uninformed_search import (
     BFS_with_metrics, DFS_with_metrics, UCS_with_metrics,
     DLS_with_metrics, IDS_with_metrics, Backtracking_with_metrics,
-    Bidirectional_with_metrics, extract_path, path_cost_expression,
+    Bidirectional_with_metrics, BidirectionalUCS_with_metrics,
+    extract_path, path_cost_expression,
 )
 
 
 from informed_search import (
     Greedy_Search, AStar_Search, IDAStar_Search, RBFS_Search,
+    BidirectionalAStar_Search, SMAStar_Search, Beam_Search, SMA_NODES, BEAM_WIDTH,
     extract_path as informed_extract_path,
     path_cost_expression as informed_path_cost_expression,
 )
 
-from romania_problem import (
-    neighbors, distances, city_positions
-)
+from instrumentation import COUNTERS, MEMORY
+from query_cache import QueryCache
+from search_trace import EventTrace, ProgressTrace, SearchAborted
+from playback import Playback, FRONTIER, EXPLORED, CURRENT
+
+from graph import Coords, romania
 
 #GRAPH CANVAS
 class GraphCanvas(FigureCanvas):
-    def __init__(self, parent=None):
+    # The map is turned into matplotlib artists once and cached as a blit
+    # background. Path / explored highlights are small overlay artists whose
+    # data is swapped and blitted on top, so re-highlighting costs time in
+    # proportion to the highlight, not to the map.
+    NODE_COLOR = "#90CAF9"
+    EDGE_COLOR = "#B0BEC5"
+    PATH_NODE_COLOR = "#FFCC80"
+    PATH_EDGE_COLOR = "red"
+    EXPLORED_COLOR = "#C5E1A5"
+    FRONTIER_COLOR = "#FFF59D"
+    CURRENT_COLOR = "#EF5350"
+    # Labels (and big markers) only below this many nodes
+    LABEL_LIMIT = 200
+    # Above this many nodes playback frames are rasterised with NumPy into
+    # one image instead of drawn as markers (matplotlib draws ~1us/marker)
+    RASTER_LIMIT = 5000
+
+    def __init__(self, parent=None, graph=None, title="Romania Map"):
         fig = Figure(figsize=(7, 6))
         self.ax = fig.add_subplot(111)
         super().__init__(fig)
         self.setParent(parent)
 
-        # Build graph using distances
-        self.G = nx.Graph()
-        for (u, v), w in distances.items():
-            if not self.G.has_edge(u, v):
-                self.G.add_edge(u, v, weight=w)
+        self.graph = graph if graph is not None else romania
+        self.title = title
+        self._background = None
+        self.playback = None
+        self.playback_path = None
+        self._raster_frame = None
+        self._build_artists()
+        self.mpl_connect("draw_event", self._on_draw)
+
+    def _positions(self):
+        g = self.graph
+        if isinstance(g.coords, Coords):
+            # Loaded map: one view over the stored coordinate array
+            pos = np.asarray(g.coords.flat, dtype=float).reshape(-1, 2)
+            if not np.isnan(pos).any():
+                return pos
+        elif g.coords is not None and all(c is not None for c in g.coords):
+            return np.asarray(g.coords, dtype=float)
+        # No coordinates: fall back to a circle
+        angles = np.linspace(0, 2 * np.pi, len(g), endpoint=False)
+        return np.column_stack((np.cos(angles), np.sin(angles)))
+
+    def _build_artists(self):
+        g = self.graph
+        ax = self.ax
+        self.pos = pos = self._positions()
+        n = len(g)
+        labelled = n <= self.LABEL_LIMIT
+        self.node_size = 700 if labelled else 12
+        self.path_node_size = 800 if labelled else 30
+
+        # Each undirected edge once (u < v), gathered with array operations:
+        # a road network has millions of arcs
+        offsets = np.asarray(g.offsets, dtype=np.int64)
+        dst = np.asarray(g.targets, dtype=np.int64)
+        src = np.repeat(np.arange(n), np.diff(offsets))
+        keep = src < dst
+        src, dst = src[keep], dst[keep]
+        # One polyline broken by NaN rows: matplotlib builds a Path object per
+        # LineCollection segment, which dominates start-up on big maps
+        lines = np.full((len(src), 3, 2), np.nan)
+        lines[:, 0] = pos[src]
+        lines[:, 1] = pos[dst]
+        lines = lines.reshape(-1, 2)
+
+        # Static layer: lives in the cached background
+        ax.plot(lines[:, 0], lines[:, 1], color=self.EDGE_COLOR, linewidth=1,
+                solid_capstyle="butt", zorder=1)
+        ax.scatter(pos[:, 0], pos[:, 1], s=self.node_size,
+                   c=self.NODE_COLOR, zorder=2)
+
+        # Overlays: redrawn on every blit
+        empty = np.empty((0, 2))
+        # One uniformly colored scatter per status keeps matplotlib on its
+        # fast marker path (per-point colors are far slower on big maps)
+        self.state_nodes = ax.scatter(empty[:, 0], empty[:, 1], s=self.node_size,
+                                      c=self.EXPLORED_COLOR, zorder=3, animated=True)
+        self.frontier_nodes = ax.scatter(empty[:, 0], empty[:, 1], s=self.node_size,
+                                         c=self.FRONTIER_COLOR, zorder=3, animated=True)
+        self.current_node = ax.scatter(empty[:, 0], empty[:, 1], s=self.path_node_size,
+                                       c=self.CURRENT_COLOR, zorder=3, animated=True)
+        self.raster = n > self.RASTER_LIMIT
+        self._raster_image = None
+        if self.raster:
+            self._palette = np.zeros((CURRENT + 1, 4), dtype=np.uint8)
+            for code, color in ((FRONTIER, self.FRONTIER_COLOR),
+                                (EXPLORED, self.EXPLORED_COLOR),
+                                (CURRENT, self.CURRENT_COLOR)):
+                self._palette[code] = np.round(np.multiply(to_rgba(color), 255))
+        self.path_edges = LineCollection([], colors=self.PATH_EDGE_COLOR,
+                                         linewidths=3, zorder=4, animated=True)
+        ax.add_collection(self.path_edges)
+        self.path_nodes = ax.scatter(empty[:, 0], empty[:, 1], s=self.path_node_size,
+                                     c=self.PATH_NODE_COLOR, zorder=5, animated=True)
+
+        # Labels go above the overlays, so they are blitted too
+        self.labels = []
+        if labelled:
+            weights = np.asarray(g.weights)[keep]
+            for u, v, w in zip(src.tolist(), dst.tolist(), weights.tolist()):
+                x, y = (pos[u] + pos[v]) / 2
+                self.labels.append(ax.text(
+                    x, y, str(w), fontsize=8, ha="center", va="center",
+                    zorder=6, animated=True,
+                    bbox=dict(boxstyle="round", ec=(1, 1, 1), fc=(1, 1, 1))))
+            for u, name in enumerate(g.names):
+                self.labels.append(ax.text(
+                    pos[u, 0], pos[u, 1], name, fontsize=8, ha="center",
+                    va="center", zorder=7, animated=True))
+
+        ax.update_datalim(pos)
+        ax.autoscale_view()
+        ax.set_title(self.title)
+        ax.set_axis_off()
+
+    def _draw_animated(self):
+        if self._raster_image is not None:
+            # Already at screen resolution: hand the pixels straight to the
+            # renderer, skipping matplotlib's image resampling
+            renderer = self.get_renderer()
+            gc = renderer.new_gc()
+            renderer.draw_image(gc, self._raster_origin[0], self._raster_origin[1],
+                                self._raster_image)
+            gc.restore()
+        self.ax.draw_artist(self.state_nodes)
+        self.ax.draw_artist(self.frontier_nodes)
+        self.ax.draw_artist(self.current_node)
+        self.ax.draw_artist(self.path_edges)
+        self.ax.draw_artist(self.path_nodes)
+        for label in self.labels:
+            self.ax.draw_artist(label)
+
+    def _on_draw(self, event):
+        # Full redraws (first show, resize) refresh the cached background
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        if self.raster:
+            self._raster_geometry()
+            if self._raster_frame is not None:
+                self._rasterise(*self._raster_frame)
+        self._draw_animated()
+
+    def _raster_geometry(self):
+        # Pixel of every node in an image covering the axes one-to-one
+        bbox = self.ax.bbox
+        w, h = max(int(bbox.width), 1), max(int(bbox.height), 1)
+        xy = self.ax.transData.transform(self.pos)
+        self._px = np.clip((xy[:, 0] - bbox.x0).astype(np.intp), 0, w - 1)
+        # Rows run bottom-up, as the Agg renderer's draw_image expects
+        self._py = np.clip((xy[:, 1] - bbox.y0).astype(np.intp), 0, h - 1)
+        self._raster_shape = (h, w)
+        self._raster_origin = (int(bbox.x0), int(bbox.y0))
+        # Marker radius in pixels, matching the scatter size
+        diameter = np.sqrt(self.node_size) * self.figure.dpi / 72
+        self._raster_radius = max(int(diameter / 2), 0)
+
+    def _rasterise(self, touched, codes):
+        self._raster_frame = (touched, codes)
+        grid = np.zeros(self._raster_shape, dtype=np.uint8)
+        grid[self._py[touched], self._px[touched]] = codes
+        # Square max-dilation, one axis at a time; the status codes are
+        # ordered so explored covers frontier and current covers both
+        for axis in (0, 1):
+            src = grid.copy()
+            for d in range(1, self._raster_radius + 1):
+                if axis == 0:
+                    np.maximum(grid[d:], src[:-d], out=grid[d:])
+                    np.maximum(grid[:-d], src[d:], out=grid[:-d])
+                else:
+                    np.maximum(grid[:, d:], src[:, :-d], out=grid[:, d:])
+                    np.maximum(grid[:, :-d], src[:, d:], out=grid[:, :-d])
+        self._raster_image = self._palette.take(grid, axis=0)
+
+    def _blit(self):
+        if self._background is None:
+            self.draw()
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.figure.bbox)
+
+    def highlight(self, path=None, explored=None):
+        index = self.graph.index
+        pos = self.pos
+
+        if explored:
+            ids = np.fromiter({index[s] for s in explored}, dtype=np.intp)
+            self.state_nodes.set_offsets(pos[ids])
+        else:
+            self.state_nodes.set_offsets(np.empty((0, 2)))
+        self.frontier_nodes.set_offsets(np.empty((0, 2)))
+        self.current_node.set_offsets(np.empty((0, 2)))
+        self._raster_image = None
+        self._raster_frame = None
+        self._set_path(path)
+        self._blit()
+
+    def _set_path(self, path):
+        index = self.graph.index
+        pos = self.pos
+        if path and len(path) >= 2:
+            ids = np.fromiter((index[s] for s in path), dtype=np.intp)
+            self.path_nodes.set_offsets(pos[ids])
+            self.path_edges.set_segments(np.stack((pos[ids[:-1]], pos[ids[1:]]), axis=1))
+        else:
+            self.path_nodes.set_offsets(np.empty((0, 2)))
+            self.path_edges.set_segments([])
 
     def draw_base_graph(self):
-        self.ax.clear()
-        nx.draw(
-            self.G, pos=city_positions, with_labels=True,
-            node_size=700, node_color="#90CAF9",
-            edge_color="#B0BEC5", font_size=8, ax=self.ax
-        )
-        edge_labels = nx.get_edge_attributes(self.G, "weight")
-        nx.draw_networkx_edge_labels(
-            self.G, pos=city_positions, edge_labels=edge_labels,
-            font_size=8, label_pos=0.5, ax=self.ax
-        )
-        self.ax.set_title("Romania Map")
-        self.ax.set_axis_off()
-        self.draw()
+        self.highlight()
+
+    def draw_path(self, path, explored=None):
+        self.highlight(path, explored)
+
+    # Playback: one frame per expansion, drawn from the status codes the
+    # Playback derives lazily from the event trace
+    def set_playback(self, playback, path=None):
+        self.playback = playback
+        self.playback_path = path
+
+    def show_frame(self, frame):
+        touched, codes = self.playback.seek(frame)
+        pos = self.pos
+        self.current_node.set_offsets(pos[touched[codes == CURRENT]])
+        if self.raster and self._background is not None:
+            self._rasterise(touched, codes)
+        else:
+            self.state_nodes.set_offsets(pos[touched[codes == EXPLORED]])
+            self.frontier_nodes.set_offsets(pos[touched[codes == FRONTIER]])
+        # The path only appears once the search has finished
+        done = frame >= self.playback.num_frames
+        self._set_path(self.playback_path if done else None)
+        self._blit()
+
+
+# PLAYBACK CONTROLS
+class PlaybackControls(QWidget):
+    FRAME_MS = 16   # ~60 fps; speed sets how many expansions each tick advances
+
+    def __init__(self, canvas, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+
+        self.btn_play = QPushButton("Play")
+        self.btn_play.clicked.connect(self.toggle)
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.valueChanged.connect(self._on_frame)
+        self.speed = QSpinBox()
+        self.speed.setRange(1, 100000)
+        self.speed.setValue(1)
+        self.speed.setSuffix(" exp/frame")
+        self.frame_label = QLabel("0 / 0")
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.btn_play)
+        layout.addWidget(self.slider, 1)
+        layout.addWidget(self.frame_label)
+        layout.addWidget(self.speed)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self._tick)
+        self.setEnabled(False)
+
+    def load(self, playback, path=None):
+        self.stop()
+        self.canvas.set_playback(playback, path)
+        self.slider.setRange(0, playback.num_frames)
+        self.setEnabled(True)
+        # Start on the final frame; Play rewinds
+        if self.slider.value() == playback.num_frames:
+            self._on_frame(playback.num_frames)
+        else:
+            self.slider.setValue(playback.num_frames)
+
+    def clear(self):
+        self.stop()
+        self.setEnabled(False)
 
-    def draw_path(self, path):
-        self.draw_base_graph()
-        if not path or len(path) < 2:
+    def toggle(self):
+        if self.timer.isActive():
+            self.stop()
+            return
+        if self.slider.value() >= self.slider.maximum():
+            self.slider.setValue(0)
+        self.btn_play.setText("Pause")
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.btn_play.setText("Play")
+
+    def _tick(self):
+        frame = min(self.slider.value() + self.speed.value(), self.slider.maximum())
+        self.slider.setValue(frame)
+        if frame >= self.slider.maximum():
+            self.stop()
+
+    def _on_frame(self, frame):
+        if self.canvas.playback is None:
             return
+        self.frame_label.setText(f"{frame} / {self.slider.maximum()}")
+        self.canvas.show_frame(frame)
 
-        edges = list(zip(path, path[1:]))
 
-        nx.draw_networkx_edges(
-            self.G, pos=city_positions, edgelist=edges,
-            width=3, edge_color="red", ax=self.ax
-        )
-        nx.draw_networkx_nodes(
-            self.G, pos=city_positions, nodelist=path,
-            node_size=800, node_color="#FFCC80", ax=self.ax
+# SEARCH WORKER
+class WorkerSignals(QObject):
+    progress = Signal(int, int, float)   # expanded, frontier size, seconds
+    finished = Signal(object)
+    aborted = Signal(str)
+    failed = Signal(str)
+
+
+class SearchWorker(QRunnable):
+    # Runs job(trace) on the thread pool. The trace records the events for
+    # the log and playback, reports progress and stops on cancel/budget.
+    def __init__(self, job, max_nodes=None, max_seconds=None):
+        super().__init__()
+        self.job = job
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.signals = WorkerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self):
+        trace = ProgressTrace(
+            EventTrace(), self.signals.progress.emit, lambda: self._cancelled,
+            self.max_nodes, self.max_seconds
         )
-        self.draw()
+        try:
+            res = self.job(trace)
+        except SearchAborted as e:
+            self.signals.aborted.emit(e.reason)
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(res)
 
 
-#UNINFORMED SEARCH WINDOW
-class UninformedWindow(QMainWindow):
+def _optional_number(text, cast):
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        value = cast(text)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+# Finished runs, shared by both windows so re-running a query (or
+# reopening a window) replays the stored result instead of searching again
+RESULTS = QueryCache(64)
+
+
+# Shared run / cancel / progress handling for both search windows
+class SearchWindow(QMainWindow):
     switch_to_menu = Signal()
 
-    def __init__(self):
+    def __init__(self, graph=None, title="Romania Map"):
         super().__init__()
+        self.graph = graph if graph is not None else romania
+        self.map_title = title
+
+    def _default_query(self):
+        # Start / goal shown when the window opens
+        if self.graph is romania:
+            return "Arad", "Bucharest"
+        names = self.graph.names
+        return names[0], names[-1]
+
+    def _valid(self, start, goal):
+        index = self.graph.index
+        if start not in index or goal not in index:
+            QMessageBox.warning(self, "Error", "Invalid city")
+            return False
+        return True
+
+    def _add_canvas(self, layout):
+        self.canvas = GraphCanvas(self, self.graph, self.map_title)
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.canvas.draw_base_graph()
+        self.playback = PlaybackControls(self.canvas)
+
+        column = QVBoxLayout()
+        column.addWidget(self.canvas, 1)
+        column.addWidget(self.playback)
+        layout.addLayout(column, 2)
+
+    def _add_run_controls(self, v):
+        self.max_nodes = QLineEdit()
+        self.max_nodes.setPlaceholderText("no limit")
+        self.max_seconds = QLineEdit()
+        self.max_seconds.setPlaceholderText("no limit")
+        # Off by default: peak memory needs a second run under tracemalloc,
+        # roughly 5-8x slower than the search itself
+        self.measure_memory = QCheckBox("Measure peak memory (slower)")
+
+        self.btn_run = QPushButton("Run")
+        self.btn_run.clicked.connect(self.run)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.btn_run)
+        buttons.addWidget(self.btn_cancel)
+
+        self.status = QLabel("Idle")
+
+        v.addWidget(QLabel("Node budget:"))
+        v.addWidget(self.max_nodes)
+        v.addWidget(QLabel("Time budget (s):"))
+        v.addWidget(self.max_seconds)
+        v.addWidget(self.measure_memory)
+        v.addLayout(buttons)
+        v.addWidget(self.status)
+
+        self.worker = None
+
+    def _instrument(self):
+        return MEMORY if self.measure_memory.isChecked() else COUNTERS
+
+    def _start_search(self, algo, job, path_of, cost_expression, key=None):
+        self.cancel()
+        self.playback.clear()
+        cached = RESULTS.get(key) if key is not None else None
+        if cached is not None:
+            self.worker = None
+            self._show_result(algo, dict(cached), path_of, cost_expression, cached=True)
+            return
+
+        worker = SearchWorker(
+            job,
+            _optional_number(self.max_nodes.text(), int),
+            _optional_number(self.max_seconds.text(), float),
+        )
+        worker.signals.progress.connect(self._on_progress)
+        worker.signals.finished.connect(
+            lambda res: self._on_finished(worker, algo, res, path_of, cost_expression, key))
+        worker.signals.aborted.connect(lambda reason: self._on_stopped(worker, algo, reason))
+        worker.signals.failed.connect(lambda msg: self._on_stopped(worker, algo, msg))
+        self.worker = worker
+
+        self.btn_run.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.status.setText(f"Running {algo}...")
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def _on_progress(self, expanded, frontier, elapsed):
+        self.status.setText(
+            f"Expanded {expanded:,} | frontier {frontier:,} | {elapsed:.2f}s")
+
+    def _finish(self, worker):
+        # Ignore late signals from a run that was superseded
+        if worker is not self.worker:
+            return False
+        self.worker = None
+        self.btn_run.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        return True
+
+    def _on_finished(self, worker, algo, res, path_of, cost_expression, key=None):
+        if not self._finish(worker):
+            return
+        if key is not None:
+            RESULTS.put(key, dict(res))
+        self._show_result(algo, res, path_of, cost_expression)
+
+    def _show_result(self, algo, res, path_of, cost_expression, cached=False):
+        path = path_of(res)
+        events = res.pop("events", None)
+
+        # Draw path (as the last playback frame when the run was recorded)
+        if events is not None:
+            self.playback.load(Playback(events, len(self.canvas.graph)), path)
+        elif path:
+            self.canvas.draw_path(path, res.get("expanded_list"))
+        else:
+            self.canvas.draw_base_graph()
+
+        # Log
+        self.log.append(f"\n=== {algo} ===")
+        self.log.append(f"Path: {path}")
+        if path:
+            self.log.append(cost_expression(path))
+        # Counters only: the expanded/generated lists can hold millions of
+        # names, far too much text to append on the GUI thread (and reading
+        # an EventTrace run's lists would decode them)
+        summary = {key: value for key, value in res.items()
+                   if value is None or isinstance(value, (int, float, str))}
+        self.log.append(str(summary))
+        if cached:
+            self.log.append(f"(cached; {RESULTS.hits} hits / {RESULTS.misses} misses)")
+        self.status.setText(f"Done in {res['time']:.4f}s" + (" (cached)" if cached else ""))
+
+    def _on_stopped(self, worker, algo, reason):
+        if not self._finish(worker):
+            return
+        self.log.append(f"\n=== {algo} ===")
+        self.log.append(f"Stopped: {reason}")
+        self.status.setText(f"Stopped: {reason}")
+
+    def closeEvent(self, event):
+        self.cancel()
+        self.playback.stop()
+        super().closeEvent(event)
+
+
+#UNINFORMED SEARCH WINDOW
+class UninformedWindow(SearchWindow):
+    def __init__(self, graph=None, title="Romania Map"):
+        super().__init__(graph, title)
         self.setWindowTitle("Uninformed Search")
         self.setMinimumSize(1200, 750)
 
@@ -89,10 +569,7 @@ class UninformedWindow(QMainWindow):
         layout = QHBoxLayout(main_widget)
 
         # Canvas
-        self.canvas = GraphCanvas(self)
-        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.canvas.draw_base_graph()
-        layout.addWidget(self.canvas, 2)
+        self._add_canvas(layout)
 
         # Side panel
         panel = QWidget()
@@ -100,15 +577,14 @@ class UninformedWindow(QMainWindow):
         v.setAlignment(Qt.AlignTop)
 
         self.combo = QComboBox()
-        self.combo.addItems(["BFS", "DFS", "UCS", "DLS", "IDS", "Backtracking", "Bidirectional"])
+        self.combo.addItems(["BFS", "DFS", "UCS", "DLS", "IDS", "Backtracking", "Bidirectional",
+                             "Bidirectional UCS"])
 
-        self.start = QLineEdit("Arad")
-        self.goal = QLineEdit("Bucharest")
+        start, goal = self._default_query()
+        self.start = QLineEdit(start)
+        self.goal = QLineEdit(goal)
         self.depth = QLineEdit("10")
 
-        btn_run = QPushButton("Run")
-        btn_run.clicked.connect(self.run)
-
         btn_back = QPushButton("Back to Menu")
         btn_back.clicked.connect(self.switch_to_menu.emit)
 
@@ -123,7 +599,7 @@ class UninformedWindow(QMainWindow):
         v.addWidget(self.goal)
         v.addWidget(QLabel("Depth Limit (DLS/IDS):"))
         v.addWidget(self.depth)
-        v.addWidget(btn_run)
+        self._add_run_controls(v)
         v.addWidget(QLabel("Log:"))
         v.addWidget(self.log)
         v.addWidget(btn_back)
@@ -135,57 +611,61 @@ class UninformedWindow(QMainWindow):
         start = self.start.text().strip()
         goal = self.goal.text().strip()
 
-        if start not in neighbors or goal not in neighbors:
-            QMessageBox.warning(self, "Error", "Invalid city")
+        if not self._valid(start, goal):
             return
 
+        graph = self.graph
+        instrument = self._instrument()
         try:
             depth = int(self.depth.text())
         except:
             depth = 10
 
         if algo == "BFS":
-            res = BFS_with_metrics(start, goal)
-            path = extract_path(res["goal_node"])
+            job = lambda t: BFS_with_metrics(start, goal, graph=graph, instrument=instrument, trace=t)
         elif algo == "DFS":
-            res = DFS_with_metrics(start, goal)
-            path = extract_path(res["goal_node"])
+            job = lambda t: DFS_with_metrics(start, goal, graph=graph, instrument=instrument, trace=t)
         elif algo == "UCS":
-            res = UCS_with_metrics(start, goal)
-            path = extract_path(res["goal_node"])
+            job = lambda t: UCS_with_metrics(start, goal, graph=graph, instrument=instrument, trace=t)
         elif algo == "DLS":
-            res = DLS_with_metrics(start, goal, depth)
-            path = extract_path(res["goal_node"])
+            job = lambda t: DLS_with_metrics(start, goal, depth,
+                                             graph=graph, instrument=instrument, trace=t)
         elif algo == "IDS":
-            res = IDS_with_metrics(start, goal, max_limit=depth)
-            path = extract_path(res["goal_node"])
+            job = lambda t: IDS_with_metrics(start, goal, max_limit=depth,
+                                             graph=graph, instrument=instrument, trace=t)
         elif algo == "Backtracking":
-            res = Backtracking_with_metrics(start, goal)
-            path = extract_path(res["goal_node"])
-        else:  # Bidirectional
-            res = Bidirectional_with_metrics(start, goal)
-            path = res.get("path")
-
-        # Draw path
-        if path:
-            self.canvas.draw_path(path)
+            job = lambda t: Backtracking_with_metrics(start, goal,
+                                                      graph=graph, instrument=instrument, trace=t)
+        elif algo == "Bidirectional":
+            job = lambda t: Bidirectional_with_metrics(start, goal,
+                                                       graph=graph, instrument=instrument, trace=t)
+        else:  # Bidirectional UCS
+            job = lambda t: BidirectionalUCS_with_metrics(start, goal,
+                                                          graph=graph, instrument=instrument, trace=t)
+
+        if algo.startswith("Bidirectional"):
+            path_of = lambda res: res.get("path")
         else:
-            self.canvas.draw_base_graph()
+            path_of = lambda res: extract_path(res["goal_node"], graph)
 
-        # Log
-        self.log.append(f"\n=== {algo} ===")
-        self.log.append(f"Path: {path}")
-        if path:
-            self.log.append(path_cost_expression(path))
-        self.log.append(str(res))
+        limit = depth if algo in ("DLS", "IDS") else None
+        key = QueryCache.key(graph, algo, start, goal, limit, instrument)
+        self._start_search(algo, job, path_of, lambda p: path_cost_expression(p, graph), key)
 
 
 # INFORMED SEARCH WINDOW
-class InformedWindow(QMainWindow):
-    switch_to_menu = Signal()
-
-    def __init__(self):
-        super().__init__()
+# Auto: straight-line table for Bucharest, landmark bounds for other goals
+HEURISTICS = {
+    "Auto": None,
+    "Landmarks (ALT)": "landmark",
+    "Euclidean": "euclidean",
+    "None (h = 0)": "zero",
+}
+
+
+class InformedWindow(SearchWindow):
+    def __init__(self, graph=None, title="Romania Map"):
+        super().__init__(graph, title)
         self.setWindowTitle("Informed Search")
         self.setMinimumSize(1200, 750)
 
@@ -193,23 +673,24 @@ class InformedWindow(QMainWindow):
         self.setCentralWidget(main_widget)
         layout = QHBoxLayout(main_widget)
 
-        self.canvas = GraphCanvas(self)
-        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.canvas.draw_base_graph()
-        layout.addWidget(self.canvas, 2)
+        self._add_canvas(layout)
 
         panel = QWidget()
         v = QVBoxLayout(panel)
         v.setAlignment(Qt.AlignTop)
 
         self.combo = QComboBox()
-        self.combo.addItems(["Greedy", "A*", "IDA*", "RBFS"])
+        self.combo.addItems(["Greedy", "A*", "IDA*", "RBFS", "Bidirectional A*", "SMA*", "Beam"])
+
+        self.heuristic = QComboBox()
+        self.heuristic.addItems(list(HEURISTICS))
 
-        self.start = QLineEdit("Arad")
-        self.goal = QLineEdit("Bucharest")
+        self.memory = QLineEdit()
+        self.memory.setPlaceholderText(f"SMA* {SMA_NODES} / beam {BEAM_WIDTH}")
 
-        btn_run = QPushButton("Run")
-        btn_run.clicked.connect(self.run)
+        start, goal = self._default_query()
+        self.start = QLineEdit(start)
+        self.goal = QLineEdit(goal)
 
         btn_back = QPushButton("Back to Menu")
         btn_back.clicked.connect(self.switch_to_menu.emit)
@@ -219,11 +700,15 @@ class InformedWindow(QMainWindow):
 
         v.addWidget(QLabel("Informed Algorithm:"))
         v.addWidget(self.combo)
+        v.addWidget(QLabel("Heuristic:"))
+        v.addWidget(self.heuristic)
         v.addWidget(QLabel("Start:"))
         v.addWidget(self.start)
         v.addWidget(QLabel("Goal:"))
         v.addWidget(self.goal)
-        v.addWidget(btn_run)
+        v.addWidget(QLabel("Memory (SMA* nodes / beam width):"))
+        v.addWidget(self.memory)
+        self._add_run_controls(v)
         v.addWidget(QLabel("Log:"))
         v.addWidget(self.log)
         v.addWidget(btn_back)
@@ -235,29 +720,41 @@ class InformedWindow(QMainWindow):
         start = self.start.text().strip()
         goal = self.goal.text().strip()
 
-        if start not in neighbors or goal not in neighbors:
-            QMessageBox.warning(self, "Error", "Invalid city")
+        if not self._valid(start, goal):
             return
 
+        h = HEURISTICS[self.heuristic.currentText()]
+        graph = self.graph
+        instrument = self._instrument()
+        try:
+            memory = max(int(self.memory.text()), 1)
+        except:
+            memory = None
+        options = {}
+
         if algo == "Greedy":
-            res = Greedy_Search(start, goal)
+            search = Greedy_Search
         elif algo == "A*":
-            res = AStar_Search(start, goal)
+            search = AStar_Search
         elif algo == "IDA*":
-            res = IDAStar_Search(start, goal)
+            search = IDAStar_Search
+        elif algo == "RBFS":
+            search = RBFS_Search
+        elif algo == "SMA*":
+            search = SMAStar_Search
+            options["max_nodes"] = memory or SMA_NODES
+        elif algo == "Beam":
+            search = Beam_Search
+            options["width"] = memory or BEAM_WIDTH
         else:
-            res = RBFS_Search(start, goal)
-
-        node = res.get("goal_node")
-        path = informed_extract_path(node) if node else None
+            search = BidirectionalAStar_Search
 
-        if path:
-            self.canvas.draw_path(path)
+        job = lambda t: search(start, goal, heuristic=h, graph=graph, instrument=instrument,
+                               trace=t, **options)
+        if algo == "Bidirectional A*":
+            path_of = lambda res: res.get("path")
         else:
-            self.canvas.draw_base_graph()
-
-        self.log.append(f"\n=== {algo} ===")
-        self.log.append(f"Path: {path}")
-        if path:
-            self.log.append(informed_path_cost_expression(path))
-        self.log.append(str(res))
+            path_of = lambda res: informed_extract_path(res["goal_node"], graph) if res["goal_node"] else None
+        key = QueryCache.key(graph, algo, start, goal, h, instrument, *options.values())
+        self._start_search(algo, job, path_of,
+                           lambda p: informed_path_cost_expression(p, graph), key)
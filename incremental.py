@@ -0,0 +1,163 @@
+# incremental.py
+# Repairing a shortest path after the graph's edges change.
+#
+# LPAStar (Lifelong Planning A*, Koenig & Likhachev) answers one start-goal
+# query and keeps its search state between edits. Besides g, every state
+# has a one-step lookahead rhs(s) = min over neighbours u of g(u) + w(u, s);
+# a state is consistent when g == rhs, and only inconsistent states are
+# queued, keyed (min(g, rhs) + h, min(g, rhs)). The first compute() does the
+# work of A* (of UCS with heuristic="zero"). After Graph.set_weight /
+# add_edge / remove_edge only the endpoints of the edited edges get a new
+# rhs, so the next compute() re-expands just the states whose distance
+# changed and can still matter to the goal instead of searching again.
+#
+# Edits are read from graph.changes, so any number of planners can share a
+# graph. The graphs are undirected: a state's neighbours are also its
+# predecessors. The heuristic is fixed when the planner is made and must
+# stay admissible under the edits. The default bounds (straight-line
+# distance to Bucharest, landmark tables otherwise) do as long as edits only
+# raise weights or remove edges (closures, traffic); for edits that shorten
+# routes use heuristic="zero" (incremental Dijkstra) or a bound that holds.
+#
+#   planner = LPAStar("Arad", "Bucharest")
+#   planner.compute()
+#   romania.set_weight(romania.index["Sibiu"], romania.index["Rimnicu"], 300)
+#   planner.compute(compare=True)  # repair; also reports a rerun's work
+
+from informed_search import _astar, _heuristic, _HeuristicCache
+from instrumentation import COUNTERS, MEMORY, measure
+from priority_queue import BinaryHeap
+from search_trace import hooks
+from uninformed_search import Node, _resolve
+
+INF = float("inf")
+
+
+class LPAStar:
+    def __init__(self, start, goal, graph=None, heuristic=None):
+        # heuristic: as for AStar_Search (None: auto)
+        graph, start, goal = _resolve(graph, start, goal)
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.h = _HeuristicCache(_heuristic(graph, goal, heuristic))
+        self.version = graph.version
+        self.g = {}
+        self.rhs = {start: 0}
+        self.queue = BinaryHeap()
+        self.queue.push(start, self._key(start))
+        # Every state expanded by an earlier compute()
+        self.expanded = set()
+
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self.h[s], m)
+
+    def _requeue(self, s):
+        if self.g.get(s, INF) != self.rhs.get(s, INF):
+            self.queue.update(s, self._key(s))
+        elif s in self.queue:
+            self.queue.remove(s)
+
+    def _update_rhs(self, s):
+        # Re-derive rhs(s) from all neighbours (after its best one got worse)
+        if s != self.start:
+            g = self.g
+            best = INF
+            for v, w in self.graph.neighbors(s):
+                d = g.get(v, INF) + w
+                if d < best:
+                    best = d
+            self.rhs[s] = best
+        self._requeue(s)
+
+    def _sync(self):
+        # Edges edited since the last compute(): their endpoints may now
+        # have a different best neighbour
+        graph = self.graph
+        for u, v in graph.changes[self.version:]:
+            self._update_rhs(u)
+            self._update_rhs(v)
+        self.version = graph.version
+
+    def _compute(self, trace=None):
+        self._sync()
+        graph, start, goal = self.graph, self.start, self.goal
+        on_expand, on_generate = hooks(trace, graph)
+        g, rhs, queue, seen = self.g, self.rhs, self.queue, self.expanded
+
+        nodes_expanded = 0
+        nodes_generated = 0
+        nodes_reexpanded = 0
+
+        while queue:
+            u, key = queue.peek()
+            if key >= self._key(goal) and rhs.get(goal, INF) == g.get(goal, INF):
+                break
+            queue.pop()
+            if on_expand:
+                on_expand(u, len(queue))
+            nodes_expanded += 1
+            if u in seen:
+                nodes_reexpanded += 1
+            else:
+                seen.add(u)
+
+            gu, ru = g.get(u, INF), rhs[u]
+            if gu > ru:
+                # Overconsistent: u's distance is now known (it went down)
+                g[u] = ru
+                for v, w in graph.neighbors(u):
+                    nodes_generated += 1
+                    if on_generate:
+                        on_generate(v)
+                    if v != start and ru + w < rhs.get(v, INF):
+                        rhs[v] = ru + w
+                        self._requeue(v)
+            else:
+                # Underconsistent: u's distance went up; u and every state
+                # whose best neighbour it was must be re-derived
+                g[u] = INF
+                self._update_rhs(u)
+                for v, w in graph.neighbors(u):
+                    nodes_generated += 1
+                    if on_generate:
+                        on_generate(v)
+                    if rhs.get(v, INF) == gu + w:
+                        self._update_rhs(v)
+
+        res = {
+            "goal_node": None,
+            "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
+            "nodes_reexpanded": nodes_reexpanded
+        }
+        cost = g.get(goal, INF)
+        if cost < INF:
+            res["goal_node"] = Node(goal, path_cost=cost)
+            res["path"] = self.path()
+            res["path_cost"] = cost
+        return res
+
+    def path(self):
+        # Walk back from the goal through the neighbour each g came from
+        graph, g = self.graph, self.g
+        s = self.goal
+        states = [s]
+        while s != self.start:
+            s = min(graph.neighbors(s), key=lambda vw: g.get(vw[0], INF) + vw[1])[0]
+            states.append(s)
+        names = graph.names
+        return [names[s] for s in reversed(states)]
+
+    def compute(self, instrument=COUNTERS, trace=None, compare=False):
+        # First call: a full search. Later calls: repair after the graph's
+        # edits. compare=True also runs A* from scratch with the same
+        # heuristic (untimed) and adds its count as "recompute_expanded".
+        if instrument == MEMORY:
+            # The second, memory-traced run would find nothing left to repair
+            raise ValueError("LPAStar.compute keeps state; MEMORY instrumentation reruns it")
+        res = measure(self._compute, instrument, trace)
+        if compare:
+            fresh = _astar(self.graph, self.start, self.goal, self.h)
+            res["recompute_expanded"] = fresh["nodes_expanded"]
+        return res
@@ -0,0 +1,700 @@
+import heapq
+import itertools
+from array import array
+
+from graph import romania
+from instrumentation import COUNTERS, measure
+from lower_bounds import heuristic_for, heuristic_for_goals
+from priority_queue import BinaryHeap
+from search_trace import hooks
+from romania_problem import heuristics
+from uninformed_search import (
+    Node, NodeStore, expand, _resolve, _bidirectional_ucs, extract_path,
+    path_cost_expression, _resolve_goals, _wanted, _many_result,
+)
+
+INF = float("inf")
+
+# The straight-line table in romania_problem is measured to this city
+HEURISTIC_GOAL = "Bucharest"
+
+
+# Heuristic cache
+class _HeuristicCache(dict):
+    # state id -> h, computed on first lookup only
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+
+    def __missing__(self, state):
+        value = self[state] = self.fn(state)
+        return value
+
+
+def _heuristic(graph, goal, heuristic):
+    # heuristic: None (auto), a kind understood by lower_bounds.heuristic_for,
+    # or a callable state id -> estimate
+    if callable(heuristic):
+        return heuristic
+    if heuristic is not None:
+        return heuristic_for(graph, goal, heuristic)
+    names = graph.names
+    if graph is romania and names[goal] == HEURISTIC_GOAL:
+        return lambda s: heuristics[names[s]]
+    # Any other goal: landmark lower bounds, precomputed once per graph
+    return heuristic_for(graph, goal)
+
+
+def _result(goal_node, nodes_expanded, nodes_generated, **extra):
+    res = {
+        "goal_node": goal_node,
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+    }
+    res.update(extra)
+    return res
+
+
+def _run(core, start, goal, graph, heuristic, instrument, trace):
+    graph, start, goal = _resolve(graph, start, goal)
+    fn = _heuristic(graph, goal, heuristic)
+    # Fresh cache per run so a MEMORY-level rerun measures the same work
+    return measure(lambda t: core(graph, start, goal, _HeuristicCache(fn), t),
+                   instrument, trace)
+
+
+# Greedy best-first
+def _greedy(graph, start, goal, h, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+
+    frontier = BinaryHeap()
+    frontier.push(start, h[start])
+    best = {start: add(start)}
+    explored = set()
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    while frontier:
+        state, _ = frontier.pop()
+        i = best.pop(state)
+        if on_expand:
+            on_expand(state, len(frontier))
+
+        if state == goal:
+            return _result(store.node(i), nodes_expanded, nodes_generated)
+
+        explored.add(state)
+        nodes_expanded += 1
+
+        cost = store.cost[i]
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            if v in explored or v in frontier:
+                continue
+            frontier.push(v, h[v])
+            best[v] = add(v, i, cost + w)
+
+    return _result(None, nodes_expanded, nodes_generated)
+
+
+def Greedy_Search(start, goal, graph=None, heuristic=None,
+                  instrument=COUNTERS, trace=None):
+    return _run(_greedy, start, goal, graph, heuristic, instrument, trace)
+
+
+# A*
+def _astar(graph, start, goal, h, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+
+    # Priority (f, h): among equal f prefer the node closest to the goal
+    frontier = BinaryHeap()
+    frontier.push(start, (h[start], h[start]))
+    best = {start: add(start)}
+    g_cost = {start: 0}
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    while frontier:
+        state, _ = frontier.pop()
+        i = best.pop(state)
+        if on_expand:
+            on_expand(state, len(frontier))
+
+        if state == goal:
+            return _result(store.node(i), nodes_expanded, nodes_generated)
+
+        nodes_expanded += 1
+
+        cost = store.cost[i]
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            g = cost + w
+            if g >= g_cost.get(v, INF):
+                continue
+            # Cheaper path: reopen closed states (inconsistent heuristics)
+            g_cost[v] = g
+            hv = h[v]
+            frontier.push_or_decrease(v, (g + hv, hv))
+            best[v] = add(v, i, g)
+
+    return _result(None, nodes_expanded, nodes_generated)
+
+
+def AStar_Search(start, goal, graph=None, heuristic=None,
+                 instrument=COUNTERS, trace=None):
+    return _run(_astar, start, goal, graph, heuristic, instrument, trace)
+
+
+# IDA* (explicit stack, no recursion limit)
+def _idastar(graph, start, goal, h, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+
+    nodes_expanded = 0
+    nodes_generated = 0
+    found = None
+
+    root = Node(start)
+    bound = h[start]
+    iterations = 0
+
+    while found is None and bound < INF:
+        iterations += 1
+        next_bound = INF
+        if on_expand:
+            on_expand(start, 0)
+        if start == goal:
+            found = root
+            break
+
+        nodes_expanded += 1
+        path = [root]
+        on_path = {start}
+        stack = [iter(expand(root, graph))]
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                on_path.discard(path.pop().state)
+                continue
+
+            nodes_generated += 1
+            if on_generate:
+                on_generate(child.state)
+            if child.state in on_path:
+                continue
+
+            f = child.path_cost + h[child.state]
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+                continue
+
+            if on_expand:
+                on_expand(child.state, len(path))
+            if child.state == goal:
+                found = child
+                break
+
+            nodes_expanded += 1
+            path.append(child)
+            on_path.add(child.state)
+            stack.append(iter(expand(child, graph)))
+
+        bound = next_bound
+
+    return _result(found, nodes_expanded, nodes_generated,
+                   iterations=iterations)
+
+
+def IDAStar_Search(start, goal, graph=None, heuristic=None,
+                   instrument=COUNTERS, trace=None):
+    return _run(_idastar, start, goal, graph, heuristic, instrument, trace)
+
+
+# RBFS (explicit stack of frames instead of recursive calls)
+def _rbfs(graph, start, goal, h, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+
+    nodes_expanded = 0
+    nodes_generated = 0
+    found = None
+    order = 0
+
+    root = Node(start)
+    on_path = {start}
+
+    def successors(node, f_node):
+        # [f, order, node] entries; f is raised to the parent's backed-up f
+        nonlocal nodes_expanded, nodes_generated, order
+        nodes_expanded += 1
+        succ = []
+        for child in expand(node, graph):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(child.state)
+            if child.state in on_path:
+                continue
+            order += 1
+            succ.append([max(child.path_cost + h[child.state], f_node),
+                         order, child])
+        return succ
+
+    if on_expand:
+        on_expand(start, 0)
+    if start == goal:
+        found = root
+        frames = []
+    else:
+        # frame: [node, f_limit, successors]
+        frames = [[root, INF, successors(root, h[start])]]
+
+    returned = None
+    while frames:
+        node, f_limit, succ = frames[-1]
+        if returned is not None:
+            # The child we descended into failed; back up its f value
+            succ[0][0] = returned
+            returned = None
+
+        if not succ:
+            frames.pop()
+            on_path.discard(node.state)
+            returned = INF
+            continue
+
+        succ.sort(key=lambda e: (e[0], e[1]))
+        best = succ[0]
+        # Every alternative exhausted (f backed up to INF): the root's
+        # f_limit is INF too, so this is what ends an unreachable search
+        if best[0] == INF or best[0] > f_limit:
+            frames.pop()
+            on_path.discard(node.state)
+            returned = best[0]
+            continue
+
+        alternative = succ[1][0] if len(succ) > 1 else INF
+        child = best[2]
+        if on_expand:
+            on_expand(child.state, len(frames))
+        if child.state == goal:
+            found = child
+            break
+
+        on_path.add(child.state)
+        frames.append([child, min(f_limit, alternative),
+                       successors(child, best[0])])
+
+    return _result(found, nodes_expanded, nodes_generated)
+
+
+def RBFS_Search(start, goal, graph=None, heuristic=None,
+                instrument=COUNTERS, trace=None):
+    return _run(_rbfs, start, goal, graph, heuristic, instrument, trace)
+
+
+# SMA* (simplified memory-bounded A*): A* holding at most max_nodes search
+# nodes. When memory is full the shallowest highest-f leaf is dropped and
+# its parent keeps the lowest f among its forgotten children, so that
+# subtree is regenerated only once nothing in memory looks better.
+# Successors are generated one at a time; a node stays open while it has
+# successors left to generate or forgotten ones to regenerate. Besides the
+# nodes it keeps the cheapest g found for every state (8 bytes a state), so
+# paths that lost to another are not explored again. With h admissible it
+# returns an optimal path if one fits (at most max_nodes - 1 edges), and
+# otherwise a costlier path or none. Given the room A* would use it does
+# A*'s work; with less it regenerates dropped subtrees (nodes_pruned counts
+# the drops), and with far less (budgets near the path length) that grows
+# exponentially.
+SMA_NODES = 10000
+
+
+class _SMANode:
+    __slots__ = ("state", "parent", "g", "depth", "low", "cursor", "forgot",
+                 "kids", "bound", "opened", "worst", "leaf")
+
+    def __init__(self, state, parent, g, f, depth, cursor):
+        self.state = state
+        self.parent = parent
+        self.g = g
+        self.depth = depth
+        self.low = f            # bound on the successors not generated yet
+        self.cursor = cursor    # next arc to generate
+        self.forgot = INF       # lowest f among dropped children
+        self.kids = None        # children in memory
+        # Current heap keys and the stamps of their live entries (0: none)
+        self.bound = None
+        self.opened = 0
+        self.worst = None
+        self.leaf = 0
+
+
+def _smastar(graph, start, goal, h, max_nodes=SMA_NODES, trace=None):
+    # h is called, not cached: a cache would grow with every state seen
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    stamps = itertools.count(1)
+    opened = []     # (bound, -depth, stamp, node): where to generate next
+    leaves = []     # (-f, depth, stamp, node): what to drop first
+    resident = {}   # state -> cheapest node in memory (duplicates, cycles)
+    # Cheapest g ever found per state (8 bytes a state). Being a tree
+    # search, SMA* would otherwise take a longer path to a state whose
+    # cheaper node was dropped for new, and enumerate the cyclic paths of
+    # every region it has no room for. A strictly costlier path can go for
+    # good: the cheaper one is in memory or remembered by a parent.
+    best = array("d", [INF]) * len(graph)
+
+    # Entries are pushed only when a key changes; superseded ones are
+    # skipped on pop and swept out once they make up half a heap
+    stale_opened = stale_leaves = 0
+
+    def reopen(n):
+        nonlocal stale_opened
+        if n.cursor < offsets[n.state + 1]:
+            bound = n.low
+        elif n.forgot < INF:
+            bound = n.forgot
+        else:
+            bound = None
+        if bound != n.bound:
+            n.bound = bound
+            if n.opened:
+                stale_opened += 1
+            n.opened = 0
+            if bound is not None:
+                n.opened = next(stamps)
+                heapq.heappush(opened, (bound, -n.depth, n.opened, n))
+
+    def releaf(n):
+        # A leaf's f: the best it can still lead to. Inner nodes need none;
+        # they only become leaves again once all their children are dropped.
+        nonlocal stale_leaves
+        worst = None
+        if not n.kids and n is not root:
+            worst = n.low if n.cursor < offsets[n.state + 1] else INF
+            if n.forgot < worst:
+                worst = n.forgot
+        if worst != n.worst:
+            n.worst = worst
+            if n.leaf:
+                stale_leaves += 1
+            n.leaf = 0
+            if worst is not None:
+                n.leaf = next(stamps)
+                heapq.heappush(leaves, (-worst, n.depth, n.leaf, n))
+
+    def drop(n):
+        # Remove leaf n from memory; its parent remembers its f
+        nonlocal in_memory, stale_opened, stale_leaves
+        p = n.parent
+        p.kids.remove(n)
+        if n.worst < p.forgot:
+            p.forgot = n.worst
+        if n.opened:
+            stale_opened += 1
+        if n.leaf:
+            stale_leaves += 1
+        n.opened = n.leaf = 0
+        n.parent = None
+        if resident.get(n.state) is n:
+            del resident[n.state]
+        in_memory -= 1
+        reopen(p)
+        releaf(p)
+
+    def sweep(heap, live):
+        heap[:] = [e for e in heap if e[2] == live(e[3])]
+        heapq.heapify(heap)
+        return 0
+
+    root = _SMANode(start, None, 0, h(start), 0, offsets[start])
+    resident[start] = root
+    best[start] = 0
+    reopen(root)
+    in_memory = peak_nodes = 1
+
+    nodes_expanded = 0
+    nodes_generated = 0
+    nodes_pruned = 0
+
+    while opened:
+        # b's entry stays on top while its bound does not change
+        bound, _, s, b = opened[0]
+        if s != b.opened:
+            heapq.heappop(opened)
+            stale_opened -= 1
+            continue
+        if bound == INF:
+            break
+
+        if b.g > best[b.state] or resident.setdefault(b.state, b) is not b:
+            # A cheaper path to this state is known: nothing below b can
+            # beat it, so b generates nothing more and goes once it is a leaf
+            b.cursor = offsets[b.state + 1]
+            b.forgot = INF
+            reopen(b)
+            releaf(b)
+            if not b.kids:
+                drop(b)
+            continue
+
+        if b.state == goal:
+            chain = []
+            while b is not None:
+                chain.append(b)
+                b = b.parent
+            node = None
+            for depth, n in enumerate(reversed(chain)):
+                node = Node(n.state, node, n.state, n.g, depth)
+            return _result(node, nodes_expanded, nodes_generated,
+                           nodes_pruned=nodes_pruned, peak_nodes=peak_nodes)
+
+        first = offsets[b.state]
+        if b.cursor == offsets[b.state + 1]:
+            # Regenerate the forgotten successors
+            b.low = b.forgot
+            b.forgot = INF
+            b.cursor = first
+        if b.cursor == first:
+            nodes_expanded += 1
+            if on_expand:
+                on_expand(b.state, in_memory)
+
+        j = 2 * b.cursor
+        v, w = edges[j], edges[j + 1]
+        b.cursor += 1
+        nodes_generated += 1
+        if on_generate:
+            on_generate(v)
+
+        g = b.g + w
+        other = resident.get(v)
+        # Skip a path to v costlier than a known one or no cheaper than one
+        # in memory, or a child whose path (plus a successor, unless it is
+        # the goal) cannot fit
+        if g <= best[v] and (other is None or g < other.g) \
+                and b.depth + (2 if v == goal else 3) <= max_nodes:
+            best[v] = g
+            child = _SMANode(v, b, g, max(b.low, g + h(v)), b.depth + 1, offsets[v])
+            if b.kids is None:
+                b.kids = []
+            b.kids.append(child)
+            resident[v] = child
+            reopen(child)
+            releaf(child)
+            in_memory += 1
+        reopen(b)
+        releaf(b)
+
+        # Over budget: keep the best max_nodes of the nodes plus the child
+        while in_memory > max_nodes:
+            _, _, s, n = heapq.heappop(leaves)
+            if s != n.leaf:
+                stale_leaves -= 1
+                continue
+            n.leaf = 0
+            drop(n)
+            nodes_pruned += 1
+        if in_memory > peak_nodes:
+            peak_nodes = in_memory
+
+        if 2 * stale_opened > len(opened) + 64:
+            stale_opened = sweep(opened, lambda n: n.opened)
+        if 2 * stale_leaves > len(leaves) + 64:
+            stale_leaves = sweep(leaves, lambda n: n.leaf)
+
+    return _result(None, nodes_expanded, nodes_generated,
+                   nodes_pruned=nodes_pruned, peak_nodes=peak_nodes)
+
+
+def SMAStar_Search(start, goal, graph=None, heuristic=None, max_nodes=SMA_NODES,
+                   instrument=COUNTERS, trace=None):
+    if max_nodes < 1:
+        raise ValueError("max_nodes must be at least 1")
+    graph, start, goal = _resolve(graph, start, goal)
+    fn = _heuristic(graph, goal, heuristic)
+    return measure(lambda t: _smastar(graph, start, goal, fn, max_nodes, t),
+                   instrument, trace)
+
+
+# Beam search: breadth-first by levels, keeping only the width best nodes
+# (lowest f = g + h, then lowest h) of each level. Holds width nodes per
+# level plus the paths they hang from, and one byte per state to mark the
+# states that were already in a beam. Neither complete nor optimal: the goal
+# can fall out of every beam (goal_node None) or be reached the long way.
+BEAM_WIDTH = 100
+
+
+def _beam(graph, start, goal, h, width=BEAM_WIDTH, trace=None):
+    # h is called, not cached: a cache would grow with every state seen
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    in_beam = bytearray(len(graph))
+    in_beam[start] = 1
+    beam = [Node(start)]
+
+    def rank(node):
+        hn = h(node.state)
+        return (node.path_cost + hn, hn)
+
+    nodes_expanded = 0
+    nodes_generated = 0
+    nodes_pruned = 0
+
+    while beam:
+        children = {}
+        for j, node in enumerate(beam):
+            state = node.state
+            if on_expand:
+                on_expand(state, len(beam) - j - 1 + len(children))
+
+            if state == goal:
+                return _result(node, nodes_expanded, nodes_generated,
+                               nodes_pruned=nodes_pruned)
+
+            nodes_expanded += 1
+
+            cost = node.path_cost
+            depth = node.depth + 1
+            pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+            for v, w in zip(pairs, pairs):
+                nodes_generated += 1
+                if on_generate:
+                    on_generate(v)
+                if in_beam[v]:
+                    continue
+                g = cost + w
+                old = children.get(v)
+                if old is None or g < old.path_cost:
+                    children[v] = Node(v, node, v, g, depth)
+
+        if len(children) > width:
+            nodes_pruned += len(children) - width
+            beam = heapq.nsmallest(width, children.values(), key=rank)
+        else:
+            beam = sorted(children.values(), key=rank)
+        for node in beam:
+            in_beam[node.state] = 1
+
+    return _result(None, nodes_expanded, nodes_generated, nodes_pruned=nodes_pruned)
+
+
+def Beam_Search(start, goal, graph=None, heuristic=None, width=BEAM_WIDTH,
+                instrument=COUNTERS, trace=None):
+    if width < 1:
+        raise ValueError("width must be at least 1")
+    graph, start, goal = _resolve(graph, start, goal)
+    fn = _heuristic(graph, goal, heuristic)
+    return measure(lambda t: _beam(graph, start, goal, fn, width, t),
+                   instrument, trace)
+
+
+# Bidirectional A* (average potentials over bidirectional UCS)
+def _bidirectional_astar(graph, start, goal, h_goal, h_start, trace=None):
+    # Needs consistent estimates both ways: to the goal (forward search) and
+    # to the start (backward search)
+    if h_goal[start] == INF:
+        # Landmark bounds already prove the goal unreachable
+        return _result(None, 0, 0)
+    potential = lambda s: (h_goal[s] - h_start[s]) / 2
+    return _bidirectional_ucs(graph, start, goal, potential=potential, trace=trace)
+
+
+def BidirectionalAStar_Search(start, goal, graph=None, heuristic=None,
+                              instrument=COUNTERS, trace=None):
+    # A callable heuristic only estimates distances to goal; the backward
+    # side then uses the automatic heuristic for start
+    graph, start, goal = _resolve(graph, start, goal)
+    to_goal = _heuristic(graph, goal, heuristic)
+    to_start = _heuristic(graph, start, None if callable(heuristic) else heuristic)
+    return measure(lambda t: _bidirectional_astar(
+        graph, start, goal, _HeuristicCache(to_goal), _HeuristicCache(to_start), t),
+        instrument, trace)
+
+
+# A* to a set of goals (one-to-many / many-to-one, see uninformed_search)
+def _goals_heuristic(graph, goals, heuristic):
+    # heuristic: None (auto), a kind understood by heuristic_for_goals, or a
+    # callable state id -> estimate of the distance to the nearest goal
+    if callable(heuristic):
+        return heuristic
+    if heuristic is not None:
+        return heuristic_for_goals(graph, goals, heuristic)
+    names = graph.names
+    if graph is romania and [names[g] for g in goals] == [HEURISTIC_GOAL]:
+        return lambda s: heuristics[names[s]]
+    return heuristic_for_goals(graph, goals)
+
+
+def _astar_many(graph, start, goals, h, k=None, reverse=False, trace=None):
+    # h bounds the distance to the nearest goal, so it is 0 on every goal:
+    # goals are popped with f = g, nearest first. It keeps counting the
+    # goals already settled, which only makes it weaker, never wrong.
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+
+    frontier = BinaryHeap()
+    frontier.push(start, (h[start], h[start]))
+    best = {start: add(start)}
+    g_cost = {start: 0}
+    remaining = set(goals)
+    wanted = _wanted(goals, k)
+    settled = {}
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    while frontier and len(settled) < wanted:
+        state, _ = frontier.pop()
+        i = best.pop(state)
+        if on_expand:
+            on_expand(state, len(frontier))
+
+        if state in remaining:
+            remaining.discard(state)
+            settled[state] = i
+            if len(settled) == wanted:
+                break
+
+        nodes_expanded += 1
+
+        cost = store.cost[i]
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            g = cost + w
+            if g >= g_cost.get(v, INF):
+                continue
+            g_cost[v] = g
+            hv = h[v]
+            frontier.push_or_decrease(v, (g + hv, hv))
+            best[v] = add(v, i, g)
+
+    return _many_result(graph, store, settled, reverse, nodes_expanded, nodes_generated)
+
+
+def AStar_Many_Search(start, goals, graph=None, heuristic=None, k=None, reverse=False,
+                      instrument=COUNTERS, trace=None):
+    # Cheapest paths from start to each state in goals, or to the k nearest;
+    # reverse=True gives the paths from each goal to start instead
+    graph, start, goals = _resolve_goals(graph, start, goals)
+    fn = _goals_heuristic(graph, goals, heuristic) if goals else (lambda s: 0)
+    return measure(lambda t: _astar_many(graph, start, goals, _HeuristicCache(fn), k, reverse, t),
+                   instrument, trace)
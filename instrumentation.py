@@ -0,0 +1,60 @@
+# instrumentation.py
+# How much a search run measures about itself.
+#
+#   OFF       no timing, no memory tracing ("time"/"peak_memory" are None)
+#   COUNTERS  wall time only; node counters are always kept (default)
+#   MEMORY    wall time from an untraced run, plus peak memory from a second
+#             run under tracemalloc, so tracing never inflates "time"
+#
+# The searches are deterministic, so both MEMORY runs produce the same
+# result; the untraced one is returned. Tracing makes the searches roughly
+# 5-8x slower, so MEMORY costs about that much extra wall time while OFF and
+# COUNTERS are within noise of each other (benchmarks/instrumentation.py).
+
+import time
+import tracemalloc
+
+OFF = "off"
+COUNTERS = "counters"
+MEMORY = "memory"
+
+LEVELS = (OFF, COUNTERS, MEMORY)
+
+
+def traced_peak(run):
+    # Peak bytes allocated while run() executes. Works whether or not an
+    # outer caller is already tracing.
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        run()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def measure(run, level=COUNTERS, trace=None):
+    # run: callable taking the trace sink and returning the result dict
+    if level not in LEVELS:
+        raise ValueError(f"unknown instrumentation level: {level}")
+
+    if level == OFF:
+        res = run(trace)
+        res["time"] = None
+        res["peak_memory"] = None
+    else:
+        t0 = time.perf_counter()
+        res = run(trace)
+        res["time"] = time.perf_counter() - t0
+        res["peak_memory"] = None
+        if level == MEMORY:
+            shadow = trace.shadow() if trace is not None else None
+            res["peak_memory"] = traced_peak(lambda: run(shadow))
+
+    if trace is not None:
+        trace.attach(res)
+    return res
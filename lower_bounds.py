@@ -0,0 +1,289 @@
+# lower_bounds.py
+# Admissible heuristics for arbitrary (state, goal) pairs.
+#
+# LandmarkHeuristic (ALT): a few full Dijkstra runs from landmark states;
+# by the triangle inequality |d(L, goal) - d(L, s)| <= d(s, goal), so the
+# max over landmarks is an admissible (and consistent) bound that costs
+# O(#landmarks) per lookup. EuclideanHeuristic scales coordinate distance
+# by the smallest weight/length ratio of any edge, which keeps it admissible
+# even when coordinates are only a drawing layout (city_positions).
+
+import heapq
+import math
+import weakref
+from array import array
+from bisect import bisect_left
+
+INF = float("inf")
+
+# Graph.columns entries holding a landmark's distance table: "landmark:<id>"
+LANDMARK_COLUMN = "landmark:"
+
+
+def dijkstra_distances(graph, source):
+    # Full single-source run; lazy-deletion heapq is the fastest option for
+    # a one-shot sweep that never needs decrease-key.
+    dist = array("d", [INF]) * len(graph)
+    dist[source] = 0
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _components(graph):
+    # Root of every state's component, edge directions ignored (union-find)
+    parent = array("l", range(len(graph)))
+
+    def find(u):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    offsets, targets = graph.offsets, graph.targets
+    for u in range(len(graph)):
+        for e in range(offsets[u], offsets[u + 1]):
+            ru, rv = find(u), find(targets[e])
+            if ru != rv:
+                parent[max(ru, rv)] = min(ru, rv)
+    return [find(u) for u in range(len(graph))]
+
+
+def select_landmarks(graph, count, seed_state=0):
+    # Farthest-point selection: each new landmark is the reachable state
+    # farthest from all landmarks chosen so far. Each component of more
+    # than one state first gets one, largest component first (seed_state's
+    # leads on a tie), found as the farthest state from a seed inside it:
+    # states no landmark reaches get h = 0. With fewer landmarks than such
+    # components the smallest ones are left without.
+    if len(graph) == 0:
+        return [], []
+    roots = _components(graph)
+    sizes = {}
+    first = {}
+    for s, r in enumerate(roots):
+        sizes[r] = sizes.get(r, 0) + 1
+        first.setdefault(r, s)
+    first[roots[seed_state]] = seed_state
+    home = roots[seed_state]
+    seeds = [first[r] for r in sorted(sizes, key=lambda r: (-sizes[r], r != home, r))
+             if sizes[r] > 1 or r == home]
+    seeds.reverse()     # popped from the end
+
+    landmarks = []
+    tables = []
+    nearest = None
+    for _ in range(min(count, len(graph))):
+        while seeds and nearest is not None and nearest[seeds[-1]] < INF:
+            seeds.pop()
+        if seeds:
+            # A component still uncovered: start it from the state farthest
+            # from its seed
+            seed = seeds.pop()
+            reach = dijkstra_distances(graph, seed)
+            candidate = max((d, s) for s, d in enumerate(reach) if d < INF)[1]
+        else:
+            candidate = max((d, s) for s, d in enumerate(nearest) if d < INF)[1]
+        if candidate in landmarks:
+            break
+        table = dijkstra_distances(graph, candidate)
+        landmarks.append(candidate)
+        tables.append(table)
+        nearest = array("d", map(min, nearest, table)) if len(tables) > 1 else table
+    return landmarks, tables
+
+
+class LandmarkHeuristic:
+    def __init__(self, graph, count=4, landmarks=None, tables=None):
+        self.graph = graph
+        self.count = count
+        if landmarks is None:
+            self.landmarks, self.tables = select_landmarks(graph, count)
+        else:
+            self.landmarks = list(landmarks)
+            if tables is None:
+                tables = [dijkstra_distances(graph, s) for s in self.landmarks]
+            self.tables = list(tables)
+
+    @classmethod
+    def from_columns(cls, graph):
+        # Tables saved with the graph (Graph.save), or None if there are none
+        stored = [(int(name[len(LANDMARK_COLUMN):]), table)
+                  for name, table in graph.columns.items()
+                  if name.startswith(LANDMARK_COLUMN)]
+        if not stored:
+            return None
+        return cls(graph, len(stored), [s for s, _ in stored], [t for _, t in stored])
+
+    def columns(self):
+        # Graph.columns entries for these tables, so a saved graph can skip
+        # the Dijkstra runs when it is loaded again
+        return {f"{LANDMARK_COLUMN}{s}": table
+                for s, table in zip(self.landmarks, self.tables)}
+
+    def lower_bound(self, state, goal):
+        best = 0
+        for table in self.tables:
+            ds, dg = table[state], table[goal]
+            if ds == INF or dg == INF:
+                if ds != dg:
+                    return INF    # different components: goal unreachable
+                continue
+            d = ds - dg if ds > dg else dg - ds
+            if d > best:
+                best = d
+        return best
+
+    def for_goal(self, goal):
+        pairs = [(table, table[goal]) for table in self.tables]
+
+        def h(state):
+            best = 0
+            for table, dg in pairs:
+                ds = table[state]
+                if ds == INF or dg == INF:
+                    if ds != dg:
+                        return INF
+                    continue
+                d = ds - dg if ds > dg else dg - ds
+                if d > best:
+                    best = d
+            return best
+        return h
+
+    def for_goals(self, goals):
+        # Bound on the distance to the nearest of goals: per landmark, the
+        # gap between the state's value and the closest goal value (bisect
+        # in the goals' sorted values). Still admissible and consistent, and
+        # for one goal it is for_goal.
+        pairs = []
+        for table in self.tables:
+            values = sorted(table[g] for g in goals if table[g] != INF)
+            pairs.append((table, values, len(values) < len(goals)))
+
+        def h(state):
+            best = 0
+            for table, values, some_unreachable in pairs:
+                ds = table[state]
+                if ds == INF:
+                    if not some_unreachable:
+                        return INF    # every goal is in another component
+                    continue
+                if not values:
+                    return INF
+                i = bisect_left(values, ds)
+                d = INF
+                if i < len(values):
+                    d = values[i] - ds
+                if i and ds - values[i - 1] < d:
+                    d = ds - values[i - 1]
+                if d > best:
+                    best = d
+            return best
+        return h
+
+
+class EuclideanHeuristic:
+    def __init__(self, graph):
+        if graph.coords is None:
+            raise ValueError("graph has no coordinates")
+        missing = next((u for u, xy in enumerate(graph.coords) if xy is None), None)
+        if missing is not None:
+            raise ValueError(f"graph has no coordinates for {graph.names[missing]!r}")
+        self.graph = graph
+        self.coords = graph.coords
+        self.scale = self._admissible_scale(graph)
+
+    @staticmethod
+    def _admissible_scale(graph):
+        coords = graph.coords
+        scale = INF
+        for u in range(len(graph)):
+            ux, uy = coords[u]
+            for e in range(graph.offsets[u], graph.offsets[u + 1]):
+                vx, vy = coords[graph.targets[e]]
+                length = math.hypot(ux - vx, uy - vy)
+                if length > 0:
+                    scale = min(scale, graph.weights[e] / length)
+        return 0 if scale == INF else scale
+
+    def lower_bound(self, state, goal):
+        (sx, sy), (gx, gy) = self.coords[state], self.coords[goal]
+        return self.scale * math.hypot(sx - gx, sy - gy)
+
+    def for_goal(self, goal):
+        gx, gy = self.coords[goal]
+        scale = self.scale
+        coords = self.coords
+        return lambda s: scale * math.hypot(coords[s][0] - gx, coords[s][1] - gy)
+
+    def for_goals(self, goals):
+        # Distance to the nearest goal; O(len(goals)) per lookup
+        points = [self.coords[g] for g in goals]
+        scale = self.scale
+        coords = self.coords
+
+        def h(s):
+            sx, sy = coords[s]
+            return scale * min(math.hypot(sx - x, sy - y) for x, y in points)
+        return h
+
+
+# One landmark set per graph, built on first use and again after the graph
+# is edited: graph -> (version, LandmarkHeuristic)
+_landmark_cache = weakref.WeakKeyDictionary()
+
+
+def landmarks_for(graph, count=None):
+    # count None: the tables saved with the graph if it has any, else 4
+    version, lm = _landmark_cache.get(graph, (None, None))
+    if version != graph.version or (count is not None and lm.count != count):
+        lm = LandmarkHeuristic.from_columns(graph) if count is None else None
+        if lm is None:
+            lm = LandmarkHeuristic(graph, count or 4)
+        _landmark_cache[graph] = (graph.version, lm)
+    return lm
+
+
+# Likewise one Euclidean scale per graph version (finding it scans every
+# edge): graph -> (version, EuclideanHeuristic)
+_euclidean_cache = weakref.WeakKeyDictionary()
+
+
+def euclidean_for(graph):
+    version, eh = _euclidean_cache.get(graph, (None, None))
+    if version != graph.version:
+        eh = EuclideanHeuristic(graph)
+        _euclidean_cache[graph] = (graph.version, eh)
+    return eh
+
+
+def heuristic_for(graph, goal, kind="landmark"):
+    if kind == "landmark":
+        return landmarks_for(graph).for_goal(goal)
+    if kind == "euclidean":
+        return euclidean_for(graph).for_goal(goal)
+    if kind == "zero":
+        return lambda s: 0
+    raise ValueError(f"unknown heuristic: {kind}")
+
+
+def heuristic_for_goals(graph, goals, kind="landmark"):
+    # Lower bound on the distance to the nearest of goals (state ids)
+    if kind == "landmark":
+        return landmarks_for(graph).for_goals(goals)
+    if kind == "euclidean":
+        return euclidean_for(graph).for_goals(goals)
+    if kind == "zero":
+        return lambda s: 0
+    raise ValueError(f"unknown heuristic: {kind}")
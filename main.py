@@ -1,16 +1,21 @@
 # main.py
+# Usage: python main.py [map]   (.gr, .csv or binary graph file; default Romania)
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton,
-    QVBoxLayout, QLabel
+    QVBoxLayout, QLabel, QFileDialog, QMessageBox
 )
 from PySide6.QtCore import Qt
 from gui import UninformedWindow, InformedWindow
+from graph_io import open_graph
+import os
 import sys
 
 
 class MainMenu(QMainWindow):
-    def __init__(self):
+    def __init__(self, graph=None, title="Romania Map"):
         super().__init__()
+        self.graph = graph
+        self.map_title = title
         self.setWindowTitle("AI Search Visualizer")
         self.setMinimumSize(500, 300)
 
@@ -26,29 +31,49 @@ class MainMenu(QMainWindow):
 
         btn_uninformed = QPushButton("Uninformed Search")
         btn_informed = QPushButton("Informed Search")
+        btn_map = QPushButton("Open Map...")
 
         btn_uninformed.setMinimumHeight(40)
         btn_informed.setMinimumHeight(40)
 
         btn_uninformed.clicked.connect(self.open_uninformed)
         btn_informed.clicked.connect(self.open_informed)
+        btn_map.clicked.connect(self.open_map)
+
+        self.map_label = QLabel(f"Map: {self.map_title}")
+        self.map_label.setAlignment(Qt.AlignCenter)
 
         layout.addWidget(title)
         layout.addWidget(btn_uninformed)
         layout.addWidget(btn_informed)
+        layout.addWidget(btn_map)
+        layout.addWidget(self.map_label)
 
         # Windows reference
         self.uninformed_window = None
         self.informed_window = None
 
+    def open_map(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Map", "", "Maps (*.gr *.csv *.csr);;All files (*)")
+        if not path:
+            return
+        try:
+            self.graph = open_graph(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Cannot load map: {e}")
+            return
+        self.map_title = os.path.basename(path)
+        self.map_label.setText(f"Map: {self.map_title}")
+
     def open_uninformed(self):
-        self.uninformed_window = UninformedWindow()
+        self.uninformed_window = UninformedWindow(self.graph, self.map_title)
         self.uninformed_window.switch_to_menu.connect(self.show)
         self.uninformed_window.show()
         self.hide()
 
     def open_informed(self):
-        self.informed_window = InformedWindow()
+        self.informed_window = InformedWindow(self.graph, self.map_title)
         self.informed_window.switch_to_menu.connect(self.show)
         self.informed_window.show()
         self.hide()
@@ -56,6 +81,9 @@ class MainMenu(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    main = MainMenu()
+    if len(sys.argv) > 1:
+        main = MainMenu(open_graph(sys.argv[1]), os.path.basename(sys.argv[1]))
+    else:
+        main = MainMenu()
     main.show()
     sys.exit(app.exec())
@@ -0,0 +1,97 @@
+# parallel.py
+# Batch queries sharded across worker processes.
+#
+# Each search is single-threaded pure Python, so a batch only scales by
+# running queries in separate processes. Workers get the graph once, in
+# their initializer, by memory-mapping a CSR file (Graph.save / Graph.load):
+# the pages are shared between processes and nothing graph-sized is
+# pickled per task. Tasks are chunks of queries so the per-task IPC cost is
+# amortised, and at most a few chunks per worker are in flight, so results
+# stream out while the input is still being read.
+
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from batch import answer
+from graph import Graph
+from instrumentation import COUNTERS
+from query_cache import QueryCache
+
+# Graph (None: Romania) and result cache of this worker process
+_graph = None
+_cache = None
+
+
+def _init_worker(graph_path, cache_path, cache_size):
+    global _graph, _cache
+    _graph = Graph.load(graph_path) if graph_path is not None else None
+    _cache = QueryCache(cache_size, cache_path) if cache_path is not None else None
+
+
+def _run_chunk(chunk, heuristic, instrument, timeout):
+    return [answer(lineno, q, _graph, heuristic, instrument, timeout, _cache)
+            for lineno, q in chunk]
+
+
+def _chunks(queries, size):
+    chunk = []
+    for item in queries:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _drain(pending, ordered):
+    # Results of the next finished chunk (the oldest one when ordered)
+    if ordered:
+        return pending.popleft().result()
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    results = []
+    for future in done:
+        pending.remove(future)
+        results.extend(future.result())
+    return results
+
+
+def run_parallel(queries, graph=None, workers=None, ordered=True, timeout=None,
+                 heuristic=None, instrument=COUNTERS, chunksize=16,
+                 cache_path=None, cache_size=100000):
+    # queries: (line number, query dict) pairs, e.g. batch.parse_queries(...)
+    # graph: None (Romania), a CSR file path, or a Graph (saved to a
+    #   temporary file once so workers can map it)
+    # timeout: seconds per query; late queries come back as "error" results
+    # cache_path: QueryCache file each worker loads (and never writes)
+    # Yields batch.answer results, in input order when ordered
+    workers = workers or os.cpu_count() or 1
+    tmp = None
+    if isinstance(graph, Graph):
+        fd, tmp = tempfile.mkstemp(suffix=".csr")
+        os.close(fd)
+        graph.save(tmp)
+        graph = tmp
+
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(graph, cache_path, cache_size))
+    try:
+        pending = deque() if ordered else set()
+        window = 4 * workers
+        for chunk in _chunks(queries, chunksize):
+            future = pool.submit(_run_chunk, chunk, heuristic, instrument, timeout)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+            if len(pending) >= window:
+                yield from _drain(pending, ordered)
+        while pending:
+            yield from _drain(pending, ordered)
+    finally:
+        # Also reached when the caller stops iterating early: queued chunks
+        # are dropped, running ones finish first (bounded by timeout)
+        pool.shutdown(cancel_futures=True)
+        if tmp is not None:
+            os.remove(tmp)
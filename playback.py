@@ -0,0 +1,74 @@
+# playback.py
+# Lazily derived animation frames for a recorded search (EventTrace).
+# Frame k shows the search right after its k-th expansion (and the
+# children that expansion generated): every state is
+# unseen, on the frontier (generated, not yet expanded), explored, or the
+# one being expanded. Nothing is materialised per frame; seeking applies
+# the event slice between the current and the target frame with NumPy,
+# and snapshots taken on the way make backward seeks cheap.
+
+import numpy as np
+
+UNSEEN, FRONTIER, EXPLORED, CURRENT = 0, 1, 2, 3
+
+
+class Playback:
+    CHECKPOINT = 4096   # frames between cached snapshots
+
+    def __init__(self, events, num_states):
+        self.events = np.frombuffer(events, dtype=np.int32) if len(events) else \
+            np.empty(0, dtype=np.int32)
+        # Position of every expansion record; frame k runs up to the next one
+        self._expands = np.flatnonzero((self.events & 1) == 0)
+        self.num_frames = len(self._expands)
+        self._status = np.zeros(num_states, dtype=np.uint8)
+        self._frame = 0
+        self._snapshots = {0: self._status.copy()}
+
+    def _event_end(self, frame):
+        if frame == 0:
+            return 0
+        if frame == self.num_frames:
+            return len(self.events)
+        return int(self._expands[frame])
+
+    def _apply(self, start, stop):
+        chunk = self.events[start:stop]
+        states = chunk >> 1
+        generated = states[(chunk & 1) == 1]
+        status = self._status
+        # Explored wins over frontier, so the slice can be applied unordered
+        status[generated[status[generated] == UNSEEN]] = FRONTIER
+        status[states[(chunk & 1) == 0]] = EXPLORED
+
+    def seek(self, frame):
+        frame = max(0, min(frame, self.num_frames))
+        if frame < self._frame:
+            base = (frame // self.CHECKPOINT) * self.CHECKPOINT
+            while base not in self._snapshots:
+                base -= self.CHECKPOINT
+            self._status = self._snapshots[base].copy()
+            self._frame = base
+
+        # Walk forward checkpoint by checkpoint, saving snapshots on the way
+        while self._frame < frame:
+            step = min(frame, (self._frame // self.CHECKPOINT + 1) * self.CHECKPOINT)
+            self._apply(self._event_end(self._frame), self._event_end(step))
+            self._frame = step
+            if step % self.CHECKPOINT == 0 and step not in self._snapshots:
+                self._snapshots[step] = self._status.copy()
+        return self.frame_states()
+
+    def current_state(self):
+        if self._frame == 0:
+            return None
+        return int(self.events[self._expands[self._frame - 1]] >> 1)
+
+    def frame_states(self):
+        # (state ids touched so far, their status codes) for the current frame
+        touched = np.flatnonzero(self._status)
+        codes = self._status[touched].copy()
+        current = self.current_state()
+        if current is not None:
+            codes[np.searchsorted(touched, current)] = CURRENT
+        return touched, codes
@@ -0,0 +1,248 @@
+# priority_queue.py
+# Addressable priority queues for UCS and the informed searches.
+# Items are hashable keys (state ids); each item is in the queue at most
+# once, so a cheaper path lowers its key instead of pushing a stale copy.
+# Ties on priority are broken by insertion order (FIFO), never by
+# comparing the items themselves.
+
+
+class BinaryHeap:
+    def __init__(self):
+        self._heap = []      # entries: [priority, count, item]
+        self._pos = {}       # item -> index in _heap
+        self._count = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+        self.max_size = 0
+
+    def push(self, item, priority):
+        entry = [priority, self._count, item]
+        self._count += 1
+        self.pushes += 1
+        self._heap.append(entry)
+        self._pos[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        if len(self._heap) > self.max_size:
+            self.max_size = len(self._heap)
+
+    def pop(self):
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        del self._pos[top[2]]
+        if heap:
+            heap[0] = last
+            self._pos[last[2]] = 0
+            self._sift_down(0)
+        self.pops += 1
+        return top[2], top[0]
+
+    def peek(self):
+        top = self._heap[0]
+        return top[2], top[0]
+
+    def decrease_key(self, item, priority):
+        i = self._pos[item]
+        entry = self._heap[i]
+        if priority >= entry[0]:
+            return False
+        entry[0] = priority
+        self.decreases += 1
+        self._sift_up(i)
+        return True
+
+    def push_or_decrease(self, item, priority):
+        if item in self._pos:
+            return self.decrease_key(item, priority)
+        self.push(item, priority)
+        return True
+
+    def update(self, item, priority):
+        # New priority in either direction (pushes an item not yet queued)
+        i = self._pos.get(item)
+        if i is None:
+            self.push(item, priority)
+            return
+        entry = self._heap[i]
+        old, entry[0] = entry[0], priority
+        if priority < old:
+            self.decreases += 1
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, item):
+        heap = self._heap
+        i = self._pos.pop(item)
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self._pos[last[2]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[2]])
+
+    def priority(self, item):
+        return self._heap[self._pos[item]][0]
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def _sift_up(self, i):
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        key = (entry[0], entry[1])
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = heap[parent]
+            if (p[0], p[1]) <= key:
+                break
+            heap[i] = p
+            pos[p[2]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[2]] = i
+
+    def _sift_down(self, i):
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        key = (entry[0], entry[1])
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            c = heap[child]
+            right = child + 1
+            if right < n:
+                r = heap[right]
+                if (r[0], r[1]) < (c[0], c[1]):
+                    child, c = right, r
+            if key <= (c[0], c[1]):
+                break
+            heap[i] = c
+            pos[c[2]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[2]] = i
+
+
+class _PairingNode:
+    __slots__ = ("priority", "count", "item", "child", "sibling", "prev")
+
+    def __init__(self, priority, count, item):
+        self.priority = priority
+        self.count = count
+        self.item = item
+        self.child = None
+        self.sibling = None
+        self.prev = None     # parent if leftmost child, else left sibling
+
+
+class PairingHeap:
+    # O(1) push and amortised o(log n) decrease-key; better than the binary
+    # heap when most relaxations lower an existing key (dense graphs).
+    def __init__(self):
+        self._root = None
+        self._nodes = {}
+        self._count = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+        self.max_size = 0
+
+    def push(self, item, priority):
+        node = _PairingNode(priority, self._count, item)
+        self._count += 1
+        self.pushes += 1
+        self._nodes[item] = node
+        self._root = self._meld(self._root, node)
+        if len(self._nodes) > self.max_size:
+            self.max_size = len(self._nodes)
+
+    def pop(self):
+        root = self._root
+        del self._nodes[root.item]
+        self._root = self._merge_pairs(root.child)
+        if self._root is not None:
+            self._root.prev = None
+        self.pops += 1
+        return root.item, root.priority
+
+    def peek(self):
+        return self._root.item, self._root.priority
+
+    def decrease_key(self, item, priority):
+        node = self._nodes[item]
+        if priority >= node.priority:
+            return False
+        node.priority = priority
+        self.decreases += 1
+        if node is not self._root:
+            # Cut the subtree out and meld it back with the root
+            if node.prev.child is node:
+                node.prev.child = node.sibling
+            else:
+                node.prev.sibling = node.sibling
+            if node.sibling is not None:
+                node.sibling.prev = node.prev
+            node.sibling = node.prev = None
+            self._root = self._meld(self._root, node)
+        return True
+
+    def push_or_decrease(self, item, priority):
+        if item in self._nodes:
+            return self.decrease_key(item, priority)
+        self.push(item, priority)
+        return True
+
+    def priority(self, item):
+        return self._nodes[item].priority
+
+    def __contains__(self, item):
+        return item in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __bool__(self):
+        return self._root is not None
+
+    @staticmethod
+    def _meld(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if (b.priority, b.count) < (a.priority, a.count):
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        return a
+
+    def _merge_pairs(self, first):
+        # Two-pass pairing, done iteratively to avoid deep recursion
+        pairs = []
+        node = first
+        while node is not None:
+            a = node
+            b = node.sibling
+            node = b.sibling if b is not None else None
+            a.sibling = a.prev = None
+            if b is not None:
+                b.sibling = b.prev = None
+            pairs.append(self._meld(a, b))
+        root = None
+        for tree in reversed(pairs):
+            root = self._meld(tree, root)
+        return root
@@ -0,0 +1,83 @@
+# query_cache.py
+# Memoised search results with bounded LRU eviction.
+#
+# Keys start with the graph's content hash (Graph.fingerprint), so results
+# computed on an edited graph never answer queries on the new one; stale
+# entries simply age out. A cache given a path loads it on creation and
+# save() writes it back, so a warm start skips recomputation.
+
+import os
+import pickle
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class QueryCache:
+    def __init__(self, maxsize=1024, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    @staticmethod
+    def key(graph, algorithm, start, goal, *options):
+        return (graph.fingerprint(), algorithm, start, goal) + options
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        # Membership test only: no hit/miss accounting, no LRU update
+        return key in self._entries
+
+    def get(self, key, default=None):
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "size": len(self._entries), "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+    # Persistence (pickle of the entries in LRU order)
+    def save(self, path=None):
+        path = path or self.path
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(list(self._entries.items()), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)    # never leave a half-written cache behind
+
+    def load(self, path=None):
+        with open(path or self.path, "rb") as f:
+            for key, value in pickle.load(f):
+                self.put(key, value)
@@ -0,0 +1,283 @@
+# search_trace.py
+# Opt-in sinks for the expansion / generation events of a search.
+#
+# Without a sink the searches keep only their counters, so memory stays
+# bounded by the frontier. Pass one of these as trace=... to observe the
+# run as it happens:
+#   ListTrace      collects state names into "expanded_list"/"generated_list"
+#                  (what the GUI shows)
+#   CallbackTrace  calls fn(kind, name) for every event
+#   EventTrace     records the interleaved event order as compact int32
+#                  records (for playback); the two lists are decoded from
+#                  them only if read
+#   FileTrace      streams events to a line-delimited or compact binary file;
+#                  read it back lazily with read_trace()
+#   ProgressTrace  wraps another sink; reports progress periodically and
+#                  aborts the run on cancellation or when a budget runs out
+#
+# expand() also receives the current frontier size (path depth for the
+# depth-first searches), which only progress reporting uses.
+
+import sys
+import time
+from array import array
+from collections.abc import Sequence
+
+EXPAND = "E"
+GENERATE = "G"
+
+
+def hooks(trace, graph):
+    # Bound per-event callables for the search loops (None when untraced)
+    if trace is None:
+        return None, None
+    trace.bind(graph)
+    return trace.expand, trace.generate
+
+
+class TraceSink:
+    def bind(self, graph):
+        self.names = graph.names
+
+    def expand(self, state, frontier_size=0):
+        pass
+
+    def generate(self, state):
+        pass
+
+    def attach(self, res):
+        # Called once with the finished result dict
+        pass
+
+    def shadow(self):
+        # Stand-in for the second, memory-traced run of the MEMORY level
+        return None
+
+
+class ListTrace(TraceSink):
+    def __init__(self):
+        self.expanded = []
+        self.generated = []
+
+    def expand(self, state, frontier_size=0):
+        self.expanded.append(self.names[state])
+
+    def generate(self, state):
+        self.generated.append(self.names[state])
+
+    def attach(self, res):
+        res["expanded_list"] = self.expanded
+        res["generated_list"] = self.generated
+
+    def shadow(self):
+        return ListTrace()
+
+
+class EventTrace(TraceSink):
+    # Records are (state_id << 1 | is_generate), the same encoding FileTrace
+    # writes in binary mode.
+    def __init__(self):
+        self.events = array("i")
+
+    def expand(self, state, frontier_size=0):
+        self.events.append(state << 1)
+
+    def generate(self, state):
+        self.events.append(state << 1 | 1)
+
+    def attach(self, res):
+        res["events"] = self.events
+        res["expanded_list"] = EventNames(self.events, self.names, generated=False)
+        res["generated_list"] = EventNames(self.events, self.names, generated=True)
+
+    def shadow(self):
+        return EventTrace()
+
+
+class EventNames(Sequence):
+    # The expanded (or generated) state names of an EventTrace run, decoded
+    # from its records on first access; playback reads the records instead
+    def __init__(self, events, names, generated):
+        self.events = events
+        self.names = names
+        self.generated = generated
+        self._decoded = None
+
+    def _list(self):
+        if self._decoded is None:
+            names, bit = self.names, int(self.generated)
+            self._decoded = [names[r >> 1] for r in self.events if (r & 1) == bit]
+        return self._decoded
+
+    def __len__(self):
+        return len(self._list())
+
+    def __getitem__(self, i):
+        return self._list()[i]
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(self._list())
+
+
+class CallbackTrace(TraceSink):
+    def __init__(self, fn):
+        self.fn = fn
+
+    def expand(self, state, frontier_size=0):
+        self.fn(EXPAND, self.names[state])
+
+    def generate(self, state):
+        self.fn(GENERATE, self.names[state])
+
+
+class FileTrace(TraceSink):
+    # Line format: "E<TAB>name" per event. Binary format: little-endian
+    # int32 records (state_id << 1 | is_generate), written in blocks.
+    BLOCK = 1 << 16
+
+    def __init__(self, path, binary=False):
+        self.path = path
+        self.binary = binary
+        self._file = open(path, "wb" if binary else "w")
+        self._buffer = array("i")
+
+    def expand(self, state, frontier_size=0):
+        if self.binary:
+            self._push(state << 1)
+        else:
+            self._file.write(f"{EXPAND}\t{self.names[state]}\n")
+
+    def generate(self, state):
+        if self.binary:
+            self._push(state << 1 | 1)
+        else:
+            self._file.write(f"{GENERATE}\t{self.names[state]}\n")
+
+    def _push(self, record):
+        buf = self._buffer
+        buf.append(record)
+        if len(buf) >= self.BLOCK:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            if sys.byteorder == "big":
+                self._buffer.byteswap()
+            self._buffer.tofile(self._file)
+            self._buffer = array("i")
+
+    def close(self):
+        if not self._file.closed:
+            if self.binary:
+                self._flush()
+            self._file.close()
+
+    def attach(self, res):
+        self.close()
+        res["trace_file"] = self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path, binary=False, graph=None):
+    # Lazily yields (kind, state) pairs; binary traces give state ids
+    # unless a graph is passed to map them back to names.
+    if not binary:
+        with open(path) as f:
+            for line in f:
+                kind, name = line.rstrip("\n").split("\t", 1)
+                yield kind, name
+        return
+
+    names = graph.names if graph is not None else None
+    swap = sys.byteorder == "big"
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(4 * FileTrace.BLOCK)
+            if not chunk:
+                break
+            records = array("i", chunk)
+            if swap:
+                records.byteswap()
+            for r in records:
+                state = r >> 1
+                yield (GENERATE if r & 1 else EXPAND,
+                       names[state] if names is not None else state)
+
+
+class SearchAborted(Exception):
+    # Raised from inside a search by ProgressTrace
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ProgressTrace(TraceSink):
+    # report(expanded, frontier_size, elapsed) is called at most once per
+    # `interval` seconds. should_stop() is polled on every expansion.
+    def __init__(self, inner=None, report=None, should_stop=None,
+                 max_nodes=None, max_seconds=None, interval=0.05):
+        self.inner = inner
+        self.report = report
+        self.should_stop = should_stop
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.interval = interval
+        self.t0 = time.perf_counter()
+        self.expanded = 0
+        self._next_report = 0
+
+    def bind(self, graph):
+        super().bind(graph)
+        if self.inner is not None:
+            self.inner.bind(graph)
+
+    def expand(self, state, frontier_size=0):
+        self.expanded += 1
+        if self.inner is not None:
+            self.inner.expand(state, frontier_size)
+        if self.should_stop is not None and self.should_stop():
+            raise SearchAborted("cancelled")
+        if self.max_nodes is not None and self.expanded > self.max_nodes:
+            raise SearchAborted(f"node budget of {self.max_nodes} exhausted")
+        # Clock checks are amortised over 64 expansions
+        if self.expanded & 63:
+            return
+        elapsed = time.perf_counter() - self.t0
+        if self.max_seconds is not None and elapsed > self.max_seconds:
+            raise SearchAborted(f"time budget of {self.max_seconds}s exhausted")
+        if self.report is not None and elapsed >= self._next_report:
+            self._next_report = elapsed + self.interval
+            self.report(self.expanded, frontier_size, elapsed)
+
+    def generate(self, state):
+        if self.inner is not None:
+            self.inner.generate(state)
+
+    def attach(self, res):
+        if self.inner is not None:
+            self.inner.attach(res)
+        if self.report is not None:
+            self.report(self.expanded, 0, time.perf_counter() - self.t0)
+
+    def shadow(self):
+        # Same reporting, budgets and cancel flag for the memory-traced
+        # rerun (its expansion count starts again from 0)
+        shadow = ProgressTrace(
+            self.inner.shadow() if self.inner is not None else None,
+            self.report, self.should_stop, self.max_nodes, self.max_seconds,
+            self.interval)
+        shadow.t0 = self.t0
+        return shadow
@@ -0,0 +1,139 @@
+# synthetic_graphs.py
+# Generators for synthetic test maps, returned as graph.Graph instances.
+# Node names are strings so the graphs plug into the same search API.
+
+import math
+import random
+
+from graph import Graph
+
+
+def grid_graph(rows, cols, weight=1):
+    names = [f"{r},{c}" for r in range(rows) for c in range(cols)]
+    coords = [(c, r) for r in range(rows) for c in range(cols)]
+    edges = []
+    for r in range(rows):
+        base = r * cols
+        for c in range(cols):
+            u = base + c
+            if c + 1 < cols:
+                edges.append((u, u + 1, weight))
+            if r + 1 < rows:
+                edges.append((u, u + cols, weight))
+    return Graph.from_edge_list(names, edges, coords)
+
+
+def random_graph(n, avg_degree, max_weight=100, seed=0):
+    rng = random.Random(seed)
+    names = [str(i) for i in range(n)]
+    target = n * avg_degree // 2
+    seen = set()
+    edges = []
+    # Random spanning tree first so every query has an answer
+    for u in range(1, n):
+        v = rng.randrange(u)
+        seen.add((v, u))
+        edges.append((v, u, rng.randint(1, max_weight)))
+    while len(edges) < target:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v:
+            continue
+        key = (min(u, v), max(u, v))
+        if key in seen:
+            continue
+        seen.add(key)
+        edges.append((u, v, rng.randint(1, max_weight)))
+    return Graph.from_edge_list(names, edges)
+
+
+def geometric_graph(n, avg_degree=6, size=1000, seed=0):
+    # Random geometric graph: points in a size x size square, joined when
+    # closer than the radius that gives avg_degree on average. Weights are
+    # rounded Euclidean lengths, so coordinates make a useful heuristic.
+    rng = random.Random(seed)
+    names = [str(i) for i in range(n)]
+    coords = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(n)]
+    radius = size * math.sqrt(avg_degree / (math.pi * max(n, 1)))
+
+    def length(u, v):
+        (ux, uy), (vx, vy) = coords[u], coords[v]
+        return max(1, round(math.hypot(ux - vx, uy - vy)))
+
+    # Bucket points into radius-sized cells; only neighbouring cells can
+    # hold points within range
+    cells = {}
+    for u, (x, y) in enumerate(coords):
+        cells.setdefault((int(x // radius), int(y // radius)), []).append(u)
+    edges = []
+    parent = list(range(n))
+
+    def find(u):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    r2 = radius * radius
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                other = cells.get((cx + dx, cy + dy))
+                if other is None:
+                    continue
+                for u in members:
+                    ux, uy = coords[u]
+                    for v in other:
+                        if v <= u:
+                            continue
+                        vx, vy = coords[v]
+                        if (ux - vx) ** 2 + (uy - vy) ** 2 <= r2:
+                            edges.append((u, v, length(u, v)))
+                            parent[find(u)] = find(v)
+
+    # Chain the components (in x order) so every query has an answer
+    roots = {}
+    for u in sorted(range(n), key=lambda u: coords[u]):
+        roots.setdefault(find(u), u)
+    reps = list(roots.values())
+    for u, v in zip(reps, reps[1:]):
+        edges.append((u, v, length(u, v)))
+    return Graph.from_edge_list(names, edges, coords)
+
+
+def scale_free_graph(n, m=2, max_weight=100, seed=0):
+    # Barabasi-Albert preferential attachment: each new node links to m
+    # existing nodes picked in proportion to their degree
+    rng = random.Random(seed)
+    names = [str(i) for i in range(n)]
+    edges = []
+    ends = []    # every edge endpoint, so a uniform pick is degree-biased
+    for u in range(1, n):
+        picked = set()
+        want = min(m, u)
+        while len(picked) < want:
+            picked.add(rng.choice(ends) if ends and rng.random() < 0.9
+                       else rng.randrange(u))
+        for v in picked:
+            edges.append((v, u, rng.randint(1, max_weight)))
+            ends.extend((u, v))
+    return Graph.from_edge_list(names, edges)
+
+
+def tree_graph(n, branching=2, max_weight=1, seed=0):
+    # Complete tree in heap order: the parent of u is (u - 1) // branching
+    rng = random.Random(seed)
+    names = [str(i) for i in range(n)]
+    edges = [((u - 1) // branching, u,
+              1 if max_weight == 1 else rng.randint(1, max_weight))
+             for u in range(1, n)]
+    return Graph.from_edge_list(names, edges)
+
+
+FAMILIES = {
+    "grid": lambda n, seed=0: grid_graph(max(1, round(math.sqrt(n))),
+                                         max(1, round(math.sqrt(n)))),
+    "random": lambda n, seed=0: random_graph(n, 4, seed=seed),
+    "geometric": lambda n, seed=0: geometric_graph(n, seed=seed),
+    "scale_free": lambda n, seed=0: scale_free_graph(n, seed=seed),
+    "tree": lambda n, seed=0: tree_graph(n, seed=seed),
+}
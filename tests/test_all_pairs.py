@@ -0,0 +1,57 @@
+# tests/test_all_pairs.py
+# All-pairs tables (both methods) against single-source Dijkstra, and the
+# fingerprint and edit checks on saved tables.
+#   python -m pytest tests
+
+import pytest
+
+from all_pairs import AllPairs
+from graph import romania
+from lower_bounds import dijkstra_distances
+from synthetic_graphs import random_graph
+
+
+@pytest.mark.parametrize("method", ["floyd", "dijkstra"])
+def test_distances_match_dijkstra(method):
+    graph = random_graph(60, 4, seed=2)
+    table = AllPairs.compute(graph, method=method)
+    for s in (0, 17, 59):
+        dist = dijkstra_distances(graph, s)
+        for v in range(len(graph)):
+            assert table.distance(graph.names[s], graph.names[v]) == dist[v]
+
+
+@pytest.mark.parametrize("method", ["floyd", "dijkstra"])
+def test_paths_are_shortest(method):
+    table = AllPairs.compute(romania, method=method)
+    path = table.path("Arad", "Bucharest")
+    assert path[0] == "Arad" and path[-1] == "Bucharest"
+    index = romania.index
+    cost = sum(romania.weight(index[a], index[b]) for a, b in zip(path, path[1:]))
+    assert cost == table.distance("Arad", "Bucharest") == 418
+    assert table.result("Arad", "Arad")["path"] == ["Arad"]
+
+
+def test_parallel_dijkstra_matches_serial(tmp_path):
+    graph = random_graph(80, 3, seed=5)
+    serial = AllPairs.compute(graph, method="dijkstra")
+    parallel = AllPairs.compute(graph, method="dijkstra", workers=2,
+                                path=tmp_path / "t.apsp", chunk=16)
+    assert (serial.dist == parallel.dist).all()
+
+
+def test_saved_table_checks_its_graph(tmp_path):
+    path = tmp_path / "romania.apsp"
+    AllPairs.compute(romania).save(path)
+    assert AllPairs.load(path).distance("Arad", "Bucharest") == 418
+    with pytest.raises(ValueError, match="different graph"):
+        AllPairs.load(path, random_graph(len(romania), 3))
+
+
+def test_lookups_refuse_a_table_older_than_an_edit():
+    graph = random_graph(30, 3, seed=1)
+    table = AllPairs.compute(graph)
+    u = 0
+    graph.set_weight(u, graph.targets[graph.offsets[u]], 1000)
+    with pytest.raises(ValueError, match="older"):
+        table.distance(graph.names[0], graph.names[1])
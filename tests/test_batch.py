@@ -0,0 +1,66 @@
+# tests/test_batch.py
+# Query parsing and per-line error results of the headless batch CLI.
+#   python -m pytest tests
+
+import io
+import json
+
+from batch import main, parse_queries, run_batch
+from parallel import run_parallel
+
+LINES = [
+    "start,goal,algorithm,limit",
+    "# comment",
+    "",
+    "Arad,Bucharest,A*",
+    "{bad json",
+    '{"start": "Arad", "goal": "Sibiu", "algorithm": "BFS"}',
+    "Arad,Nowhere,UCS",
+    "Arad,Bucharest,NoSuchSearch",
+    "Arad,Bucharest,DLS,2",
+]
+
+
+def _run(lines):
+    out = io.StringIO()
+    counts = run_batch(lines, out)
+    return counts, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_parse_skips_header_comments_and_blank_lines():
+    parsed = list(parse_queries(LINES))
+    assert [lineno for lineno, _ in parsed] == [4, 5, 6, 7, 8, 9]
+    assert parsed[0][1] == {"start": "Arad", "goal": "Bucharest", "algorithm": "A*"}
+    assert parsed[2][1]["algorithm"] == "BFS"
+
+
+def test_malformed_json_line_does_not_stop_the_batch():
+    (ok, failed, cached), results = _run(LINES)
+    assert [r["line"] for r in results] == [4, 5, 6, 7, 8, 9]
+    assert "bad JSON" in results[1]["error"]
+    assert results[0]["cost"] == 418
+    assert results[2]["path"] == ["Arad", "Sibiu"]
+    assert (ok, failed, cached) == (3, 3, 0)
+
+
+def test_bad_queries_become_error_lines():
+    _, results = _run(LINES)
+    assert "unknown state" in results[3]["error"]
+    assert "unknown algorithm" in results[4]["error"]
+    assert results[5]["found"] is False and results[5]["limit"] == 2
+
+
+def test_parallel_reports_malformed_lines_too():
+    results = list(run_parallel(parse_queries(LINES), workers=2, chunksize=2))
+    assert [r["line"] for r in results] == [4, 5, 6, 7, 8, 9]
+    assert "bad JSON" in results[1]["error"]
+    assert results[2]["path"] == ["Arad", "Sibiu"]
+
+
+def test_cli_exit_status(tmp_path, capsys):
+    queries = tmp_path / "queries.csv"
+    queries.write_text("\n".join(LINES) + "\n")
+    output = tmp_path / "results.jsonl"
+    assert main([str(queries), "-o", str(output)]) == 1
+    assert len(output.read_text().splitlines()) == 6
+    assert "3 queries answered" in capsys.readouterr().err
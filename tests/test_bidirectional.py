@@ -0,0 +1,63 @@
+# tests/test_bidirectional.py
+# Bidirectional UCS and bidirectional A* return UCS's cost on random
+# queries, with either heap, and real paths of that cost.
+#   python -m pytest tests
+
+import random
+
+import pytest
+
+from graph import romania
+from informed_search import BidirectionalAStar_Search
+from priority_queue import BinaryHeap, PairingHeap
+from synthetic_graphs import geometric_graph, random_graph
+from uninformed_search import BidirectionalUCS_with_metrics, UCS_with_metrics
+
+GRAPHS = {
+    "romania": romania,
+    "geometric": geometric_graph(500, seed=6),
+    "random": random_graph(300, 4, seed=6),
+}
+
+
+def _cost(graph, path):
+    index = graph.index
+    return sum(graph.weight(index[a], index[b]) for a, b in zip(path, path[1:]))
+
+
+def _queries(graph, count=15):
+    rng = random.Random(3)
+    return [(rng.choice(graph.names), rng.choice(graph.names)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("name", list(GRAPHS))
+@pytest.mark.parametrize("queue", [BinaryHeap, PairingHeap])
+def test_bidirectional_ucs_is_optimal(name, queue):
+    graph = GRAPHS[name]
+    for start, goal in _queries(graph):
+        expected = UCS_with_metrics(start, goal, graph=graph)["goal_node"].path_cost
+        res = BidirectionalUCS_with_metrics(start, goal, graph=graph, queue=queue)
+        assert res["path_cost"] == expected
+        assert res["path"][0] == start and res["path"][-1] == goal
+        assert _cost(graph, res["path"]) == expected
+
+
+@pytest.mark.parametrize("name", ["geometric", "random"])
+@pytest.mark.parametrize("heuristic", ["landmark", "euclidean", None])
+def test_bidirectional_astar_is_optimal(name, heuristic):
+    graph = GRAPHS[name]
+    if heuristic == "euclidean" and graph.coords is None:
+        pytest.skip("no coordinates")
+    for start, goal in _queries(graph):
+        expected = UCS_with_metrics(start, goal, graph=graph)["goal_node"].path_cost
+        res = BidirectionalAStar_Search(start, goal, graph=graph, heuristic=heuristic)
+        assert res["path_cost"] == pytest.approx(expected)
+        assert _cost(graph, res["path"]) == expected
+
+
+def test_bidirectional_astar_expands_less_than_ucs():
+    graph = GRAPHS["geometric"]
+    start, goal = graph.names[0], graph.names[-1]
+    ucs = UCS_with_metrics(start, goal, graph=graph)
+    astar = BidirectionalAStar_Search(start, goal, graph=graph, heuristic="landmark")
+    assert astar["nodes_expanded"] < ucs["nodes_expanded"]
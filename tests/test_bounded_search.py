@@ -0,0 +1,80 @@
+# tests/test_bounded_search.py
+# SMA* stays within its node budget and is optimal when the budget allows;
+# beam search keeps at most width nodes a level.
+#   python -m pytest tests
+
+import random
+
+import pytest
+
+from informed_search import Beam_Search, SMAStar_Search
+from synthetic_graphs import geometric_graph, grid_graph
+from uninformed_search import BFS_with_metrics, UCS_with_metrics, extract_path
+
+
+def _cost(graph, path):
+    index = graph.index
+    return sum(graph.weight(index[a], index[b]) for a, b in zip(path, path[1:]))
+
+
+def _queries(graph, count=8):
+    rng = random.Random(9)
+    return [(rng.choice(graph.names), rng.choice(graph.names)) for _ in range(count)]
+
+
+def test_smastar_on_romania():
+    res = SMAStar_Search("Arad", "Bucharest")
+    assert res["goal_node"].path_cost == 418
+    assert extract_path(res["goal_node"]) == \
+        ["Arad", "Sibiu", "Rimnicu", "Pitesti", "Bucharest"]
+
+
+def test_smastar_is_optimal_with_room():
+    graph = geometric_graph(300, seed=1)
+    for start, goal in _queries(graph):
+        expected = UCS_with_metrics(start, goal, graph=graph)["goal_node"].path_cost
+        res = SMAStar_Search(start, goal, graph=graph, max_nodes=len(graph))
+        assert res["goal_node"].path_cost == pytest.approx(expected)
+        assert res["peak_nodes"] <= len(graph)
+
+
+@pytest.mark.parametrize("max_nodes", [20, 40, 80])
+def test_smastar_keeps_to_its_budget(max_nodes):
+    graph = grid_graph(15, 15)
+    for start, goal in _queries(graph, 4):
+        expected = UCS_with_metrics(start, goal, graph=graph)["goal_node"].path_cost
+        res = SMAStar_Search(start, goal, graph=graph, max_nodes=max_nodes)
+        assert res["peak_nodes"] <= max_nodes
+        if res["goal_node"] is not None:
+            path = extract_path(res["goal_node"], graph)
+            assert path[0] == start and path[-1] == goal
+            assert _cost(graph, path) == res["goal_node"].path_cost >= expected
+
+
+def test_smastar_rejects_an_empty_budget():
+    with pytest.raises(ValueError):
+        SMAStar_Search("Arad", "Bucharest", max_nodes=0)
+
+
+def test_wide_beam_is_breadth_first():
+    graph = grid_graph(12, 12)
+    for start, goal in _queries(graph):
+        depth = BFS_with_metrics(start, goal, graph=graph)["goal_node"].depth
+        res = Beam_Search(start, goal, graph=graph, width=len(graph))
+        assert res["goal_node"].depth == depth and res["nodes_pruned"] == 0
+
+
+@pytest.mark.parametrize("width", [1, 3, 10])
+def test_beam_width_bounds_each_level(width):
+    # Corner to corner on a grid every level is one step nearer, so the
+    # goal is found at level 22 having expanded at most width a level
+    graph = grid_graph(12, 12)
+    res = Beam_Search(graph.names[0], graph.names[-1], graph=graph, width=width)
+    assert res["goal_node"].depth == 22
+    assert res["nodes_expanded"] <= 1 + 21 * width
+    assert res["nodes_pruned"] > 0
+
+
+def test_beam_rejects_zero_width():
+    with pytest.raises(ValueError):
+        Beam_Search("Arad", "Bucharest", width=0)
@@ -0,0 +1,64 @@
+# tests/test_contraction.py
+# Contraction hierarchy queries against UCS, unpacked paths, and the
+# fingerprint / edit checks on saved hierarchies.
+#   python -m pytest tests
+
+import random
+
+import pytest
+
+from contraction import CH_with_metrics, ContractionHierarchy, hierarchy_for
+from graph import romania
+from synthetic_graphs import geometric_graph, grid_graph
+from uninformed_search import UCS_with_metrics
+
+
+def _cost(graph, path):
+    index = graph.index
+    return sum(graph.weight(index[a], index[b]) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("graph", [romania, geometric_graph(400, seed=2), grid_graph(12, 12)],
+                         ids=["romania", "geometric", "grid"])
+def test_queries_match_ucs(graph):
+    ch = ContractionHierarchy.build(graph)
+    rng = random.Random(0)
+    for _ in range(20):
+        start, goal = rng.choice(graph.names), rng.choice(graph.names)
+        res = CH_with_metrics(start, goal, ch=ch)
+        expected = UCS_with_metrics(start, goal, graph=graph)["goal_node"].path_cost
+        assert res["path_cost"] == expected
+        path = res["path"]
+        assert path[0] == start and path[-1] == goal
+        assert _cost(graph, path) == expected
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load(tmp_path, use_mmap):
+    graph = geometric_graph(300, seed=4)
+    path = tmp_path / "g.ch"
+    built = ContractionHierarchy.build(graph)
+    built.save(path)
+    loaded = ContractionHierarchy.load(path, graph, use_mmap=use_mmap)
+    assert loaded.num_shortcuts == built.num_shortcuts
+    start, goal = graph.names[0], graph.names[-1]
+    assert (CH_with_metrics(start, goal, ch=loaded)["path"]
+            == CH_with_metrics(start, goal, ch=built)["path"])
+
+
+def test_load_rejects_another_graph(tmp_path):
+    path = tmp_path / "g.ch"
+    ContractionHierarchy.build(geometric_graph(200, seed=1)).save(path)
+    with pytest.raises(ValueError, match="different graph"):
+        ContractionHierarchy.load(path, geometric_graph(200, seed=2))
+
+
+def test_edits_rebuild_the_cached_hierarchy():
+    graph = grid_graph(6, 6)
+    ch = hierarchy_for(graph)
+    assert hierarchy_for(graph) is ch
+    graph.set_weight(0, 1, 50)
+    with pytest.raises(ValueError, match="older"):
+        CH_with_metrics(graph.names[0], graph.names[1], ch=ch)
+    res = CH_with_metrics(graph.names[0], graph.names[1], graph=graph)
+    assert res["path_cost"] == 3 and hierarchy_for(graph) is not ch
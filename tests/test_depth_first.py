@@ -0,0 +1,52 @@
+# tests/test_depth_first.py
+# DLS, IDS and backtracking on the explicit stack: limits, outcomes, and
+# paths far deeper than Python's recursion limit.
+#   python -m pytest tests
+
+import sys
+
+from graph import Graph
+from uninformed_search import (
+    Backtracking_with_metrics, BFS_with_metrics, DLS_with_metrics, IDS_with_metrics,
+    extract_path,
+)
+
+
+def _chain(n):
+    return Graph.from_edge_list([str(i) for i in range(n)],
+                                [(i, i + 1, 1) for i in range(n - 1)])
+
+
+def test_dls_outcomes():
+    res = DLS_with_metrics("Arad", "Bucharest", 2)
+    assert res["goal_node"] is None and res["outcome"] == "CUTOFF"
+    res = DLS_with_metrics("Arad", "Bucharest", 3)
+    assert res["outcome"] == "FOUND" and res["goal_node"].depth <= 3
+    chain = _chain(4)
+    assert DLS_with_metrics("0", "3", 10, graph=chain)["outcome"] == "FOUND"
+    two = Graph.from_edge_list(["a", "b", "c"], [(0, 1, 1)])
+    assert DLS_with_metrics("a", "c", 10, graph=two)["outcome"] == "FAIL"
+
+
+def test_ids_finds_the_shallowest_goal():
+    bfs = BFS_with_metrics("Arad", "Bucharest")
+    res = IDS_with_metrics("Arad", "Bucharest")
+    assert res["found_limit"] == bfs["goal_node"].depth == 3
+    assert res["iterations"] == 4
+    assert extract_path(res["goal_node"])[-1] == "Bucharest"
+
+
+def test_ids_stops_once_nothing_is_cut_off():
+    two = Graph.from_edge_list(["a", "b", "c"], [(0, 1, 1)])
+    res = IDS_with_metrics("a", "c", max_limit=50, graph=two)
+    assert res["goal_node"] is None and res["iterations"] == 3
+
+
+def test_no_recursion_limit():
+    n = sys.getrecursionlimit() * 3
+    chain = _chain(n)
+    for res in (DLS_with_metrics("0", str(n - 1), n, graph=chain),
+                Backtracking_with_metrics("0", str(n - 1), graph=chain),
+                IDS_with_metrics("0", str(n - 1), max_limit=n, graph=chain)):
+        assert res["goal_node"].depth == n - 1
+        assert res["goal_node"].path_cost == n - 1
@@ -0,0 +1,39 @@
+# tests/test_frontier.py
+# FIFO / LIFO frontiers keep their state set in step with the node queue.
+#   python -m pytest tests
+
+from frontier import FIFOFrontier, LIFOFrontier
+from graph import romania
+from uninformed_search import NodeStore
+
+
+def _store(states):
+    store = NodeStore(romania)
+    return store, [store.add(s) for s in states]
+
+
+def test_fifo_order_and_membership():
+    store, nodes = _store([5, 7, 9])
+    frontier = FIFOFrontier(store, nodes)
+    assert len(frontier) == 3 and 7 in frontier
+    assert store.state[frontier.pop()] == 5
+    assert 5 not in frontier and 9 in frontier
+    frontier.append(store.add(4))
+    assert [store.state[frontier.pop()] for _ in range(3)] == [7, 9, 4]
+    assert not frontier and 4 not in frontier
+
+
+def test_lifo_order_and_membership():
+    store, nodes = _store([5, 7, 9])
+    frontier = LIFOFrontier(store, nodes)
+    assert store.state[frontier.pop()] == 9
+    assert 9 not in frontier and 5 in frontier
+    frontier.append(store.add(2))
+    assert [store.state[frontier.pop()] for _ in range(3)] == [2, 7, 5]
+    assert not frontier
+
+
+def test_iteration_yields_queued_nodes():
+    store, nodes = _store([1, 2, 3])
+    assert list(FIFOFrontier(store, nodes)) == nodes
+    assert list(LIFOFrontier(store, nodes)) == nodes
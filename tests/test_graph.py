@@ -0,0 +1,125 @@
+# tests/test_graph.py
+# The CSR graph core: interning, adjacency and weights, and the binary
+# file workers map (Graph.save / Graph.load).
+#   python -m pytest tests
+
+import pytest
+
+from graph import Graph, romania
+from romania_problem import distances, neighbors
+
+
+def _triangle():
+    # a -1- b -2- c, a -4- c
+    return Graph.from_edge_list(["a", "b", "c"], [(0, 1, 1), (1, 2, 2), (0, 2, 4)])
+
+
+def _arcs(graph, u):
+    return sorted((graph.targets[e], graph.weights[e])
+                  for e in range(graph.offsets[u], graph.offsets[u + 1]))
+
+
+def test_from_edge_list_stores_both_arcs():
+    graph = _triangle()
+    assert len(graph) == 3 and graph.num_edges == 6
+    assert _arcs(graph, 0) == [(1, 1), (2, 4)]
+    assert _arcs(graph, 2) == [(0, 4), (1, 2)]
+    assert [graph.degree(u) for u in range(3)] == [2, 2, 2]
+
+
+def test_names_and_ids():
+    graph = _triangle()
+    assert graph.id_of("c") == 2 and graph.name_of(1) == "b"
+    assert graph.index == {"a": 0, "b": 1, "c": 2}
+
+
+def test_romania_matches_the_problem_dicts():
+    index = romania.index
+    assert set(romania.names) >= set(neighbors)
+    for city, adjacent in neighbors.items():
+        u = index[city]
+        expected = sorted((index[v], distances.get((city, v), distances.get((v, city))))
+                          for v in adjacent)
+        assert _arcs(romania, u) == expected
+
+
+def test_weight_lookup():
+    graph = _triangle()
+    assert graph.weight(0, 2) == 4 and graph.weight(2, 0) == 4
+    assert graph.weight(0, 0) is None
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, use_mmap):
+    path = tmp_path / "romania.csr"
+    romania.save(path)
+    loaded = Graph.load(path, use_mmap=use_mmap)
+    assert list(loaded.names) == romania.names
+    assert list(loaded.offsets) == list(romania.offsets)
+    assert list(loaded.targets) == list(romania.targets)
+    assert list(loaded.weights) == list(romania.weights)
+    assert list(loaded.coords) == [tuple(map(float, c)) for c in romania.coords]
+    assert loaded.fingerprint() == romania.fingerprint()
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not.csr"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        Graph.load(path)
+
+
+@pytest.mark.parametrize("typecode", ["q", "d"])
+def test_merged_edges_follow_the_csr(typecode):
+    edges = [(0, 1, 1), (1, 2, 2), (0, 2, 4)]
+    if typecode == "d":
+        edges = [(u, v, w + 0.5) for u, v, w in edges]
+    graph = Graph.from_edge_list(["a", "b", "c"], edges, typecode=typecode)
+    assert list(graph.edges[0::2]) == list(graph.targets)
+    assert list(graph.edges[1::2]) == list(graph.weights)
+    for u in range(len(graph)):
+        assert sorted(graph.neighbors(u)) == _arcs(graph, u)
+
+
+def test_edits_update_every_view():
+    graph = _triangle()
+    graph.edges    # built, so the edits must keep it in step
+    graph.columns["landmark:0"] = [0.0, 1.0, 3.0]
+    fingerprint = graph.fingerprint()
+
+    graph.set_weight(0, 1, 5)
+    assert graph.weight(0, 1) == graph.weight(1, 0) == 5
+    assert graph.version == 1 and graph.columns == {}
+    assert graph.fingerprint() != fingerprint
+
+    graph.add_edge(1, 1, 2)
+    graph.add_edge(0, 1, 6)    # existing: a new weight
+    assert graph.weight(1, 1) == 2 and graph.weight(1, 0) == 6
+    graph.remove_edge(0, 2)
+    assert graph.weight(0, 2) is None and graph.weight(2, 0) is None
+    assert graph.version == 4 and graph.num_edges == 5
+    with pytest.raises(KeyError):
+        graph.remove_edge(0, 2)
+    with pytest.raises(KeyError):
+        graph.set_weight(0, 2, 1)
+
+    assert [_arcs(graph, u) for u in range(3)] == [[(1, 6)], [(0, 6), (1, 2), (2, 2)], [(1, 2)]]
+    assert list(graph.edges[0::2]) == list(graph.targets)
+    assert list(graph.edges[1::2]) == list(graph.weights)
+
+
+def test_fractional_weight_turns_the_weights_to_floats():
+    graph = _triangle()
+    graph.edges
+    graph.set_weight(0, 1, 1.5)
+    assert graph.weights.typecode == "d"
+    assert sorted(graph.neighbors(0)) == [(1, 1.5), (2, 4.0)]
+
+
+def test_loaded_graph_copies_on_edit(tmp_path):
+    path = str(tmp_path / "t.csr")
+    _triangle().save(path)
+    graph = Graph.load(path)
+    graph.set_weight(0, 1, 7)
+    assert graph.weight(1, 0) == 7
+    assert Graph.load(path).weight(0, 1) == 1
@@ -0,0 +1,103 @@
+# tests/test_graph_io.py
+# The DIMACS and CSV loaders, open_graph's dispatch, and landmark tables
+# stored with a saved graph.
+#   python -m pytest tests
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from graph_io import open_graph, read_csv, read_dimacs
+from lower_bounds import LandmarkHeuristic, dijkstra_distances
+
+pytest.importorskip("numpy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GR = """c 1 -3- 2 -4- 3, 1 -10- 3 (both directions), 4 alone
+p sp 4 6
+a 1 2 3
+a 2 1 3
+a 2 3 4
+a 3 2 4
+a 1 3 10
+a 3 1 10
+"""
+
+CO = """p aux sp co 4
+v 1 0 0
+v 2 3 0
+v 3 3 4
+v 4 9 9
+"""
+
+
+def _neighbors(graph, name):
+    index = graph.index
+    return sorted((graph.names[v], w) for v, w in graph.neighbors(index[name]))
+
+
+def test_read_dimacs(tmp_path):
+    (tmp_path / "m.gr").write_text(GR)
+    (tmp_path / "m.co").write_text(CO)
+    graph = read_dimacs(str(tmp_path / "m.gr"), str(tmp_path / "m.co"))
+    assert graph.names == ["1", "2", "3", "4"] and graph.num_edges == 6
+    assert _neighbors(graph, "1") == [("2", 3), ("3", 10)]
+    assert _neighbors(graph, "4") == []
+    assert graph.weights.typecode == "q"
+    assert tuple(graph.coords[2]) == (3.0, 4.0)
+    assert list(dijkstra_distances(graph, 0))[:3] == [0, 3, 7]
+
+
+def test_read_dimacs_rejects_bad_files(tmp_path):
+    (tmp_path / "none.gr").write_text("a 1 2 3\n")
+    with pytest.raises(ValueError):
+        read_dimacs(str(tmp_path / "none.gr"))
+    (tmp_path / "range.gr").write_text("p sp 2 1\na 1 3 1\n")
+    with pytest.raises(ValueError):
+        read_dimacs(str(tmp_path / "range.gr"))
+
+
+def test_read_csv(tmp_path):
+    (tmp_path / "e.csv").write_text("source,target,weight\n# note\nx,y,1.5\ny,z,2\n")
+    (tmp_path / "p.csv").write_text("name,x,y\nx,0,0\nz,1,1\n")
+    graph = read_csv(str(tmp_path / "e.csv"), str(tmp_path / "p.csv"))
+    assert graph.names == ["x", "y", "z"] and graph.num_edges == 4
+    assert _neighbors(graph, "y") == [("x", 1.5), ("z", 2)]
+    assert tuple(graph.coords[2]) == (1.0, 1.0)
+    directed = read_csv(str(tmp_path / "e.csv"), directed=True)
+    assert _neighbors(directed, "y") == [("z", 2)]
+
+
+def test_open_graph_dispatch(tmp_path):
+    (tmp_path / "m.gr").write_text(GR)
+    (tmp_path / "m.co").write_text(CO)
+    (tmp_path / "e.csv").write_text("x,y,1\n")
+    dimacs = open_graph(str(tmp_path / "m.gr"))
+    assert dimacs.coords is not None
+    assert open_graph(str(tmp_path / "e.csv")).names == ["x", "y"]
+    dimacs.save(str(tmp_path / "m.csr"))
+    loaded = open_graph(str(tmp_path / "m.csr"))
+    assert loaded.fingerprint() == dimacs.fingerprint()
+
+
+def test_landmark_columns_survive_save(tmp_path):
+    (tmp_path / "m.gr").write_text(GR)
+    graph = read_dimacs(str(tmp_path / "m.gr"))
+    lm = LandmarkHeuristic(graph, 2)
+    graph.columns.update(lm.columns())
+    graph.save(str(tmp_path / "m.csr"))
+    stored = LandmarkHeuristic.from_columns(open_graph(str(tmp_path / "m.csr")))
+    assert sorted(stored.landmarks) == sorted(lm.landmarks)
+    for s in range(len(graph)):
+        for g in range(len(graph)):
+            assert stored.lower_bound(s, g) == lm.lower_bound(s, g)
+
+
+def test_batch_does_not_import_numpy():
+    code = "import sys, batch; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
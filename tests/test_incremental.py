@@ -0,0 +1,73 @@
+# tests/test_incremental.py
+# LPA* repairs give the costs of a fresh search after every edit.
+#   python -m pytest tests
+
+import random
+
+from incremental import LPAStar
+from synthetic_graphs import grid_graph
+from uninformed_search import UCS_with_metrics
+
+
+def _ucs_cost(graph, start, goal):
+    node = UCS_with_metrics(start, goal, graph=graph)["goal_node"]
+    return node.path_cost if node else None
+
+
+def _path_cost(graph, path):
+    index = graph.index
+    return sum(graph.weight(index[a], index[b]) for a, b in zip(path, path[1:]))
+
+
+def _edges(graph):
+    return [(u, v) for u in range(len(graph)) for v, _ in graph.neighbors(u) if u < v]
+
+
+def test_first_compute_is_a_search():
+    graph = grid_graph(10, 10)
+    planner = LPAStar(graph.names[0], graph.names[-1], graph=graph)
+    res = planner.compute()
+    assert res["path_cost"] == 18 and res["nodes_reexpanded"] == 0
+    assert res["path"][0] == graph.names[0] and res["path"][-1] == graph.names[-1]
+    assert _path_cost(graph, res["path"]) == 18
+    assert planner.compute()["nodes_expanded"] == 0
+
+
+def test_repairs_match_a_fresh_search():
+    rng = random.Random(4)
+    graph = grid_graph(12, 12)
+    start, goal = graph.names[0], graph.names[-1]
+    planner = LPAStar(start, goal, graph=graph, heuristic="zero")
+    planner.compute()
+    for step in range(30):
+        u, v = rng.choice(_edges(graph))
+        if step % 5 == 4:
+            graph.remove_edge(u, v)
+        else:
+            graph.set_weight(u, v, rng.randint(1, 9))
+        res = planner.compute()
+        assert res.get("path_cost") == _ucs_cost(graph, start, goal)
+        assert _path_cost(graph, res["path"]) == res["path_cost"]
+
+
+def test_raised_weights_keep_the_default_heuristic_admissible():
+    graph = grid_graph(12, 12)
+    start, goal = graph.names[0], graph.names[-1]
+    planner = LPAStar(start, goal, graph=graph)
+    planner.compute()
+    for u, v in _edges(graph)[::7]:
+        graph.set_weight(u, v, 5)
+        res = planner.compute(compare=True)
+        assert res["path_cost"] == _ucs_cost(graph, start, goal)
+        assert "recompute_expanded" in res
+
+
+def test_goal_cut_off():
+    graph = grid_graph(1, 4)
+    planner = LPAStar(graph.names[0], graph.names[-1], graph=graph)
+    assert planner.compute()["path_cost"] == 3
+    graph.remove_edge(1, 2)
+    res = planner.compute()
+    assert res["goal_node"] is None and "path" not in res
+    graph.add_edge(1, 2, 4)
+    assert planner.compute()["path_cost"] == 6
@@ -0,0 +1,35 @@
+# tests/test_informed_search.py
+# Every informed search must report failure (goal_node None) when the goal
+# lies in another component, instead of searching forever. Run from the
+# repository root:
+#   python -m pytest tests
+
+import pytest
+
+from graph import Graph
+from informed_search import (AStar_Search, Beam_Search, Greedy_Search,
+                             IDAStar_Search, RBFS_Search, SMAStar_Search)
+
+SEARCHES = [Greedy_Search, AStar_Search, IDAStar_Search, RBFS_Search,
+            SMAStar_Search, Beam_Search]
+
+
+def _two_components():
+    # a - b - c   d - e
+    names = ["a", "b", "c", "d", "e"]
+    edges = [(0, 1, 2), (1, 2, 3), (3, 4, 1)]
+    coords = [(0, 0), (2, 0), (5, 0), (10, 10), (11, 10)]
+    return Graph.from_edge_list(names, edges, coords)
+
+
+@pytest.mark.parametrize("search", SEARCHES, ids=lambda fn: fn.__name__)
+@pytest.mark.parametrize("heuristic", ["euclidean", "zero"])
+def test_unreachable_goal(search, heuristic):
+    res = search("a", "e", graph=_two_components(), heuristic=heuristic)
+    assert res["goal_node"] is None
+
+
+@pytest.mark.parametrize("search", SEARCHES, ids=lambda fn: fn.__name__)
+def test_reachable_goal(search):
+    res = search("a", "c", graph=_two_components(), heuristic="euclidean")
+    assert res["goal_node"].path_cost == 5
@@ -0,0 +1,39 @@
+# tests/test_instrumentation.py
+# What each instrumentation level reports, and that it never changes the
+# search result.
+#   python -m pytest tests
+
+import pytest
+
+from informed_search import AStar_Search
+from instrumentation import COUNTERS, MEMORY, OFF, measure
+from uninformed_search import UCS_with_metrics
+
+
+@pytest.mark.parametrize("search", [UCS_with_metrics, AStar_Search])
+def test_levels_report_time_and_memory(search):
+    off = search("Arad", "Bucharest", instrument=OFF)
+    counters = search("Arad", "Bucharest", instrument=COUNTERS)
+    memory = search("Arad", "Bucharest", instrument=MEMORY)
+    assert off["time"] is None and off["peak_memory"] is None
+    assert counters["time"] >= 0 and counters["peak_memory"] is None
+    assert memory["time"] >= 0 and memory["peak_memory"] > 0
+    for res in (counters, memory):
+        assert res["nodes_expanded"] == off["nodes_expanded"]
+        assert res["goal_node"].path_cost == off["goal_node"].path_cost == 418
+
+
+def test_memory_level_runs_the_search_twice():
+    calls = []
+
+    def run(trace):
+        calls.append(trace)
+        return {}
+
+    measure(run, MEMORY)
+    assert len(calls) == 2
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        measure(lambda t: {}, "verbose")
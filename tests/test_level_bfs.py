@@ -0,0 +1,62 @@
+# tests/test_level_bfs.py
+# The NumPy level-at-a-time BFS gives the Python BFS's results and trace
+# events, and bfs_distances its hop counts.
+#   python -m pytest tests
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from level_bfs import bfs_distances
+from search_trace import EventTrace
+from synthetic_graphs import FAMILIES
+from uninformed_search import BFS_with_metrics, extract_path
+
+GRAPHS = {family: make(400, seed=2) for family, make in FAMILIES.items()}
+
+
+def _run(graph, start, goal, engine, goal_on_generate=False):
+    trace = EventTrace()
+    res = BFS_with_metrics(start, goal, graph=graph, engine=engine,
+                           goal_on_generate=goal_on_generate, trace=trace)
+    path = extract_path(res["goal_node"], graph) if res["goal_node"] else None
+    return path, res["nodes_expanded"], res["nodes_generated"], list(res["events"])
+
+
+@pytest.mark.parametrize("family", list(GRAPHS))
+@pytest.mark.parametrize("goal_on_generate", [False, True])
+def test_numpy_engine_matches_python(family, goal_on_generate):
+    graph = GRAPHS[family]
+    rng = random.Random(5)
+    for _ in range(10):
+        start, goal = rng.choice(graph.names), rng.choice(graph.names)
+        assert _run(graph, start, goal, "numpy", goal_on_generate) == \
+            _run(graph, start, goal, "python", goal_on_generate)
+
+
+@pytest.mark.parametrize("family", list(GRAPHS))
+def test_multi_start(family):
+    graph = GRAPHS[family]
+    rng = random.Random(6)
+    for _ in range(5):
+        starts = rng.sample(graph.names, 3)
+        goal = rng.choice(graph.names)
+        assert _run(graph, starts, goal, "numpy") == _run(graph, starts, goal, "python")
+
+
+@pytest.mark.parametrize("family", list(GRAPHS))
+def test_bfs_distances(family):
+    graph = GRAPHS[family]
+    sources = [0, len(graph) // 2]
+    dist = bfs_distances(graph, sources)
+    for goal in range(0, len(graph), 37):
+        node = BFS_with_metrics([graph.names[s] for s in sources], graph.names[goal],
+                                graph=graph)["goal_node"]
+        assert dist[goal] == (node.depth if node else -1)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        BFS_with_metrics("Arad", "Bucharest", engine="gpu")
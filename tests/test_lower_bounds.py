@@ -0,0 +1,73 @@
+# tests/test_lower_bounds.py
+# Landmark and Euclidean bounds never exceed the true distance, and every
+# component of a disconnected map gets landmarks.
+#   python -m pytest tests
+
+import pytest
+
+from graph import Graph, romania
+from lower_bounds import (
+    INF, EuclideanHeuristic, LandmarkHeuristic, dijkstra_distances, euclidean_for,
+    heuristic_for, select_landmarks,
+)
+from synthetic_graphs import geometric_graph, grid_graph
+
+
+def _two_grids(side):
+    # Two copies of a side x side grid with no edge between them
+    grid = grid_graph(side, side)
+    n = len(grid)
+    edges = []
+    for u in range(n):
+        for e in range(grid.offsets[u], grid.offsets[u + 1]):
+            v = grid.targets[e]
+            if u < v:
+                edges += [(u, v, grid.weights[e]), (u + n, v + n, grid.weights[e])]
+    return Graph.from_edge_list([str(i) for i in range(2 * n)], edges)
+
+
+@pytest.mark.parametrize("kind", ["landmark", "euclidean"])
+def test_bounds_are_admissible(kind):
+    graph = geometric_graph(500, seed=3)
+    for goal in (0, 123, 499):
+        h = heuristic_for(graph, goal, kind)
+        dist = dijkstra_distances(graph, goal)
+        assert all(h(s) <= dist[s] + 1e-9 for s in range(len(graph)) if dist[s] < INF)
+
+
+def test_romania_landmark_bound_is_consistent():
+    h = LandmarkHeuristic(romania).for_goal(romania.index["Bucharest"])
+    for u in range(len(romania)):
+        for e in range(romania.offsets[u], romania.offsets[u + 1]):
+            assert h(u) <= romania.weights[e] + h(romania.targets[e]) + 1e-9
+
+
+def test_every_component_gets_a_landmark():
+    graph = _two_grids(10)
+    n = len(graph) // 2
+    landmarks, _ = select_landmarks(graph, 4)
+    assert any(s < n for s in landmarks) and any(s >= n for s in landmarks)
+    h = LandmarkHeuristic(graph, 4).for_goal(2 * n - 1)
+    assert h(n) == dijkstra_distances(graph, n)[2 * n - 1]
+    assert h(0) == INF
+
+
+def test_connected_maps_keep_farthest_point_order():
+    # The first landmark is the state farthest from state 0
+    graph = grid_graph(8, 8)
+    landmarks, _ = select_landmarks(graph, 2)
+    assert landmarks == [63, 0]
+
+
+def test_euclidean_scale_is_cached_per_version():
+    graph = geometric_graph(200, seed=1)
+    h = euclidean_for(graph)
+    assert euclidean_for(graph) is h
+    graph.set_weight(0, graph.targets[graph.offsets[0]], 1e-6)
+    assert euclidean_for(graph) is not h
+
+
+def test_missing_coordinates_are_reported():
+    graph = Graph.from_edge_list(["a", "b"], [(0, 1, 1)], coords=[(0, 0), None])
+    with pytest.raises(ValueError, match="'b'"):
+        EuclideanHeuristic(graph)
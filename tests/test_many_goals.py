@@ -0,0 +1,85 @@
+# tests/test_many_goals.py
+# One-to-many searches settle each goal at the cost (or hop count) of its
+# own single-goal search, nearest first.
+#   python -m pytest tests
+
+import random
+
+import pytest
+
+from informed_search import AStar_Many_Search
+from synthetic_graphs import geometric_graph, random_graph
+from uninformed_search import (
+    BFS_many_with_metrics, BFS_with_metrics, UCS_many_with_metrics, UCS_with_metrics,
+)
+
+GRAPHS = {
+    "geometric": geometric_graph(400, seed=8),
+    "random": random_graph(300, 4, seed=8),
+}
+
+WEIGHTED = {
+    "UCS": UCS_many_with_metrics,
+    "A*": AStar_Many_Search,
+    "A* (euclidean)": lambda s, gs, graph, **kw: AStar_Many_Search(
+        s, gs, graph=graph, heuristic="euclidean", **kw),
+}
+
+
+def _cost(graph, path):
+    index = graph.index
+    return sum(graph.weight(index[a], index[b]) for a, b in zip(path, path[1:]))
+
+
+def _case(graph, seed):
+    rng = random.Random(seed)
+    return rng.choice(graph.names), rng.sample(graph.names, 12)
+
+
+@pytest.mark.parametrize("name", list(WEIGHTED))
+def test_costs_match_single_goal_ucs(name):
+    graph = GRAPHS["geometric"]
+    start, goals = _case(graph, 1)
+    res = WEIGHTED[name](start, goals, graph=graph)
+    assert set(res["paths"]) == set(goals)
+    for goal in goals:
+        expected = UCS_with_metrics(start, goal, graph=graph)["goal_node"].path_cost
+        assert res["path_costs"][goal] == pytest.approx(expected)
+        assert res["paths"][goal][0] == start and res["paths"][goal][-1] == goal
+        assert _cost(graph, res["paths"][goal]) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("name", ["UCS", "A*"])
+def test_k_nearest_and_reverse(name):
+    graph = GRAPHS["random"]
+    start, goals = _case(graph, 2)
+    full = WEIGHTED[name](start, goals, graph=graph)
+    nearest = WEIGHTED[name](start, goals, graph=graph, k=4, reverse=True)
+    costs = sorted(full["path_costs"].values())
+    assert list(nearest["path_costs"].values()) == costs[:4]
+    for goal, path in nearest["paths"].items():
+        assert path == full["paths"][goal][::-1]
+    assert nearest["nodes_expanded"] <= full["nodes_expanded"]
+
+
+def test_bfs_many_matches_single_goal_bfs():
+    graph = GRAPHS["random"]
+    start, goals = _case(graph, 3)
+    res = BFS_many_with_metrics(start, goals, graph=graph)
+    for goal in goals:
+        depth = BFS_with_metrics(start, goal, graph=graph)["goal_node"].depth
+        assert len(res["paths"][goal]) == depth + 1
+
+
+@pytest.mark.parametrize("search", [BFS_many_with_metrics, UCS_many_with_metrics,
+                                    AStar_Many_Search])
+def test_no_goals(search):
+    res = search("Arad", [])
+    assert res["paths"] == {} and res["path_costs"] == {}
+    assert res["nodes_expanded"] == 0
+
+
+def test_start_among_goals():
+    res = UCS_many_with_metrics("Arad", ["Arad", "Bucharest"])
+    assert res["path_costs"] == {"Arad": 0, "Bucharest": 418}
+    assert res["paths"]["Arad"] == ["Arad"]
@@ -0,0 +1,38 @@
+# tests/test_parallel.py
+# Batch queries over worker processes give the in-process answers.
+#   python -m pytest tests
+
+from batch import answer
+from parallel import run_parallel
+from synthetic_graphs import grid_graph
+
+ALGORITHMS = ["BFS", "UCS", "A*", "Bidirectional UCS"]
+
+
+def _queries(graph, count):
+    names = graph.names
+    return [(i + 1, {"start": names[i * 7 % len(names)], "goal": names[-1 - i],
+                     "algorithm": ALGORITHMS[i % len(ALGORITHMS)]})
+            for i in range(count)]
+
+
+def _strip(result):
+    return {k: v for k, v in result.items() if k != "time"}
+
+
+def test_workers_match_in_process_answers():
+    graph = grid_graph(15, 15)
+    queries = _queries(graph, 40)
+    serial = [_strip(answer(lineno, q, graph)) for lineno, q in queries]
+    ordered = [_strip(r) for r in run_parallel(queries, graph, workers=2, chunksize=3)]
+    assert ordered == serial
+
+
+def test_unordered_results_cover_every_query(tmp_path):
+    graph = grid_graph(10, 10)
+    path = tmp_path / "grid.csr"
+    graph.save(path)
+    queries = _queries(graph, 25)
+    results = list(run_parallel(queries, str(path), workers=2, ordered=False, chunksize=4))
+    assert sorted(r["line"] for r in results) == list(range(1, 26))
+    assert all(r["found"] for r in results)
@@ -0,0 +1,83 @@
+# tests/test_playback.py
+# Playback frames against a plain replay of the recorded events, seeking
+# forwards and backwards across snapshots.
+#   python -m pytest tests
+
+import random
+
+import numpy as np
+
+from playback import CURRENT, EXPLORED, FRONTIER, UNSEEN, Playback
+from search_trace import EventTrace
+from synthetic_graphs import grid_graph
+from uninformed_search import BFS_with_metrics
+
+
+def _record(side=12):
+    graph = grid_graph(side, side)
+    res = BFS_with_metrics(graph.names[0], graph.names[-1], graph=graph, trace=EventTrace())
+    return graph, res
+
+
+def _replay(events, num_states, frame):
+    # Status of every state after `frame` expansions, one event at a time
+    status = [UNSEEN] * num_states
+    expansions = 0
+    current = None
+    for r in events:
+        state = r >> 1
+        if not r & 1:
+            if expansions == frame:
+                break
+            expansions += 1
+            status[state] = EXPLORED
+            current = state
+        elif status[state] == UNSEEN:
+            status[state] = FRONTIER
+    if current is not None:
+        status[current] = CURRENT
+    return status
+
+
+def _frame(playback, num_states):
+    touched, codes = playback.frame_states()
+    status = np.zeros(num_states, dtype=np.uint8)
+    status[touched] = codes
+    return status.tolist()
+
+
+def test_frames_match_a_plain_replay():
+    graph, res = _record()
+    playback = Playback(res["events"], len(graph))
+    playback.CHECKPOINT = 16
+    assert playback.num_frames == len(res["expanded_list"])
+    frames = list(range(playback.num_frames + 1))
+    random.Random(1).shuffle(frames)
+    for frame in frames:
+        playback.seek(frame)
+        assert _frame(playback, len(graph)) == _replay(res["events"], len(graph), frame)
+
+
+def test_current_state_is_the_last_expansion():
+    graph, res = _record()
+    playback = Playback(res["events"], len(graph))
+    assert playback.current_state() is None
+    playback.seek(3)
+    assert graph.names[playback.current_state()] == res["expanded_list"][2]
+    playback.seek(10 ** 9)
+    assert graph.names[playback.current_state()] == graph.names[-1]
+
+
+def test_empty_recording():
+    playback = Playback(EventTrace().events, 4)
+    assert playback.num_frames == 0
+    touched, codes = playback.seek(5)
+    assert len(touched) == 0 and len(codes) == 0
+
+
+def test_name_lists_are_decoded_on_first_read():
+    graph, res = _record()
+    names = res["expanded_list"]
+    assert names._decoded is None
+    assert names[0] == graph.names[0] and len(names) == res["nodes_expanded"] + 1
+    assert names._decoded is not None
@@ -0,0 +1,69 @@
+# tests/test_priority_queue.py
+# BinaryHeap and PairingHeap: pop order, FIFO ties and decrease-key.
+#   python -m pytest tests
+
+import random
+
+import pytest
+
+from priority_queue import BinaryHeap, PairingHeap
+
+HEAPS = [BinaryHeap, PairingHeap]
+
+
+def _drain(heap):
+    out = []
+    while heap:
+        out.append(heap.pop())
+    return out
+
+
+@pytest.mark.parametrize("queue", HEAPS)
+def test_pops_in_priority_order_with_fifo_ties(queue):
+    heap = queue()
+    for item, priority in [("a", 3), ("b", 1), ("c", 3), ("d", 2), ("e", 1)]:
+        heap.push(item, priority)
+    assert heap.peek() == ("b", 1)
+    assert _drain(heap) == [("b", 1), ("e", 1), ("d", 2), ("a", 3), ("c", 3)]
+
+
+@pytest.mark.parametrize("queue", HEAPS)
+def test_decrease_key(queue):
+    heap = queue()
+    for item, priority in [("a", 5), ("b", 6), ("c", 7)]:
+        heap.push(item, priority)
+    assert heap.decrease_key("c", 1)
+    assert not heap.decrease_key("a", 9)     # never raises a key
+    assert heap.priority("a") == 5
+    assert heap.push_or_decrease("b", 2) and heap.push_or_decrease("d", 4)
+    assert len(heap) == 4 and "d" in heap
+    assert _drain(heap) == [("c", 1), ("b", 2), ("d", 4), ("a", 5)]
+    assert heap.decreases == 2
+
+
+@pytest.mark.parametrize("queue", HEAPS)
+def test_random_operations_match_a_sorted_model(queue):
+    rng = random.Random(7)
+    heap = queue()
+    model = {}
+    for _ in range(2000):
+        item = rng.randrange(200)
+        priority = rng.randrange(1000)
+        if heap.push_or_decrease(item, priority):
+            model[item] = min(priority, model.get(item, priority))
+        if rng.random() < 0.3 and heap:
+            item, priority = heap.pop()
+            assert priority == min(model.values())
+            assert model.pop(item) == priority
+    assert sorted(p for _, p in _drain(heap)) == sorted(model.values())
+
+
+def test_binary_heap_update_and_remove():
+    heap = BinaryHeap()
+    for item, priority in [("a", 1), ("b", 2), ("c", 3), ("d", 4)]:
+        heap.push(item, priority)
+    heap.update("a", 10)    # raise
+    heap.update("d", 0)     # lower
+    heap.remove("b")
+    assert "b" not in heap
+    assert _drain(heap) == [("d", 0), ("c", 3), ("a", 10)]
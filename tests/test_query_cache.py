@@ -0,0 +1,60 @@
+# tests/test_query_cache.py
+# LRU behaviour, persistence and graph-content keys of QueryCache.
+#   python -m pytest tests
+
+from graph import Graph, romania
+from query_cache import QueryCache
+
+
+def _line():
+    return Graph.from_edge_list(["a", "b", "c"], [(0, 1, 1), (1, 2, 1)])
+
+
+def test_lru_eviction_and_stats():
+    cache = QueryCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1      # "b" is now least recently used
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 1, 1, 2)
+
+
+def test_get_or_compute_computes_once():
+    cache = QueryCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("k", lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+
+
+def test_keys_follow_graph_content():
+    a, b = _line(), _line()
+    assert QueryCache.key(a, "A*", "a", "c") == QueryCache.key(b, "A*", "a", "c")
+    assert QueryCache.key(a, "A*", "a", "c") != QueryCache.key(romania, "A*", "a", "c")
+    before = QueryCache.key(a, "A*", "a", "c", 5)
+    a.set_weight(0, 1, 7)
+    assert QueryCache.key(a, "A*", "a", "c", 5) != before
+
+
+def test_edited_graph_misses_old_results():
+    graph = _line()
+    cache = QueryCache()
+    cache.put(QueryCache.key(graph, "UCS", "a", "c"), {"cost": 2})
+    graph.set_weight(1, 2, 10)
+    assert cache.get(QueryCache.key(graph, "UCS", "a", "c")) is None
+
+
+def test_save_and_load_keep_lru_order(tmp_path):
+    path = tmp_path / "cache.pkl"
+    cache = QueryCache(3, path)
+    for key in "abc":
+        cache.put(key, key.upper())
+    cache.get("a")
+    cache.save()
+    warm = QueryCache(3, path)
+    assert len(warm) == 3 and warm.get("b") == "B"
+    warm.put("d", "D")    # evicts "c", the least recently used after "b"'s hit
+    assert "c" not in warm and "a" in warm
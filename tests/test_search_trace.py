@@ -0,0 +1,70 @@
+# tests/test_search_trace.py
+# Trace sinks record the same events, and ProgressTrace enforces budgets.
+#   python -m pytest tests
+
+import pytest
+
+from graph import romania
+from instrumentation import MEMORY
+from search_trace import (
+    EXPAND, GENERATE, CallbackTrace, EventTrace, FileTrace, ListTrace, ProgressTrace,
+    SearchAborted, read_trace,
+)
+from synthetic_graphs import grid_graph
+from uninformed_search import BFS_with_metrics, UCS_with_metrics
+
+
+def test_untraced_runs_keep_no_lists():
+    res = BFS_with_metrics("Arad", "Bucharest")
+    assert "expanded_list" not in res
+
+
+def test_list_and_event_traces_agree():
+    listed = UCS_with_metrics("Arad", "Bucharest", trace=ListTrace())
+    recorded = UCS_with_metrics("Arad", "Bucharest", trace=EventTrace())
+    assert listed["expanded_list"][0] == "Arad"
+    assert recorded["expanded_list"] == listed["expanded_list"]
+    assert recorded["generated_list"] == listed["generated_list"]
+    assert len(recorded["expanded_list"]) == listed["nodes_expanded"] + 1
+    assert len(recorded["events"]) == (len(listed["expanded_list"])
+                                       + len(listed["generated_list"]))
+
+
+def test_callback_trace_sees_every_event():
+    seen = []
+    res = BFS_with_metrics("Arad", "Bucharest", trace=CallbackTrace(
+        lambda kind, name: seen.append((kind, name))))
+    assert seen[0] == (EXPAND, "Arad")
+    assert sum(kind == GENERATE for kind, _ in seen) == res["nodes_generated"]
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_file_trace_round_trip(tmp_path, binary):
+    path = tmp_path / "trace"
+    listed = UCS_with_metrics("Arad", "Bucharest", trace=ListTrace())
+    with FileTrace(path, binary=binary) as trace:
+        res = UCS_with_metrics("Arad", "Bucharest", trace=trace)
+    assert res["trace_file"] == path
+    events = list(read_trace(path, binary=binary, graph=romania))
+    assert [name for kind, name in events if kind == EXPAND] == listed["expanded_list"]
+    assert [name for kind, name in events if kind == GENERATE] == listed["generated_list"]
+
+
+def test_progress_trace_node_budget_and_cancel():
+    graph = grid_graph(30, 30)
+    start, goal = graph.names[0], graph.names[-1]
+    with pytest.raises(SearchAborted, match="node budget"):
+        BFS_with_metrics(start, goal, graph=graph, trace=ProgressTrace(max_nodes=50))
+    with pytest.raises(SearchAborted, match="cancelled"):
+        BFS_with_metrics(start, goal, graph=graph,
+                         trace=ProgressTrace(should_stop=lambda: True))
+
+def test_progress_trace_reports_during_the_memory_rerun():
+    graph = grid_graph(40, 40)
+    reports = []
+    trace = ProgressTrace(EventTrace(), lambda *a: reports.append(a), interval=0)
+    res = BFS_with_metrics(graph.names[0], graph.names[-1], graph=graph,
+                           instrument=MEMORY, trace=trace)
+    # Every 64 expansions in each run, plus the final report
+    assert len(reports) >= 2 * (res["nodes_expanded"] // 64)
+    assert res["expanded_list"][0] == graph.names[0]
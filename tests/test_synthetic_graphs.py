@@ -0,0 +1,41 @@
+# tests/test_synthetic_graphs.py
+# The synthetic map families are connected, undirected and reproducible,
+# and the benchmark suite runs every search over them.
+#   python -m pytest tests
+
+import pytest
+
+from benchmarks.suite import ALGORITHMS, compare, run_suite
+from lower_bounds import INF, dijkstra_distances
+from synthetic_graphs import FAMILIES
+
+
+def _arcs(graph):
+    return {(u, graph.targets[e], graph.weights[e])
+            for u in range(len(graph))
+            for e in range(graph.offsets[u], graph.offsets[u + 1])}
+
+
+@pytest.mark.parametrize("family", list(FAMILIES))
+def test_family_is_connected_and_undirected(family):
+    graph = FAMILIES[family](300)
+    arcs = _arcs(graph)
+    assert all((v, u, w) in arcs for u, v, w in arcs)
+    assert all(w > 0 for _, _, w in arcs)
+    assert INF not in dijkstra_distances(graph, 0)
+
+
+@pytest.mark.parametrize("family", list(FAMILIES))
+def test_family_is_reproducible(family):
+    a, b = FAMILIES[family](200, seed=4), FAMILIES[family](200, seed=4)
+    assert a.fingerprint() == b.fingerprint()
+
+
+def test_suite_runs_every_search():
+    rows = run_suite(["grid", "random"], [100], list(ALGORITHMS), queries=2, trials=1,
+                     memory=False, budget=5000)
+    assert len(rows) == 2 * len(ALGORITHMS)
+    assert all(r["nodes_expanded"] >= 0 and r["time_median"] >= 0 for r in rows)
+    slower = [dict(r, time_median=r["time_median"] * 2 + 1) for r in rows]
+    assert len(compare(slower, rows, 0.5)) == len(rows)
+    assert compare(rows, rows, 0.5) == []
@@ -0,0 +1,90 @@
+# tests/test_uninformed_search.py
+# Results of the uninformed searches on the Romania map and on a goal in
+# another component.
+#   python -m pytest tests
+
+import pytest
+
+from graph import Graph
+from uninformed_search import (
+    BFS_with_metrics, DFS_with_metrics, UCS_with_metrics, DLS_with_metrics,
+    IDS_with_metrics, Backtracking_with_metrics, Bidirectional_with_metrics,
+    BidirectionalUCS_with_metrics, NodeStore, NO_PARENT, extract_path,
+)
+
+SEARCHES = {
+    "BFS": BFS_with_metrics,
+    "BFS (NumPy)": lambda s, g, graph=None: BFS_with_metrics(s, g, graph=graph, engine="numpy"),
+    "DFS": DFS_with_metrics,
+    "UCS": UCS_with_metrics,
+    "DLS": lambda s, g, graph=None: DLS_with_metrics(s, g, 10, graph=graph),
+    "IDS": IDS_with_metrics,
+    "Backtracking": Backtracking_with_metrics,
+    "Bidirectional": Bidirectional_with_metrics,
+    "Bidirectional UCS": BidirectionalUCS_with_metrics,
+}
+
+
+def _two_components():
+    # a - b - c   d - e
+    names = ["a", "b", "c", "d", "e"]
+    return Graph.from_edge_list(names, [(0, 1, 2), (1, 2, 3), (3, 4, 1)])
+
+
+def _path(res, graph=None):
+    if "path" in res:
+        return res["path"]
+    return extract_path(res["goal_node"], graph) if res["goal_node"] else None
+
+
+@pytest.mark.parametrize("name", list(SEARCHES))
+def test_unreachable_goal_reports_counters(name):
+    res = SEARCHES[name]("a", "e", graph=_two_components())
+    assert _path(res) is None
+    assert res["nodes_expanded"] > 0
+    assert res["nodes_generated"] > 0
+
+
+@pytest.mark.parametrize("name", list(SEARCHES))
+def test_romania_paths_are_valid(name):
+    path = _path(SEARCHES[name]("Arad", "Bucharest"))
+    assert path[0] == "Arad" and path[-1] == "Bucharest"
+
+
+@pytest.mark.parametrize("name", ["UCS", "Bidirectional UCS"])
+def test_cost_based_searches_are_optimal(name):
+    res = SEARCHES[name]("Arad", "Bucharest")
+    cost = res.get("path_cost")
+    if cost is None:
+        cost = res["goal_node"].path_cost
+    assert cost == 418
+
+
+def test_numpy_engine_matches_python_bfs():
+    python = BFS_with_metrics("Arad", "Bucharest")
+    numpy = BFS_with_metrics("Arad", "Bucharest", engine="numpy")
+    assert _path(numpy) == _path(python)
+    assert numpy["nodes_expanded"] == python["nodes_expanded"]
+    assert numpy["nodes_generated"] == python["nodes_generated"]
+
+
+def test_node_store_rebuilds_the_chain():
+    graph = Graph.from_edge_list(["a", "b", "c"], [(0, 1, 2.5), (1, 2, 1)],
+                                 typecode="d")
+    store = NodeStore(graph)
+    root = store.add(0)
+    mid = store.add(1, root, 2.5)
+    leaf = store.add(2, mid, 3.5)
+    assert len(store) == 3 and store.depth[leaf] == 2
+    node = store.node(leaf)
+    assert (node.state, node.path_cost, node.depth) == (2, 3.5, 2)
+    assert (node.parent.state, node.parent.depth) == (1, 1)
+    assert node.parent.parent.parent is None
+    assert extract_path(node, graph) == ["a", "b", "c"]
+    assert store.node(NO_PARENT) is None
+
+
+def test_node_store_keeps_integer_costs_exact():
+    store = NodeStore(Graph.from_edge_list(["a", "b"], [(0, 1, 2 ** 60)]))
+    store.add(1, store.add(0), 2 ** 60 + 1)
+    assert store.node(1).path_cost == 2 ** 60 + 1
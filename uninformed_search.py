@@ -1,11 +1,18 @@
-import time
-import tracemalloc
-import heapq
+from array import array
 from collections import deque
-from romania_problem import neighbors,distances
+from graph import romania
+from instrumentation import COUNTERS, measure
+from search_trace import hooks
+from frontier import FIFOFrontier, LIFOFrontier
+from priority_queue import BinaryHeap
+
+INF = float("inf")
+NO_PARENT = -1
 
 # Node + expand
 class Node:
+    __slots__ = ("state", "parent", "action", "path_cost", "depth")
+
     def __init__(self, state, parent=None, action=None, path_cost=0, depth=0):
         self.state = state
         self.parent = parent
@@ -14,350 +21,420 @@ class Node:
         self.depth = depth
 
 
-def expand(node):
-    children = []
-    for neighbor in neighbors.get(node.state, []):
-        if (node.state, neighbor) not in distances and (neighbor, node.state) not in distances:
-            continue
-        step = distances.get((node.state, neighbor),
-                             distances.get((neighbor, node.state)))
-        children.append(Node(neighbor, node, neighbor,
-                        node.path_cost + step, node.depth + 1))
-    return children
+# States are integer ids into the graph; names only appear at the boundary.
+# Children are made lazily, as the caller iterates.
+def expand(node, graph):
+    depth = node.depth + 1
+    for v, w in graph.neighbors(node.state):
+        yield Node(v, node, v, node.path_cost + w, depth)
+
+
+# Node store: the search tree as parallel arrays indexed by node id, so a
+# search appends four numbers per accepted child instead of allocating an
+# object for every generated one. Only the returned path becomes Node
+# objects (node()), which extract_path and the results expect.
+class NodeStore:
+    def __init__(self, graph):
+        fmt = getattr(graph.weights, "typecode", None) or graph.weights.format
+        self.state = array("q")
+        self.parent = array("q")
+        self.cost = array("d" if fmt in ("d", "f") else "q")
+        self.depth = array("q")
+
+    def add(self, state, parent=NO_PARENT, cost=0):
+        i = len(self.state)
+        self.state.append(state)
+        self.parent.append(parent)
+        self.cost.append(cost)
+        self.depth.append(0 if parent == NO_PARENT else self.depth[parent] + 1)
+        return i
+
+    def __len__(self):
+        return len(self.state)
+
+    def node(self, i):
+        # Node chain from the root down to node i
+        chain = []
+        while i != NO_PARENT:
+            chain.append(i)
+            i = self.parent[i]
+        node = None
+        for i in reversed(chain):
+            state = self.state[i]
+            node = Node(state, node, None if node is None else state,
+                        self.cost[i], self.depth[i])
+        return node
 
 
 # Utilities
-def extract_path(node):
+def _resolve(graph, start, goal):
+    if graph is None:
+        graph = romania
+    return graph, graph.index[start], graph.index[goal]
+
+
+def extract_path(node, graph=None):
     if not node:
         return None
+    if graph is None:
+        graph = romania
     path = []
     while node:
-        path.append(node.state)
+        path.append(graph.names[node.state])
         node = node.parent
     return list(reversed(path))
 
 
-def path_cost_expression(path):
-    if not path or len(path) < 2:
-        return None
-    total = 0
-    terms = []
-    for i in range(len(path)-1):
-        w = distances.get((path[i], path[i+1]),
-                          distances.get((path[i+1], path[i]), 0))
-        total += w
-        terms.append(str(w))
-    return f"Path Cost = {' + '.join(terms)} = {total}"
+def cost_expression(steps):
+    return f"Path Cost = {' + '.join(map(str, steps))} = {sum(steps)}"
 
 
-def _list_has(frontier, state):
-    return any(n.state == state for n in frontier)
+def path_cost_expression(path, graph=None):
+    if not path or len(path) < 2:
+        return None
+    if graph is None:
+        graph = romania
+    index = graph.index
+    steps = [graph.weight(index[path[i]], index[path[i+1]]) or 0
+             for i in range(len(path)-1)]
+    return cost_expression(steps)
 
 
 # BFS
-def BFS_with_metrics(start, goal):
-    tracemalloc.start()
-    t0 = time.perf_counter()
-
-    root = Node(start)
-    frontier = deque([root])
+def _bfs(graph, starts, goal, goal_on_generate=False, trace=None):
+    # starts: source state ids, all in the first layer
+    # goal_on_generate: stop as soon as the goal is generated instead of
+    # when it is expanded. Same path (BFS is by depth), one layer less work.
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+    frontier = FIFOFrontier(store, [add(s) for s in starts])
     explored = set()
 
-    expanded_list = []
-    generated_list = []
     nodes_expanded = 0
     nodes_generated = 0
 
     while frontier:
-        node = frontier.popleft()
-        expanded_list.append(node.state)
+        i = frontier.pop()
+        state = store.state[i]
+        if on_expand:
+            on_expand(state, len(frontier))
 
-        if node.state == goal:
-            t1 = time.perf_counter()
-            curr, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+        if state == goal:
             return {
-                "goal_node": node, "time": t1-t0, "peak_memory": peak,
-                "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
-                "expanded_list": expanded_list, "generated_list": generated_list
+                "goal_node": store.node(i),
+                "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
             }
 
-        explored.add(node.state)
+        explored.add(state)
         nodes_expanded += 1
 
-        for child in expand(node):
+        cost = store.cost[i]
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
             nodes_generated += 1
-            generated_list.append(child.state)
-            if child.state not in explored and not _list_has(frontier, child.state):
-                frontier.append(child)
+            if on_generate:
+                on_generate(v)
+            if v not in explored and v not in frontier:
+                if goal_on_generate and v == goal:
+                    return {
+                        "goal_node": store.node(add(v, i, cost + w)),
+                        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+                    }
+                frontier.append(add(v, i, cost + w))
 
     # Failure
-    t1 = time.perf_counter()
-    curr, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return {"goal_node": None, "time": t1-t0, "peak_memory": peak}
+    return {
+        "goal_node": None,
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+    }
 
 
-# DFS
+def BFS_with_metrics(start, goal, graph=None, goal_on_generate=False,
+                     engine="python", instrument=COUNTERS, trace=None):
+    # start: a state, or a list of states searched from at once (the path
+    # starts at whichever is fewest hops from the goal, the first listed on
+    # ties)
+    # engine: "python" (a node at a time) or "numpy" (a level at a time,
+    # level_bfs.py): same results, the latter much faster on large maps
+    if graph is None:
+        graph = romania
+    index = graph.index
+    starts = [index[start]] if isinstance(start, str) else \
+        list(dict.fromkeys(index[s] for s in start))
+    goal = index[goal]
+    if engine == "numpy":
+        from level_bfs import _level_bfs as core
+    elif engine == "python":
+        core = _bfs
+    else:
+        raise ValueError(f"unknown BFS engine: {engine}")
+    return measure(lambda t: core(graph, starts, goal, goal_on_generate, t),
+                   instrument, trace)
 
-def DFS_with_metrics(start, goal):
-    tracemalloc.start()
-    t0 = time.perf_counter()
 
-    root = Node(start)
-    frontier = [root]
+# DFS
+def _dfs(graph, start, goal, goal_on_generate=False, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+    frontier = LIFOFrontier(store, [add(start)])
     explored = set()
 
-    expanded_list = []
-    generated_list = []
     nodes_expanded = 0
     nodes_generated = 0
 
     while frontier:
-        node = frontier.pop()
-        expanded_list.append(node.state)
+        i = frontier.pop()
+        state = store.state[i]
+        if on_expand:
+            on_expand(state, len(frontier))
 
-        if node.state == goal:
-            t1 = time.perf_counter()
-            curr, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+        if state == goal:
             return {
-                "goal_node": node, "time": t1-t0, "peak_memory": peak,
-                "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
-                "expanded_list": expanded_list, "generated_list": generated_list
+                "goal_node": store.node(i),
+                "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
             }
 
-        explored.add(node.state)
+        explored.add(state)
         nodes_expanded += 1
 
-        children = expand(node)
-        for child in reversed(children):
+        # Children in reverse so the first neighbour is popped first
+        cost = store.cost[i]
+        pairs = reversed(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for w, v in zip(pairs, pairs):
             nodes_generated += 1
-            generated_list.append(child.state)
-            if child.state not in explored and not _list_has(frontier, child.state):
-                frontier.append(child)
+            if on_generate:
+                on_generate(v)
+            if v not in explored and v not in frontier:
+                if goal_on_generate and v == goal:
+                    return {
+                        "goal_node": store.node(add(v, i, cost + w)),
+                        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+                    }
+                frontier.append(add(v, i, cost + w))
 
     # Failure
-    t1 = time.perf_counter()
-    curr, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return {"goal_node": None, "time": t1-t0, "peak_memory": peak}
+    return {
+        "goal_node": None,
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+    }
 
 
+def DFS_with_metrics(start, goal, graph=None, goal_on_generate=False,
+                     instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _dfs(graph, start, goal, goal_on_generate, t),
+                   instrument, trace)
 
-# UCS
-def UCS_with_metrics(start, goal):
-    tracemalloc.start()
-    t0 = time.perf_counter()
 
-    root = Node(start)
-    frontier = []
-    heapq.heappush(frontier, (root.path_cost, root))
+# UCS
+def _ucs(graph, start, goal, queue, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+    frontier = queue()
+    frontier.push(start, 0)
+    best = {start: add(start)}
     explored = set()
 
-    expanded_list = []
-    generated_list = []
     nodes_expanded = 0
     nodes_generated = 0
 
     while frontier:
-        _, node = heapq.heappop(frontier)
+        state, cost = frontier.pop()
+        i = best.pop(state)
 
-        if node.state in explored:
-            continue
-
-        expanded_list.append(node.state)
+        if on_expand:
+            on_expand(state, len(frontier))
 
-        if node.state == goal:
-            t1 = time.perf_counter()
-            curr, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+        if state == goal:
             return {
-                "goal_node": node, "time": t1-t0, "peak_memory": peak,
-                "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
-                "expanded_list": expanded_list, "generated_list": generated_list
+                "goal_node": store.node(i),
+                "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
             }
 
-        explored.add(node.state)
+        explored.add(state)
         nodes_expanded += 1
 
-        for child in expand(node):
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
             nodes_generated += 1
-            generated_list.append(child.state)
-            if child.state not in explored:
-                heapq.heappush(frontier, (child.path_cost, child))
+            if on_generate:
+                on_generate(v)
+            if v in explored:
+                continue
+            g = cost + w
+            if frontier.push_or_decrease(v, g):
+                best[v] = add(v, i, g)
 
     # Failure
-    t1 = time.perf_counter()
-    curr, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return {"goal_node": None, "time": t1-t0, "peak_memory": peak}
+    return {
+        "goal_node": None,
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+    }
 
 
-# DLS
-def DLS_with_metrics(start, goal, limit):
-    tracemalloc.start()
-    t0 = time.perf_counter()
+def UCS_with_metrics(start, goal, graph=None, queue=BinaryHeap,
+                     instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _ucs(graph, start, goal, queue, t),
+                   instrument, trace)
 
-    expanded_list = []
-    generated_list = []
-    nodes_expanded = 0
-    nodes_generated = 0
-    found_node = None
 
-    def dls(node, depth, visited):
-        nonlocal nodes_expanded, nodes_generated, found_node
-        expanded_list.append(node.state)
+# Depth-limited DFS over the current path (explicit stack, no recursion limit)
+def _depth_first(graph, start, goal, limit, on_expand, on_generate,
+                 path, on_path, edges):
+    # One depth-first pass from start that never revisits a state on the
+    # current path; limit=None means no depth limit (backtracking).
+    # path / on_path / edges are empty scratch buffers (nodes on the current
+    # path, their states, the neighbour iterator of each) the caller may reuse.
+    # -> (outcome, goal node or None, nodes expanded, nodes generated)
+    neighbors = graph.neighbors
+    root = Node(start)
+    if on_expand:
+        on_expand(start, 0)
+    if start == goal:
+        return "FOUND", root, 0, 0
+    if limit == 0:
+        return "CUTOFF", None, 0, 0
 
-        if node.state == goal:
-            found_node = node
-            return "FOUND"
+    nodes_expanded = 1
+    nodes_generated = 0
+    cutoff = False
+    path.append(root)
+    on_path.add(start)
+    edges.append(neighbors(start))
+
+    while edges:
+        edge = next(edges[-1], None)
+        if edge is None:
+            edges.pop()
+            on_path.discard(path.pop().state)
+            continue
 
+        node = path[-1]
+        v, w = edge
+        nodes_generated += 1
+        if on_generate:
+            on_generate(v)
+        if v in on_path:
+            continue
+
+        depth = len(path)
+        if on_expand:
+            on_expand(v, depth)
+        if v == goal:
+            found = Node(v, node, v, node.path_cost + w, depth)
+            path.clear()
+            on_path.clear()
+            edges.clear()
+            return "FOUND", found, nodes_expanded, nodes_generated
         if depth == limit:
-            return "CUTOFF"
+            cutoff = True
+            continue
 
         nodes_expanded += 1
-        cutoff = False
+        path.append(Node(v, node, v, node.path_cost + w, depth))
+        on_path.add(v)
+        edges.append(neighbors(v))
 
-        for child in expand(node):
-            nodes_generated += 1
-            generated_list.append(child.state)
-            if child.state in visited:
-                continue
-            visited.add(child.state)
-            res = dls(child, depth+1, visited)
-            visited.remove(child.state)
+    return ("CUTOFF" if cutoff else "FAIL"), None, nodes_expanded, nodes_generated
 
-            if res == "FOUND":
-                return "FOUND"
-            if res == "CUTOFF":
-                cutoff = True
 
-        return "CUTOFF" if cutoff else "FAIL"
-
-    root = Node(start)
-    outcome = dls(root, 0, {start})
-
-    t1 = time.perf_counter()
-    curr, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+# DLS
+def _dls(graph, start, goal, limit, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    outcome, found_node, nodes_expanded, nodes_generated = _depth_first(
+        graph, start, goal, limit, on_expand, on_generate, [], set(), [])
 
     return {
         "goal_node": found_node, "outcome": outcome, "limit": limit,
-        "time": t1-t0, "peak_memory": peak,
-        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
-        "expanded_list": expanded_list, "generated_list": generated_list
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
     }
 
-# IDS
-def IDS_with_metrics(start, goal, max_limit=50):
-    tracemalloc.start()
-    t0 = time.perf_counter()
 
+def DLS_with_metrics(start, goal, limit, graph=None, instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _dls(graph, start, goal, limit, t),
+                   instrument, trace)
+
+
+# IDS
+def _ids(graph, start, goal, max_limit, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
     total_expanded = 0
     total_generated = 0
-    all_expanded = []
-    all_generated = []
-    peak_memory = 0
     found_node = None
     final_limit = None
+    iterations = 0
 
+    # One measurement around the whole loop, every iteration streams into
+    # the same trace and reuses the same stack buffers
+    path, on_path, edges = [], set(), []
     for limit in range(max_limit + 1):
-        res = DLS_with_metrics(start, goal, limit)
-        total_expanded += res["nodes_expanded"]
-        total_generated += res["nodes_generated"]
-        all_expanded.extend(res["expanded_list"])
-        all_generated.extend(res["generated_list"])
-        peak_memory = max(peak_memory, res["peak_memory"])
-
-        if res["outcome"] == "FOUND":
-            found_node = res["goal_node"]
+        iterations += 1
+        outcome, node, expanded, generated = _depth_first(
+            graph, start, goal, limit, on_expand, on_generate, path, on_path, edges)
+        total_expanded += expanded
+        total_generated += generated
+
+        if outcome == "FOUND":
+            found_node = node
             final_limit = limit
             break
-
-    t1 = time.perf_counter()
-    curr, global_peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    peak_memory = max(peak_memory, global_peak)
+        if outcome == "FAIL":
+            # Nothing was cut off: every simple path from start has been
+            # tried, so deeper limits cannot find the goal either
+            break
 
     return {
-        "goal_node": found_node, "found_limit": final_limit,
-        "time": t1-t0, "peak_memory": peak_memory,
-        "nodes_expanded": total_expanded, "nodes_generated": total_generated,
-        "expanded_list": all_expanded, "generated_list": all_generated
+        "goal_node": found_node, "found_limit": final_limit, "iterations": iterations,
+        "nodes_expanded": total_expanded, "nodes_generated": total_generated
     }
 
 
-# Backtracking
-def Backtracking_with_metrics(start, goal):
-    tracemalloc.start()
-    t0 = time.perf_counter()
+def IDS_with_metrics(start, goal, max_limit=50, graph=None,
+                     instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _ids(graph, start, goal, max_limit, t),
+                   instrument, trace)
 
-    expanded_list = []
-    generated_list = []
-    nodes_expanded = 0
-    nodes_generated = 0
-    found = None
-
-    def backtrack(node, visited):
-        nonlocal nodes_expanded, nodes_generated, found
-        expanded_list.append(node.state)
-
-        if node.state == goal:
-            found = node
-            return True
-
-        nodes_expanded += 1
-
-        for child in expand(node):
-            nodes_generated += 1
-            generated_list.append(child.state)
-            if child.state in visited:
-                continue
-            visited.add(child.state)
-            child.parent = node
-            child.path_cost = node.path_cost + \
-                distances.get((node.state, child.state), 0)
-
-            if backtrack(child, visited):
-                return True
-
-            visited.remove(child.state)
-
-        return False
 
-    root = Node(start)
-    backtrack(root, {start})
-
-    t1 = time.perf_counter()
-    curr, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+# Backtracking
+def _backtracking(graph, start, goal, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    _, found, nodes_expanded, nodes_generated = _depth_first(
+        graph, start, goal, None, on_expand, on_generate, [], set(), [])
 
     return {
-        "goal_node": found, "time": t1-t0, "peak_memory": peak,
-        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
-        "expanded_list": expanded_list, "generated_list": generated_list
+        "goal_node": found,
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
     }
 
 
-# Bidirectional BFS
-def Bidirectional_with_metrics(start, goal):
-    tracemalloc.start()
-    t0 = time.perf_counter()
+def Backtracking_with_metrics(start, goal, graph=None, instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _backtracking(graph, start, goal, t),
+                   instrument, trace)
+
 
+# Bidirectional BFS
+def _bidirectional(graph, start, goal, trace=None):
+    names = graph.names
+    on_expand, on_generate = hooks(trace, graph)
     if start == goal:
-        curr, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        if on_expand:
+            on_expand(start, 0)
         return {
             "goal_node": Node(start),
-            "path": [start],
+            "path": [names[start]],
             "path_cost": 0,
-            "time": 0,
             "nodes_expanded": 0,
             "nodes_generated": 0,
-            "expanded_list": [start],
-            "generated_list": [],
-            "peak_memory": peak
         }
 
     f_frontier = deque([Node(start)])
@@ -365,8 +442,6 @@ def Bidirectional_with_metrics(start, goal):
     f_seen = {start: f_frontier[0]}
     b_seen = {goal: b_frontier[0]}
 
-    expanded_list = []
-    generated_list = []
     nodes_expanded = 0
     nodes_generated = 0
 
@@ -381,20 +456,19 @@ def Bidirectional_with_metrics(start, goal):
             return False
 
         node = frontier.popleft()
-        expanded_list.append(node.state)
+        if on_expand:
+            on_expand(node.state, len(frontier))
         nodes_expanded += 1
 
-        for child in expand(node):
+        for child in expand(node, graph):
             nodes_generated += 1
-            generated_list.append(child.state)
+            if on_generate:
+                on_generate(child.state)
 
             if child.state in seen:
                 continue
 
             seen[child.state] = child
-            child.parent = node
-            child.path_cost = node.path_cost + \
-                distances.get((node.state, child.state), 0)
             frontier.append(child)
 
             if child.state in other:
@@ -418,15 +492,10 @@ def Bidirectional_with_metrics(start, goal):
             found = True
             break
 
-    t1 = time.perf_counter()
-    curr, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-
     if not found:
         return {
-            "goal_node": None, "time": t1-t0, "peak_memory": peak,
-            "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated,
-            "expanded_list": expanded_list, "generated_list": generated_list
+            "goal_node": None,
+            "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
         }
 
     # Construct path
@@ -445,21 +514,266 @@ def Bidirectional_with_metrics(start, goal):
 
     full_path = path_f + path_b
 
-    total_cost = 0
-    for i in range(len(full_path) - 1):
-        total_cost += distances.get(
-            (full_path[i], full_path[i+1]),
-            distances.get((full_path[i+1], full_path[i]), 0)
-        )
+    # Both halves carry their cost from their own root to the meeting state
+    total_cost = meet_f.path_cost + meet_b.path_cost
 
     return {
         "goal_node": Node(goal, path_cost=total_cost),
-        "path": full_path,
+        "path": [names[s] for s in full_path],
         "path_cost": total_cost,
-        "time": t1-t0,
-        "peak_memory": peak,
         "nodes_expanded": nodes_expanded,
-        "nodes_generated": nodes_generated,
-        "expanded_list": expanded_list,
-        "generated_list": generated_list
+        "nodes_generated": nodes_generated
     }
+
+
+def Bidirectional_with_metrics(start, goal, graph=None,
+                               instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _bidirectional(graph, start, goal, t),
+                   instrument, trace)
+
+
+# Bidirectional UCS (weighted, optimal)
+def _bidirectional_ucs(graph, start, goal, queue=BinaryHeap, potential=None, trace=None):
+    # Dijkstra from both ends, always advancing the side with the smaller key.
+    # Every relaxation that touches a state labelled by the other side is a
+    # candidate s-t path; the cheapest one (mu) is optimal once the two
+    # frontier keys sum to at least mu.
+    # potential: optional state id -> p turning this into bidirectional A*.
+    # The forward side orders states by g + p, the backward side by g - p;
+    # with p = (h_goal - h_start) / 2 for consistent h both sides see the
+    # same non-negative reduced edge costs and the stopping test is unchanged.
+    names = graph.names
+    on_expand, on_generate = hooks(trace, graph)
+    if start == goal:
+        if on_expand:
+            on_expand(start, 0)
+        return {
+            "goal_node": Node(start),
+            "path": [names[start]],
+            "path_cost": 0,
+            "nodes_expanded": 0,
+            "nodes_generated": 0,
+        }
+
+    offsets, edges = graph.offsets, graph.edges
+    p = potential or (lambda s: 0)
+    sign = (1, -1)
+    dist = ({start: 0}, {goal: 0})
+    parent = ({start: None}, {goal: None})
+    closed = (set(), set())
+    frontiers = (queue(), queue())
+    frontiers[0].push(start, p(start))
+    frontiers[1].push(goal, -p(goal))
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    mu = INF
+    meet = None
+
+    while frontiers[0] and frontiers[1]:
+        top_f = frontiers[0].peek()[1]
+        top_b = frontiers[1].peek()[1]
+        if top_f + top_b >= mu:
+            break
+
+        side = 0 if top_f <= top_b else 1
+        frontier, mine, other = frontiers[side], dist[side], dist[1 - side]
+        state, _ = frontier.pop()
+        if on_expand:
+            on_expand(state, len(frontier))
+        closed[side].add(state)
+        nodes_expanded += 1
+
+        g = mine[state]
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            if v in closed[side]:
+                continue
+            cost = g + w
+            if cost < mine.get(v, INF):
+                mine[v] = cost
+                parent[side][v] = state
+                frontier.push_or_decrease(v, cost + sign[side] * p(v))
+            if v in other and mine[v] + other[v] < mu:
+                mu = mine[v] + other[v]
+                meet = v
+
+    if meet is None:
+        return {
+            "goal_node": None,
+            "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+        }
+
+    # Construct path
+    full_path = []
+    s = meet
+    while s is not None:
+        full_path.append(s)
+        s = parent[0][s]
+    full_path.reverse()
+    s = parent[1][meet]
+    while s is not None:
+        full_path.append(s)
+        s = parent[1][s]
+
+    return {
+        "goal_node": Node(goal, path_cost=mu),
+        "path": [names[s] for s in full_path],
+        "path_cost": mu,
+        "nodes_expanded": nodes_expanded,
+        "nodes_generated": nodes_generated
+    }
+
+
+def BidirectionalUCS_with_metrics(start, goal, graph=None, queue=BinaryHeap,
+                                  instrument=COUNTERS, trace=None):
+    graph, start, goal = _resolve(graph, start, goal)
+    return measure(lambda t: _bidirectional_ucs(graph, start, goal, queue, trace=t),
+                   instrument, trace)
+
+
+# One-to-many / many-to-one: one search settles every goal of a set (or the
+# k nearest), and all paths come out of its single search tree. The graphs
+# are undirected, so many-to-one (every goal to start) is the same search
+# from start with each path reversed.
+def _resolve_goals(graph, start, goals):
+    if graph is None:
+        graph = romania
+    index = graph.index
+    return graph, index[start], list(dict.fromkeys(index[g] for g in goals))
+
+
+def _wanted(goals, k):
+    return len(goals) if k is None else min(k, len(goals))
+
+
+def _many_result(graph, store, settled, reverse, nodes_expanded, nodes_generated):
+    # settled: goal id -> node id, nearest first. Results are keyed by goal
+    # name in that order; goals not settled are left out.
+    names = graph.names
+    paths = {}
+    costs = {}
+    for goal, i in settled.items():
+        costs[names[goal]] = store.cost[i]
+        path = []
+        while i != NO_PARENT:
+            path.append(names[store.state[i]])
+            i = store.parent[i]
+        if not reverse:
+            path.reverse()
+        paths[names[goal]] = path
+    return {
+        "paths": paths, "path_costs": costs,
+        "nodes_expanded": nodes_expanded, "nodes_generated": nodes_generated
+    }
+
+
+def _bfs_many(graph, start, goals, k=None, reverse=False, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+    frontier = FIFOFrontier(store, [add(start)])
+    explored = set()
+    remaining = set(goals)
+    wanted = _wanted(goals, k)
+    settled = {}
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    while frontier and len(settled) < wanted:
+        i = frontier.pop()
+        state = store.state[i]
+        if on_expand:
+            on_expand(state, len(frontier))
+
+        if state in remaining:
+            remaining.discard(state)
+            settled[state] = i
+            if len(settled) == wanted:
+                break
+
+        explored.add(state)
+        nodes_expanded += 1
+
+        cost = store.cost[i]
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            if v not in explored and v not in frontier:
+                frontier.append(add(v, i, cost + w))
+
+    return _many_result(graph, store, settled, reverse, nodes_expanded, nodes_generated)
+
+
+def BFS_many_with_metrics(start, goals, graph=None, k=None, reverse=False,
+                          instrument=COUNTERS, trace=None):
+    # Fewest-hop paths from start to each state in goals (k: only the k
+    # nearest); reverse=True gives the paths from each goal to start instead
+    graph, start, goals = _resolve_goals(graph, start, goals)
+    return measure(lambda t: _bfs_many(graph, start, goals, k, reverse, t),
+                   instrument, trace)
+
+
+def _ucs_many(graph, start, goals, k=None, reverse=False, queue=BinaryHeap, trace=None):
+    on_expand, on_generate = hooks(trace, graph)
+    offsets, edges = graph.offsets, graph.edges
+    store = NodeStore(graph)
+    add = store.add
+    frontier = queue()
+    frontier.push(start, 0)
+    best = {start: add(start)}
+    explored = set()
+    remaining = set(goals)
+    wanted = _wanted(goals, k)
+    settled = {}
+
+    nodes_expanded = 0
+    nodes_generated = 0
+
+    while frontier and len(settled) < wanted:
+        state, cost = frontier.pop()
+        i = best.pop(state)
+        if on_expand:
+            on_expand(state, len(frontier))
+
+        # Popped states are settled: goals come out nearest first
+        if state in remaining:
+            remaining.discard(state)
+            settled[state] = i
+            if len(settled) == wanted:
+                break
+
+        explored.add(state)
+        nodes_expanded += 1
+
+        pairs = iter(edges[2 * offsets[state]:2 * offsets[state + 1]])
+        for v, w in zip(pairs, pairs):
+            nodes_generated += 1
+            if on_generate:
+                on_generate(v)
+            if v in explored:
+                continue
+            g = cost + w
+            if frontier.push_or_decrease(v, g):
+                best[v] = add(v, i, g)
+
+    return _many_result(graph, store, settled, reverse, nodes_expanded, nodes_generated)
+
+
+def UCS_many_with_metrics(start, goals, graph=None, k=None, reverse=False,
+                          queue=BinaryHeap, instrument=COUNTERS, trace=None):
+    # Cheapest paths from start to each state in goals, or to the k nearest
+    # (stops as soon as they are settled); reverse=True gives the paths from
+    # each goal to start instead
+    graph, start, goals = _resolve_goals(graph, start, goals)
+    return measure(lambda t: _ucs_many(graph, start, goals, k, reverse, queue, t),
+                   instrument, trace)